@@ -12,13 +12,8 @@ try:
 except:
     ebooklib_datas = []
 
-try:
-    odf_datas = collect_data_files('odf')
-except:
-    odf_datas = []
-
 # Combine all data files
-all_datas = marker_datas + surya_datas + ebooklib_datas + odf_datas
+all_datas = marker_datas + surya_datas + ebooklib_datas
 
 # Hidden imports for multiprocessing and marker dependencies
 hidden_imports = [
@@ -39,19 +34,8 @@ hidden_imports = [
     'surya.model',
     'cv2',
     # Multi-format document support
-    'docx',
-    'docx.shared',
-    'docx.oxml',
-    'docx.text',
-    'docx.document',
-    'odf',
-    'odf.opendocument',
-    'odf.text',
-    'odf.teletype',
     'ebooklib',
     'ebooklib.epub',
-    'striprtf',
-    'striprtf.striprtf',
     'bs4',
     'bs4.builder',
     'bs4.builder._htmlparser',
@@ -0,0 +1,189 @@
+"""
+Benchmark suite for the Document Merger extractors, generators, PII scrubber and splitter.
+
+Generates a synthetic corpus of controlled size in every supported format
+(PDF with a text layer, DOCX, ODT, RTF, EPUB, TXT, MD), times each
+MergeEngine._extract_text_from_* and _generate_* method plus scrub_pii and
+split_text, and reports throughput in MB/s and words/s.
+
+Results can be saved as a baseline and later runs compared against it:
+
+    python benchmark.py --save-baseline benchmark_baseline.json
+    python benchmark.py --baseline benchmark_baseline.json
+
+The comparison exits with status 1 when any benchmark's words/s drops by more
+than --tolerance (default 20%) relative to the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from pdf_merger_app import MergeEngine, MergeOptions, count_words, make_synthetic_text
+
+FORMATS = ("pdf", "docx", "odt", "rtf", "epub", "txt", "md")
+
+
+def _time_best(func, repeat):
+    """Runs func repeat times and returns (best seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _entry(seconds, byte_count, word_count):
+    return {
+        "seconds": round(seconds, 6),
+        "bytes": byte_count,
+        "words": word_count,
+        "mb_per_second": round(byte_count / 1048576 / seconds, 3) if seconds else None,
+        "words_per_second": round(word_count / seconds, 1) if seconds else None,
+    }
+
+
+def build_corpus(engine, text, corpus_dir):
+    """Writes the synthetic text once per format using the engine's own generators. Returns {format: path}."""
+    corpus = {}
+    for fmt in FORMATS:
+        path = os.path.join(corpus_dir, f"corpus.{fmt}")
+        engine.options.output_file_type = fmt.upper()
+        try:
+            engine.generate_output_file(text, path)
+            corpus[fmt] = path
+        except Exception as e:
+            print(f"  Could not generate {fmt.upper()} corpus file: {e}", file=sys.stderr)
+    return corpus
+
+
+def run_benchmarks(word_count=50000, repeat=3, seed=0, split_word_count=5000, corpus_dir=None):
+    """Runs all benchmarks and returns the results dict."""
+    engine = MergeEngine(MergeOptions(split_word_count=split_word_count))
+    text = make_synthetic_text(word_count, seed)
+    text_bytes = len(text.encode("utf-8"))
+    text_words = count_words(text)
+    results = {}
+
+    own_dir = corpus_dir is None
+    corpus_dir = corpus_dir or tempfile.mkdtemp(prefix="pdf_merger_bench_")
+    os.makedirs(corpus_dir, exist_ok=True)
+    try:
+        corpus = build_corpus(engine, text, corpus_dir)
+
+        # Extractors: throughput over the input file size and the words extracted
+        for fmt, path in corpus.items():
+            extract = getattr(engine, f"_extract_text_from_{fmt}")
+            try:
+                seconds, extracted = _time_best(lambda: extract(path), repeat)
+            except Exception as e:
+                results[f"extract.{fmt}"] = {"error": str(e)}
+                continue
+            results[f"extract.{fmt}"] = _entry(seconds, os.path.getsize(path), count_words(extracted))
+
+        # Generators: throughput over the output size and the words written
+        sanitized = engine._sanitize_text_for_xml(text)
+        for fmt in FORMATS:
+            generate = getattr(engine, f"_generate_{fmt}")
+            source = sanitized if fmt in ("docx", "odt", "epub") else text
+            path = os.path.join(corpus_dir, f"generated.{fmt}")
+            try:
+                seconds, _ = _time_best(lambda: generate(source, path), repeat)
+            except Exception as e:
+                results[f"generate.{fmt}"] = {"error": str(e)}
+                continue
+            results[f"generate.{fmt}"] = _entry(seconds, os.path.getsize(path), text_words)
+
+        # Text stages: throughput over the UTF-8 size of the text
+        engine.options.custom_pii_strings = "Springfield, invoice"
+        seconds, _ = _time_best(lambda: engine.scrub_pii(text), repeat)
+        results["scrub_pii"] = _entry(seconds, text_bytes, text_words)
+
+        seconds, _ = _time_best(lambda: list(engine.split_text(text)), repeat)
+        results["split_text"] = _entry(seconds, text_bytes, text_words)
+    finally:
+        if own_dir:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    return {
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "parameters": {"words": word_count, "repeat": repeat, "seed": seed, "split_word_count": split_word_count},
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Compares words/s against the baseline. Returns the list of regressed benchmark names."""
+    regressions = []
+    for name, entry in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "words_per_second" not in entry or not base.get("words_per_second"):
+            entry["change"] = None
+            continue
+        change = entry["words_per_second"] / base["words_per_second"] - 1
+        entry["change"] = round(change, 3)
+        if change < -tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def print_table(report):
+    print(f"{'benchmark':<16}{'seconds':>10}{'MB/s':>10}{'words/s':>14}{'vs baseline':>13}")
+    for name, entry in report["results"].items():
+        if "error" in entry:
+            print(f"{name:<16}  error: {entry['error']}")
+            continue
+        change = entry.get("change")
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(f"{name:<16}{entry['seconds']:>10.4f}{entry['mb_per_second'] or 0:>10.2f}"
+              f"{entry['words_per_second'] or 0:>14,.0f}{change_text:>13}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Document Merger extractors, generators, PII scrubber and splitter.")
+    parser.add_argument("--words", type=int, default=50000, help="Size of the synthetic corpus in words (default: 50000).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best time is kept (default: 3).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic corpus (default: 0).")
+    parser.add_argument("--split-words", type=int, default=5000, help="Words per part for the split benchmark (default: 5000).")
+    parser.add_argument("--corpus-dir", help="Keep the generated corpus in this folder instead of a temporary one.")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON file.")
+    parser.add_argument("--save-baseline", help="Save the results as a baseline JSON file.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed words/s drop before a regression is reported (default: 0.2).")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a table.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.words, max(1, args.repeat), args.seed, args.split_words, args.corpus_dir)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
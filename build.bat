@@ -25,13 +25,8 @@ echo     ebooklib_datas = collect_data_files^('ebooklib'^)
 echo except:
 echo     ebooklib_datas = []
 echo.
-echo try:
-echo     odf_datas = collect_data_files^('odf'^)
-echo except:
-echo     odf_datas = []
-echo.
 echo # Combine all data files
-echo all_datas = marker_datas + surya_datas + ebooklib_datas + odf_datas
+echo all_datas = marker_datas + surya_datas + ebooklib_datas
 echo.
 echo # Hidden imports for multiprocessing and marker dependencies
 echo hidden_imports = [
@@ -52,19 +47,8 @@ echo     'surya.settings',
 echo     'surya.model',
 echo     'cv2',
 echo     # Multi-format document support
-echo     'docx',
-echo     'docx.shared',
-echo     'docx.oxml',
-echo     'docx.text',
-echo     'docx.document',
-echo     'odf',
-echo     'odf.opendocument',
-echo     'odf.text',
-echo     'odf.teletype',
 echo     'ebooklib',
 echo     'ebooklib.epub',
-echo     'striprtf',
-echo     'striprtf.striprtf',
 echo     'bs4',
 echo     'bs4.builder',
 echo     'bs4.builder._htmlparser',
@@ -1,16 +1,41 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext, simpledialog
+try:
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, scrolledtext, simpledialog
+except ImportError:
+    # Headless installs: MergeEngine and the command line don't need Tk
+    tk = filedialog = messagebox = scrolledtext = simpledialog = None
 import os
 import json
 import threading
+import itertools
+import collections
+import heapq
 import time
 import fitz  # PyMuPDF
 import re
 import tempfile
+import io
+import zipfile
+import codecs
+import mmap
+import posixpath
+import html.entities
+import urllib.parse
+import xml.etree.ElementTree as ElementTree
 import multiprocessing
 import subprocess
 import shutil
 import webbrowser
+import sys
+import glob
+import argparse
+import math
+import random
+import pickle
+import contextlib
+import tracemalloc
+from dataclasses import dataclass, asdict, fields, replace
+from concurrent.futures import ProcessPoolExecutor
 # Marker imports moved to functions to allow environment variable setting first
 import logging
 
@@ -22,12 +47,3356 @@ DOWNLOADS_PATH = os.path.join(os.path.expanduser("~"), "Downloads")
 # Local models directory in app folder
 MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
 
-# Global variables for controlling the merge process thread
-merge_thread = None
-merge_stop_event = threading.Event()
-merge_pause_event = threading.Event()
-merge_running = False
-merge_paused = False
+# Default number of merge jobs allowed to run at the same time
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+# Console log queue: drain interval and maximum messages inserted per drain
+CONSOLE_FLUSH_INTERVAL_MS = 50
+CONSOLE_MAX_BATCH = 5000
+# Console history: messages kept for filtering, and lines kept in the widget
+DEFAULT_CONSOLE_HISTORY_SIZE = 10000
+CONSOLE_DISPLAY_LINES = 2000
+# Console log levels, lowest priority first
+CONSOLE_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+# Memory sampling: RSS sample interval, and the share of the budget that triggers warnings
+MEMORY_SAMPLE_INTERVAL = 0.05
+MEMORY_BUDGET_HEADROOM = 0.9
+# Number of functions listed in profile summaries
+PROFILE_TOP_N = 30
+# Self-benchmark: words in the calibration sample, and the share of the best
+# throughput a worker count must reach to be recommended
+CALIBRATION_SAMPLE_WORDS = 4000
+CALIBRATION_SCALING_THRESHOLD = 0.9
+# Without split by words, the folder watcher starts a new output part after this many words,
+# so rewriting the current part on every arriving file stays bounded
+WATCH_PART_MAX_WORDS = 50000
+# Batch decryption: concurrent qpdf processes, and the qpdf timeout (base seconds plus seconds per MB)
+DEFAULT_DECRYPT_WORKERS = 4
+DECRYPT_TIMEOUT_BASE = 60
+DECRYPT_TIMEOUT_PER_MB = 2.0
+
+# Regex for transcript-style timestamps, e.g. [00:01:23.456 --> 00:01:25.789]
+TIMESTAMP_REGEX = r'\[(?:(?:\d{2}:)?\d{2}:\d{2}\.\d{3})\s*-->\s*(?:(?:\d{2}:)?\d{2}:\d{2}\.\d{3})\]\s*'
+
+# Regex patterns used to redact PII from extracted text
+PII_PATTERNS = {
+    "FULL_NAME": r'\b[A-Z]{4,}\s[A-Z]{4,}\b',
+    "STREET_ADDRESS": r'\b\d{1,5}\s[A-Z0-9]+(?:\s[A-Z0-9]+)*\s?(?:STREET|ST|AVENUE|AVE|ROAD|RD|LANE|LN|DRIVE|DR|COURT|CT|PLACE|PL|BOULEVARD|BLVD)\b',
+    "CITY_STATE_ZIP": r'\b[A-Z\s]+,\s[A-Z]{2}\s\d{5}(?:-\d{4})?\b',
+    "ACCOUNT_NUMBER": r'\b\d{5}-\d{5}(?:-\d)?\b',
+    "ID_NUMBER": r'\b\d{8,19}\b',
+    "EMAIL": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+}
+
+# Vocabulary for synthetic text (benchmarks and the self-benchmark); PII-like
+# tokens and timestamps are mixed in so the scrubber does representative work
+SYNTHETIC_WORDS = (
+    "the quick brown fox jumps over lazy dog merger document page section "
+    "report summary analysis customer account invoice payment delivery schedule "
+    "meeting transcript speaker question answer review approval policy contract"
+).split()
+SYNTHETIC_PII_SAMPLES = (
+    "JOHN SMITH", "jane.doe@example.com", "12345-67890", "4111111111111111",
+    "1200 MAIN STREET", "SPRINGFIELD, IL 62704",
+)
+SYNTHETIC_TIMESTAMP = "[00:01:23.456 --> 00:01:25.789] "
+
+# XML namespace of WordprocessingML (DOCX word/document.xml)
+DOCX_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# XML namespaces of OpenDocument text, tables and the office body (ODT content.xml)
+ODT_TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+ODT_TABLE_NS = '{urn:oasis:names:tc:opendocument:xmlns:table:1.0}'
+ODT_OFFICE_NS = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+# XML namespaces of the EPUB container and package (OPF) documents
+EPUB_CONTAINER_NS = '{urn:oasis:names:tc:opendocument:xmlns:container}'
+EPUB_OPF_NS = '{http://www.idpf.org/2007/opf}'
+# EPUBs whose spine documents total at least this many bytes have their chapters processed in parallel
+EPUB_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+# Errors of the fast EPUB reader on a malformed book; these fall back to ebooklib, anything else is raised
+EPUB_PARSE_ERRORS = (zipfile.BadZipFile, KeyError, ValueError, ElementTree.ParseError)
+# Generated EPUBs start a new chapter after about this many characters (and at each source file)
+EPUB_CHAPTER_CHARS = 100000
+# Text inputs are decoded in chunks of this many bytes; the encoding is guessed from the first sample
+TEXT_CHUNK_SIZE = 4 * 1024 * 1024
+ENCODING_SAMPLE_SIZE = 64 * 1024
+# Byte order marks checked before the UTF-8 sample test (UTF-32 first, its LE mark starts with UTF-16's)
+TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# RTF destination groups whose content is not document text (groups starting
+# with \* are skipped as well)
+RTF_DESTINATIONS = frozenset((
+    'annotation', 'atnauthor', 'atndate', 'atnicn', 'atnid', 'atnparent', 'atnref', 'atntime',
+    'author', 'bkmkend', 'bkmkstart', 'blipuid', 'buptim', 'category', 'colorschememapping',
+    'colortbl', 'comment', 'company', 'creatim', 'datafield', 'datastore', 'defchp', 'defpap',
+    'do', 'doccomm', 'docvar', 'falt', 'fldinst', 'fonttbl', 'footer', 'footerf', 'footerl',
+    'footerr', 'footnote', 'formfield', 'ftncn', 'ftnsep', 'ftnsepc', 'generator', 'header',
+    'headerf', 'headerl', 'headerr', 'info', 'keywords', 'latentstyles', 'listoverridetable',
+    'listpicture', 'listtable', 'manager', 'mmath', 'nonshppict', 'object', 'objdata', 'operator',
+    'panose', 'pgptbl', 'pict', 'pn', 'pntext', 'pntxta', 'pntxtb', 'printim', 'private',
+    'revtbl', 'revtim', 'rsidtbl', 'shpinst', 'shppict', 'stylesheet', 'subject', 'template',
+    'themedata', 'title', 'userprops', 'wgrffmtfilter', 'xmlnstbl',
+))
+# RTF control words and symbols that produce text
+RTF_SPECIAL_CHARACTERS = {
+    'par': '\n', 'sect': '\n\n', 'page': '\n\n', 'line': '\n', 'tab': '\t', 'row': '\n',
+    'cell': '|', 'nestcell': '|', 'emdash': '\u2014', 'endash': '\u2013', 'emspace': '\u2003',
+    'enspace': '\u2002', 'qmspace': '\u2005', 'bullet': '\u2022', 'lquote': '\u2018',
+    'rquote': '\u2019', 'ldblquote': '\u201c', 'rdblquote': '\u201d',
+    '~': '\xa0', '-': '\xad', '_': '\u2011', '{': '{', '}': '}', '\\': '\\',
+    '\n': '\n', '\r': '\n',
+}
+# Font charsets (\fcharsetN) that select a code page other than \ansicpg
+RTF_CHARSET_CODEPAGES = {
+    77: 'mac_roman', 128: 'cp932', 129: 'cp949', 134: 'cp936', 136: 'cp950',
+    161: 'cp1253', 162: 'cp1254', 163: 'cp1258', 177: 'cp1255', 178: 'cp1256',
+    186: 'cp1257', 204: 'cp1251', 222: 'cp874', 238: 'cp1250',
+}
+# Bytes read per chunk by the streaming RTF reader
+RTF_CHUNK_SIZE = 1024 * 1024
+# Characters of extracted text kept per process, so files counted when added are not extracted again
+EXTRACTED_TEXT_CACHE_CHARS = 64 * 1024 * 1024
+# With a memory budget, cached text is limited to this share of it (one byte per character)
+EXTRACTED_TEXT_CACHE_BUDGET_SHARE = 0.25
+
+# Supported input and output formats
+SUPPORTED_INPUT_EXTENSIONS = ('.pdf', '.odt', '.docx', '.txt', '.rtf', '.epub', '.md')
+OUTPUT_EXTENSIONS = {
+    'pdf': '.pdf',
+    'odt': '.odt',
+    'docx': '.docx',
+    'txt': '.txt',
+    'rtf': '.rtf',
+    'epub': '.epub',
+    'md': '.md'
+}
+
+
+def count_words(text):
+    """Counts words in a given text string."""
+    return len(re.findall(r'\b\w+\b', text.lower()))
+
+
+def join_texts(named_texts):
+    """
+    Joins (name, text) pairs into the merged text, each followed by a blank line.
+    Returns the merged text and a list of (name, start offset) sections, one per source.
+    """
+    pieces = []
+    sections = []
+    offset = 0
+    for name, text in named_texts:
+        sections.append((name, offset))
+        pieces.append(text)
+        pieces.append("\n\n")
+        offset += len(text) + 2
+    return ''.join(pieces), sections
+
+
+def make_synthetic_text(word_count, seed=0):
+    """Returns deterministic synthetic text of about word_count words, in paragraphs of 60-120 words."""
+    rng = random.Random(seed)
+    paragraphs = []
+    remaining = word_count
+    while remaining > 0:
+        size = min(remaining, rng.randint(60, 120))
+        words = [rng.choice(SYNTHETIC_WORDS) for _ in range(size)]
+        # About one PII sample per paragraph, and a timestamp at the start of some
+        words[rng.randrange(size)] = rng.choice(SYNTHETIC_PII_SAMPLES)
+        prefix = SYNTHETIC_TIMESTAMP if rng.random() < 0.3 else ""
+        paragraphs.append(prefix + " ".join(words).capitalize() + ".")
+        remaining -= size
+    return "\n\n".join(paragraphs)
+
+
+class _MarkupTextCollector:
+    """XMLParser target that collects the text of an XHTML document, skipping head, script and style."""
+
+    SKIP = ('head', 'script', 'style')
+
+    def __init__(self):
+        self.parts = []
+        self.skip_depth = 0
+
+    def start(self, tag, attrib):
+        if tag.rpartition('}')[2].lower() in self.SKIP:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        if tag.rpartition('}')[2].lower() in self.SKIP:
+            self.skip_depth -= 1
+
+    def data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+    def close(self):
+        return ''.join(self.parts)
+
+
+def _markup_to_text(data):
+    """
+    Strips the markup from an (X)HTML document with the C expat parser. Documents
+    that aren't well-formed XML fall back to BeautifulSoup's html.parser.
+    """
+    parser = ElementTree.XMLParser(target=_MarkupTextCollector())
+    # Named HTML entities such as &nbsp; when the document declares a DOCTYPE
+    parser.entity.update(html.entities.entitydefs)
+    try:
+        parser.feed(data)
+        return parser.close()
+    except ElementTree.ParseError:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(data, 'html.parser')
+        for element in soup(_MarkupTextCollector.SKIP):
+            element.decompose()
+        return soup.get_text()
+
+
+class RtfTextReader:
+    r"""
+    Streaming, linear-time RTF to text converter.
+
+    Reads the document in chunks and tokenizes it with one compiled regex;
+    runs of plain text are taken as a single token. Destination groups such
+    as \pict, \object and \fonttbl are skipped by scanning for braces
+    only, and \binN payloads are skipped by length, so embedded pictures
+    are never materialized. \uN (with \ucN fallback skipping and surrogate
+    pairs) and \'hh escapes are decoded using \ansicpg and the font charsets.
+    """
+
+    TOKEN = re.compile(
+        rb"\\([a-zA-Z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-fA-F]{2})|\\(.)|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.S)
+    # Inside skipped groups only braces, escapes and \bin matter
+    SKIP_TOKEN = re.compile(rb"\\bin(-?\d{1,10}) ?|\\.|[{}]", re.S)
+    # Longest possible control word: backslash, 32 letters, 11 digit/sign chars and a space
+    MAX_TOKEN = 64
+
+    def __init__(self, checkpoint=None):
+        self.checkpoint = checkpoint or (lambda: None)
+        self.encoding = 'cp1252'
+        self.fonts = {}  # font number -> code page from the font table
+        self.font_encoding = None  # code page of the current font, if it has its own charset
+        self.stack = []  # saved (ucskip, ignorable, in_fonttbl, font_encoding) per open group
+        self.ucskip = 1
+        self.curskip = 0
+        self.ignorable = False
+        self.in_fonttbl = False
+        self.skip_depth = 0  # > 0 while fast-skipping an ignorable group
+        self.skip_bytes = 0  # \bin payload bytes still to skip
+        self.hex_bytes = bytearray()
+        self.high_surrogate = None
+        self.font_number = None
+        self.started = False
+        self.finished = False
+
+    def iter_text(self, stream):
+        """Yields the document text in pieces as the stream is read."""
+        buffer = b''
+        while not self.finished:
+            self.checkpoint()
+            chunk = stream.read(RTF_CHUNK_SIZE)
+            at_eof = not chunk
+            buffer += chunk
+            if at_eof:
+                end = len(buffer)
+            else:
+                # Keep a possibly incomplete control word for the next chunk
+                end = buffer.rfind(b'\\', max(0, len(buffer) - self.MAX_TOKEN))
+                if end == -1:
+                    end = len(buffer)
+            out = []
+            position = self._consume(buffer, end, out)
+            if out:
+                yield ''.join(out)
+            buffer = buffer[position:]
+            if at_eof:
+                break
+        if self.hex_bytes:
+            yield self._flush_hex()
+
+    def _decode(self, data):
+        return data.decode(self.font_encoding or self.encoding, errors='replace')
+
+    def _flush_hex(self):
+        text = self._decode(bytes(self.hex_bytes))
+        self.hex_bytes.clear()
+        return text
+
+    def _consume(self, buffer, end, out):
+        """Processes buffer[:end], appending text to out. Returns the position reached."""
+        position = 0
+        while position < end and not self.finished:
+            if self.skip_bytes:
+                step = min(self.skip_bytes, end - position)
+                self.skip_bytes -= step
+                position += step
+                continue
+
+            if self.skip_depth:
+                position = self._skip_group(buffer, position, end)
+                continue
+
+            match = self.TOKEN.match(buffer, position, end)
+            if match is None:
+                # Incomplete token at the chunk boundary
+                break
+            position = match.end()
+            word, argument, hex_code, symbol, brace, text = match.groups()
+
+            if self.hex_bytes and hex_code is None:
+                out.append(self._flush_hex())
+
+            if text is not None:
+                if self.ignorable:
+                    continue
+                if self.curskip:
+                    skipped = min(self.curskip, len(text))
+                    self.curskip -= skipped
+                    text = text[skipped:]
+                if text:
+                    out.append(self._decode(text))
+            elif hex_code is not None:
+                if self.curskip:
+                    self.curskip -= 1
+                elif not self.ignorable:
+                    self.hex_bytes.append(int(hex_code, 16))
+            elif brace is not None:
+                self.curskip = 0
+                self._brace(brace)
+            elif symbol is not None:
+                self.curskip = 0
+                if symbol == b'*':
+                    self._start_skip()
+                elif not self.ignorable:
+                    out.append(RTF_SPECIAL_CHARACTERS.get(symbol.decode('latin-1'), ''))
+            elif word is not None:
+                self.curskip = 0
+                self._control_word(word.decode('ascii'), argument, out)
+            # Line breaks in the RTF source are not text
+        return position
+
+    def _brace(self, brace):
+        if brace == b'{':
+            self.stack.append((self.ucskip, self.ignorable, self.in_fonttbl, self.font_encoding))
+            self.started = True
+        else:
+            if self.stack:
+                self.ucskip, self.ignorable, self.in_fonttbl, self.font_encoding = self.stack.pop()
+            if self.started and not self.stack:
+                # The document group is closed; anything after it is out of band
+                self.finished = True
+
+    def _start_skip(self):
+        """Skips the rest of the current group, which was opened by the preceding brace."""
+        self.ignorable = True
+        if not self.in_fonttbl:
+            self.skip_depth = 1
+
+    def _skip_group(self, buffer, position, end):
+        r"""Scans for the end of a skipped group, honoring escaped braces and \bin payloads."""
+        while position < end:
+            match = self.SKIP_TOKEN.search(buffer, position, end)
+            if match is None:
+                return end
+            if match.group(1) is not None:
+                if match.end() == end and end != len(buffer):
+                    # \binN may continue in the next chunk
+                    return match.start()
+                self.skip_bytes = max(0, int(match.group(1)))
+                return match.end()
+            token = match.group()
+            position = match.end()
+            if token == b'{':
+                self.skip_depth += 1
+            elif token == b'}':
+                self.skip_depth -= 1
+                if self.skip_depth == 0:
+                    # Closes the skipped group
+                    self._brace(b'}')
+                    return position
+        return position
+
+    def _control_word(self, word, argument, out):
+        if word == 'bin' and argument:
+            self.skip_bytes = max(0, int(argument))
+            return
+        if word == 'fonttbl':
+            self.in_fonttbl = True
+            self.ignorable = True
+            return
+        if word in RTF_DESTINATIONS:
+            self.ignorable = True
+            if not self.in_fonttbl:
+                self.skip_depth = 1
+            return
+        if self.in_fonttbl:
+            if word == 'f' and argument:
+                self.font_number = argument
+            elif word == 'fcharset' and argument and self.font_number is not None:
+                self.fonts[self.font_number] = RTF_CHARSET_CODEPAGES.get(int(argument))
+            return
+        if word == 'ansicpg' and argument:
+            try:
+                self.encoding = codecs.lookup(f"cp{argument}").name
+            except LookupError:
+                pass
+        elif word == 'f' and argument:
+            self.font_encoding = self.fonts.get(argument)
+        elif word == 'uc' and argument:
+            self.ucskip = max(0, int(argument))
+        elif self.ignorable:
+            return
+        elif word == 'u' and argument:
+            code = int(argument)
+            if code < 0:
+                code += 0x10000
+            self.curskip = self.ucskip
+            if 0xD800 <= code < 0xDC00:
+                self.high_surrogate = code
+            elif 0xDC00 <= code < 0xE000 and self.high_surrogate is not None:
+                out.append(chr(0x10000 + ((self.high_surrogate - 0xD800) << 10) + (code - 0xDC00)))
+                self.high_surrogate = None
+            else:
+                out.append(chr(code))
+        elif word in RTF_SPECIAL_CHARACTERS:
+            out.append(RTF_SPECIAL_CHARACTERS[word])
+
+
+def _iter_lines(text):
+    """Yields the lines of text one at a time without building a list of them."""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _xml_escape(text):
+    """Escapes text for XML character data."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+class _ZipPackageWriter:
+    """
+    Base for writers that build a zip package (DOCX, ODT, EPUB) part by part.
+
+    Fixed parts are written whole with writestr; the large parts are streamed
+    through a buffered UTF-8 text wrapper, one open part at a time.
+    """
+
+    def __init__(self, output):
+        self.zip = zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED)
+        self.part = None
+
+    def _start_part(self, name, header):
+        """Opens a streamed part and writes its header."""
+        self._end_part()
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.part = io.TextIOWrapper(self.zip.open(info, 'w'), encoding='utf-8')
+        self.part.write(header)
+
+    def _end_part(self, footer=''):
+        """Writes the footer of the streamed part, if one is open, and closes it."""
+        if self.part is not None:
+            self.part.write(footer)
+            self.part.close()
+            self.part = None
+
+    def _finish(self):
+        """Completes the package before the zip is closed."""
+        self._end_part()
+
+    def close(self):
+        try:
+            self._finish()
+        finally:
+            self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DocxWriter(_ZipPackageWriter):
+    """
+    Streaming DOCX writer.
+
+    Writes a minimal package ([Content_Types].xml, relationships, styles and
+    word/document.xml) straight into a zip file or binary stream. Paragraphs
+    are appended to word/document.xml as they are added, so memory use stays
+    flat and time grows linearly with the text.
+    """
+
+    CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+        '</Types>'
+    )
+    PACKAGE_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    DOCUMENT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    STYLES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:docDefaults><w:rPrDefault><w:rPr>'
+        '<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="Calibri" w:cs="Calibri"/>'
+        '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="en-US"/>'
+        '</w:rPr></w:rPrDefault>'
+        '<w:pPrDefault><w:pPr><w:spacing w:after="200" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+        '</w:docDefaults>'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+        '</w:styles>'
+    )
+    DOCUMENT_START = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    )
+    DOCUMENT_END = (
+        '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+        '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" '
+        'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+        '</w:body></w:document>'
+    )
+
+    def __init__(self, output):
+        super().__init__(output)
+        self.zip.writestr('[Content_Types].xml', self.CONTENT_TYPES)
+        self.zip.writestr('_rels/.rels', self.PACKAGE_RELS)
+        self.zip.writestr('word/_rels/document.xml.rels', self.DOCUMENT_RELS)
+        self.zip.writestr('word/styles.xml', self.STYLES)
+        self._start_part('word/document.xml', self.DOCUMENT_START)
+
+    def add_paragraph(self, text):
+        """Appends one paragraph; tabs and carriage returns become <w:tab/> and <w:br/>."""
+        run = _xml_escape(text.replace('\r', '\n'))
+        run = run.replace('\t', '</w:t><w:tab/><w:t xml:space="preserve">')
+        run = run.replace('\n', '</w:t><w:br/><w:t xml:space="preserve">')
+        self.part.write(f'<w:p><w:r><w:t xml:space="preserve">{run}</w:t></w:r></w:p>')
+
+    def _finish(self):
+        self._end_part(self.DOCUMENT_END)
+
+
+class OdtWriter(_ZipPackageWriter):
+    """
+    Streaming ODT writer.
+
+    Writes the mimetype (stored, first), META-INF/manifest.xml and styles.xml,
+    then streams paragraphs into content.xml as they are added.
+    """
+
+    MIMETYPE = 'application/vnd.oasis.opendocument.text'
+    NAMESPACES = (
+        'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+        'xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0" '
+        'office:version="1.2"'
+    )
+    MANIFEST = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" '
+        'manifest:version="1.2">'
+        '<manifest:file-entry manifest:full-path="/" manifest:version="1.2" '
+        'manifest:media-type="application/vnd.oasis.opendocument.text"/>'
+        '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+        '<manifest:file-entry manifest:full-path="styles.xml" manifest:media-type="text/xml"/>'
+        '</manifest:manifest>'
+    )
+    STYLES = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<office:document-styles {NAMESPACES}><office:styles>'
+        '<style:default-style style:family="paragraph">'
+        '<style:paragraph-properties fo:margin-bottom="0.1in"/>'
+        '<style:text-properties fo:font-size="12pt"/>'
+        '</style:default-style>'
+        '<style:style style:name="Standard" style:family="paragraph"/>'
+        '</office:styles></office:document-styles>'
+    )
+    CONTENT_START = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<office:document-content {NAMESPACES}><office:body><office:text>'
+    )
+    CONTENT_END = '</office:text></office:body></office:document-content>'
+    # Leading spaces and every space after the first in a run must be written as <text:s/>
+    SPACES = re.compile(r'^ +| {2,}')
+
+    def __init__(self, output):
+        super().__init__(output)
+        self.zip.writestr(zipfile.ZipInfo('mimetype'), self.MIMETYPE, compress_type=zipfile.ZIP_STORED)
+        self.zip.writestr('META-INF/manifest.xml', self.MANIFEST)
+        self.zip.writestr('styles.xml', self.STYLES)
+        self._start_part('content.xml', self.CONTENT_START)
+
+    @classmethod
+    def _encode_spaces(cls, match):
+        run = match.group()
+        if match.start() == 0:
+            return f'<text:s text:c="{len(run)}"/>'
+        return f' <text:s text:c="{len(run) - 1}"/>'
+
+    def add_paragraph(self, text):
+        """Appends one paragraph, encoding space runs, tabs and carriage returns as ODF elements."""
+        segments = []
+        for segment in _xml_escape(text.replace('\r', '\n')).split('\t'):
+            if '  ' in segment or segment.startswith(' ') or '\n ' in segment:
+                segment = '\n'.join(self.SPACES.sub(self._encode_spaces, line) for line in segment.split('\n'))
+            segments.append(segment.replace('\n', '<text:line-break/>'))
+        self.part.write(f'<text:p text:style-name="Standard">{"<text:tab/>".join(segments)}</text:p>')
+
+    def _finish(self):
+        self._end_part(self.CONTENT_END)
+
+
+class EpubWriter(_ZipPackageWriter):
+    """
+    Streaming, multi-chapter EPUB 3 writer.
+
+    Each chapter is streamed into its own XHTML file. A new chapter starts
+    when start_chapter is called (e.g. at a source file boundary) or when the
+    current one exceeds chapter_chars; paragraphs longer than that are split
+    at spaces. Navigation (nav.xhtml and the NCX) and the package document
+    are built up one entry per chapter and written when the writer is closed.
+    """
+
+    MIMETYPE = 'application/epub+zip'
+    CONTAINER = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+        '<rootfiles><rootfile full-path="EPUB/content.opf" media-type="application/oebps-package+xml"/></rootfiles>'
+        '</container>'
+    )
+    CHAPTER_START = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE html>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+        'lang="{language}" xml:lang="{language}"><head><title>{title}</title></head><body>'
+    )
+    CHAPTER_END = '</body></html>'
+
+    def __init__(self, output, title='Merged Document', language='en', identifier='merged_document',
+                 chapter_chars=EPUB_CHAPTER_CHARS):
+        super().__init__(output)
+        self.title = title
+        self.language = language
+        self.identifier = identifier
+        self.chapter_chars = max(1, chapter_chars)
+        self.chapters = []  # (id, file name) per chapter, in reading order
+        self.nav_items = []
+        self.nav_points = []
+        self.chapter_title = None
+        self.chapter_size = 0
+        self.continuation = 0
+        self.zip.writestr(zipfile.ZipInfo('mimetype'), self.MIMETYPE, compress_type=zipfile.ZIP_STORED)
+        self.zip.writestr('META-INF/container.xml', self.CONTAINER)
+
+    def start_chapter(self, title=None, heading=True):
+        """Closes the current chapter and starts a new one, optionally headed by its title."""
+        self.chapter_title = title or f"Chapter {len(self.chapters) + 1}"
+        self.continuation = 1
+        self._open_chapter(self.chapter_title, heading)
+
+    def _open_chapter(self, label, heading):
+        """Streams a new chapter file and adds its navigation entries."""
+        self._end_part(self.CHAPTER_END)
+        number = len(self.chapters) + 1
+        chapter_id = f"chap_{number:02d}"
+        file_name = f"{chapter_id}.xhtml"
+        label = _xml_escape(label)
+        self.chapters.append((chapter_id, file_name))
+        self.nav_items.append(f'<li><a href="{file_name}">{label}</a></li>')
+        self.nav_points.append(
+            f'<navPoint id="{chapter_id}" playOrder="{number}"><navLabel><text>{label}</text></navLabel>'
+            f'<content src="{file_name}"/></navPoint>')
+        self._start_part(f"EPUB/{file_name}", self.CHAPTER_START.format(language=self.language, title=label))
+        if heading:
+            self.part.write(f'<h1>{label}</h1>\n')
+        self.chapter_size = 0
+
+    def add_paragraph(self, text):
+        """Appends one paragraph to the current chapter, starting new chapters as needed."""
+        if self.part is None:
+            self.start_chapter()
+        while len(text) > self.chapter_chars:
+            cut = text.rfind(' ', 0, self.chapter_chars)
+            if cut <= 0:
+                cut = self.chapter_chars
+            self.add_paragraph(text[:cut])
+            text = text[cut:].lstrip(' ')
+        if self.chapter_size and self.chapter_size + len(text) > self.chapter_chars:
+            # Continue an oversized chapter in the next file, titled after it
+            self.continuation += 1
+            self._open_chapter(f"{self.chapter_title} ({self.continuation})", heading=False)
+        self.part.write(f'<p>{_xml_escape(text)}</p>\n')
+        self.chapter_size += len(text)
+
+    def _finish(self):
+        if not self.chapters:
+            self.start_chapter(self.title)
+        self._end_part(self.CHAPTER_END)
+        title = _xml_escape(self.title)
+        self.zip.writestr('EPUB/nav.xhtml', (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE html>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+            f'lang="{self.language}" xml:lang="{self.language}"><head><title>{title}</title></head><body>'
+            f'<nav epub:type="toc" id="toc"><h2>{title}</h2><ol>{"".join(self.nav_items)}</ol></nav>'
+            '</body></html>'))
+        self.zip.writestr('EPUB/toc.ncx', (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">'
+            f'<head><meta name="dtb:uid" content="{_xml_escape(self.identifier)}"/></head>'
+            f'<docTitle><text>{title}</text></docTitle>'
+            f'<navMap>{"".join(self.nav_points)}</navMap></ncx>'))
+        manifest = ''.join(
+            f'<item id="{chapter_id}" href="{file_name}" media-type="application/xhtml+xml"/>'
+            for chapter_id, file_name in self.chapters)
+        spine = ''.join(f'<itemref idref="{chapter_id}"/>' for chapter_id, _ in self.chapters)
+        modified = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        self.zip.writestr('EPUB/content.opf', (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id">'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<dc:identifier id="id">{_xml_escape(self.identifier)}</dc:identifier>'
+            f'<dc:title>{title}</dc:title><dc:language>{self.language}</dc:language>'
+            f'<meta property="dcterms:modified">{modified}</meta></metadata>'
+            '<manifest><item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>'
+            '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+            f'{manifest}</manifest>'
+            f'<spine toc="ncx">{spine}</spine></package>'))
+
+
+class RtfWriter:
+    r"""
+    Streaming RTF writer.
+
+    Writes an ASCII-only RTF document to a file path or binary stream, one
+    paragraph (\par) at a time. Backslashes and braces are escaped, tabs and
+    carriage returns become \tab and \line, and every non-ASCII character is
+    written as \uN? (surrogate pairs outside the BMP), so no code page is needed.
+    """
+
+    HEADER = (
+        '{\\rtf1\\ansi\\ansicpg1252\\deff0\\uc1'
+        '{\\fonttbl{\\f0\\froman\\fcharset0 Times New Roman;}}\n'
+        '\\pard\\sa180\\f0\\fs24\n'
+    )
+    ESCAPES = str.maketrans({'\\': '\\\\', '{': '\\{', '}': '\\}', '\t': '\\tab ', '\r': '\\line '})
+    NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+    def __init__(self, output):
+        if _is_path(output):
+            self.stream = open(output, 'w', encoding='ascii', newline='')
+            self.owns_stream = True
+        else:
+            self.stream = io.TextIOWrapper(output, encoding='ascii', newline='')
+            self.owns_stream = False
+        self.stream.write(self.HEADER)
+
+    @staticmethod
+    def _unicode_escape(match):
+        code = ord(match.group())
+        if code > 0xFFFF:
+            code -= 0x10000
+            return f"\\u{(0xD800 + (code >> 10)) - 0x10000}?\\u{(0xDC00 + (code & 0x3FF)) - 0x10000}?"
+        # \uN takes a signed 16-bit value
+        return f"\\u{code - 0x10000 if code >= 0x8000 else code}?"
+
+    def add_paragraph(self, text):
+        """Appends one paragraph."""
+        text = text.translate(self.ESCAPES)
+        if not text.isascii():
+            text = self.NON_ASCII.sub(self._unicode_escape, text)
+        self.stream.write(f"{text}\\par\n")
+
+    def close(self):
+        if self.stream is None:
+            return
+        self.stream.write('}')
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            # Leave the caller's stream open
+            self.stream.flush()
+            self.stream.detach()
+        self.stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _null_log(message, tag=None):
+    """Default log callback for the merge engine: discards messages."""
+    pass
+
+
+def _is_path(source):
+    """Returns True if the source is a filesystem path rather than bytes or a stream."""
+    return isinstance(source, (str, os.PathLike))
+
+
+def _path_key(path):
+    """Normalizes a path for use as a dictionary key."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def detect_text_encoding(sample):
+    """Guesses the encoding of a text file from a prefix sample of its bytes."""
+    for bom, encoding in TEXT_BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # final=False: the sample may end in the middle of a character
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    # UTF-16 without a BOM: every other byte of ASCII text is NUL
+    if sample and sample.count(0) * 3 > len(sample):
+        return 'utf-16-le' if sample[1::2].count(0) > sample[::2].count(0) else 'utf-16-be'
+    return 'cp1252'
+
+
+@contextlib.contextmanager
+def _mapped_file(path):
+    """Memory-maps a file read-only and yields a memoryview of it (empty files yield b'')."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            yield view
+
+
+class PasswordStore:
+    """
+    In-memory password map for encrypted PDF inputs, like a session keyring.
+
+    Holds per-file passwords plus common passwords that are tried on every
+    file. It is never persisted: MergeOptions, settings.json, job journals and
+    run reports don't include it.
+    """
+
+    def __init__(self, common=()):
+        self.files = {}  # normalized path -> password
+        self.common = []
+        for password in common:
+            self.add_common(password)
+
+    @staticmethod
+    def _key(path):
+        return _path_key(path)
+
+    def set(self, path, password):
+        self.files[self._key(path)] = password
+
+    def add_common(self, password):
+        if password and password not in self.common:
+            self.common.append(password)
+
+    def clear(self):
+        self.files.clear()
+        self.common.clear()
+
+    def candidates(self, path=None):
+        """Returns the passwords to try for a file: its own first, then the common ones."""
+        own = self.files.get(self._key(path)) if _is_path(path) else None
+        return list(dict.fromkeys(p for p in [own, *self.common] if p is not None))
+
+    def authenticate(self, doc, path=None):
+        """Unlocks an encrypted fitz document with the first matching password. Returns True on success."""
+        for password in self.candidates(path):
+            if doc.authenticate(password):
+                if _is_path(path):
+                    # Remember which password opened the file
+                    self.set(path, password)
+                return True
+        return False
+
+
+# Errors fitz.open raises for missing, empty or unreadable files (EmptyFileError is a FileDataError)
+FITZ_OPEN_ERRORS = (fitz.FileDataError, fitz.FileNotFoundError)
+
+
+def find_locked_pdfs(files, passwords):
+    """
+    Returns the encrypted PDFs in files that no password in the PasswordStore opens.
+    Files fitz can't open are left out; they are reported when a job processes them.
+    """
+    locked = []
+    for path in files:
+        if not path.lower().endswith('.pdf'):
+            continue
+        try:
+            with fitz.open(path) as doc:
+                if doc.needs_pass and not passwords.authenticate(doc, path):
+                    locked.append(path)
+        except FITZ_OPEN_ERRORS:
+            continue
+    return locked
+
+
+class PdfPasswordRequired(ValueError):
+    """Raised when an encrypted PDF can't be opened with any password in the PasswordStore."""
+
+
+class ExtractedTextCache:
+    """
+    Per-process cache of extracted text, keyed by file path and checked
+    against the file's size and modification time, so a changed file is
+    extracted again. The least recently used entries are evicted once the
+    cache holds more than max_chars characters, or the smaller limit passed
+    to put() by an engine with a memory budget.
+
+    Extractors don't depend on MergeOptions: the text is cached before
+    timestamp removal and PII scrubbing, which process_file applies on every
+    merge with the job's own options.
+    """
+
+    def __init__(self, max_chars=EXTRACTED_TEXT_CACHE_CHARS):
+        self.max_chars = max_chars
+        self._entries = collections.OrderedDict()  # normalized path -> ((size, mtime_ns), text)
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, path):
+        """Returns the cached text of an unchanged file, or None."""
+        try:
+            signature = self._signature(path)
+        except OSError:
+            return None
+        key = _path_key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, path, text, max_chars=None):
+        """Caches the text extracted from a file, replacing any older version."""
+        max_chars = self.max_chars if max_chars is None else min(max_chars, self.max_chars)
+        if len(text) > max_chars:
+            return
+        try:
+            signature = self._signature(path)
+        except OSError:
+            return
+        key = _path_key(path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._chars -= len(old[1])
+            self._entries[key] = (signature, text)
+            self._chars += len(text)
+            while self._chars > max_chars:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+_extracted_text_cache = ExtractedTextCache()
+
+# Output paths reserved by live engines, so concurrent jobs writing to one folder never pick the same name
+_output_names_lock = threading.Lock()
+_reserved_output_paths = set()  # normalized paths
+
+
+def _output_name_pattern(base, extension):
+    """
+    Matches the names of numbered outputs (Name.ext, Name2.ext, Name3.ext, ...); group 1 is the
+    number. Only numbers from 2 without leading zeros match, so "Name1.ext" or "Name02.ext" don't.
+    """
+    return re.compile(re.escape(base) + r'((?:[2-9]|[1-9]\d)\d*)?' + re.escape(extension), re.IGNORECASE)
+
+
+def _create_temp_file(path):
+    """Creates an empty, uniquely named temp file next to path and returns its path."""
+    for _ in range(100):
+        temp_path = f"{path}.{random.getrandbits(32):08x}.tmp"
+        try:
+            # O_EXCL: a name another writer already holds is never reused
+            os.close(os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+            return temp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not create a temp file for {path}")
+
+
+class MergeCancelled(BaseException):
+    """
+    Raised inside the merge pipeline when a job is stopped. Derives from
+    BaseException so per-file "except Exception" handlers don't swallow it.
+    """
+
+
+class CancellationToken:
+    """
+    Cooperative stop and pause signal for a merge job. The pipeline calls
+    checkpoint() between pages, paragraphs and output parts: it blocks on a
+    condition while the job is paused and raises MergeCancelled once stopped,
+    so both take effect within one page without polling.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._paused = False
+
+    @property
+    def is_stopped(self):
+        return self._stopped
+
+    @property
+    def is_paused(self):
+        return self._paused
+
+    def stop(self):
+        """Requests cancellation and wakes any paused or waiting threads."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def pause(self):
+        with self._condition:
+            self._paused = True
+
+    def resume(self):
+        with self._condition:
+            self._paused = False
+            self._condition.notify_all()
+
+    def checkpoint(self):
+        """Blocks while paused and raises MergeCancelled if the job has been stopped."""
+        if not (self._paused or self._stopped):
+            return
+        with self._condition:
+            while self._paused and not self._stopped:
+                self._condition.wait()
+            if self._stopped:
+                raise MergeCancelled()
+
+    def wait(self, timeout):
+        """Sleeps for up to timeout seconds, returning early (True) if stopped."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._stopped, timeout)
+
+
+@dataclass
+class MergeOptions:
+    """Plain, Tk-independent snapshot of the merge configuration."""
+    output_folder: str = DOWNLOADS_PATH
+    output_file_type: str = "PDF"
+    output_filename: str = ""
+    remove_timestamps: bool = False
+    remove_images: bool = False
+    remove_pii: bool = False
+    custom_pii_strings: str = ""
+    split_by_words: bool = False
+    split_word_count: int = 10000
+    markdown_type: str = "simple"
+    memory_sampling: bool = False
+    trace_allocations: bool = False
+    memory_budget_mb: int = 0
+    workers: int = 1
+    worker_chunk_size: int = 1
+    epub_chapter_chars: int = EPUB_CHAPTER_CHARS
+
+
+# MergeOptions fields that may hold personal data; they are masked wherever options are written to disk
+SENSITIVE_OPTION_FIELDS = ("custom_pii_strings",)
+
+
+def persistable_options(options):
+    """Returns the options as a dict with sensitive fields masked, for journals, reports and summaries."""
+    data = asdict(options)
+    for name in SENSITIVE_OPTION_FIELDS:
+        if data.get(name):
+            data[name] = "<redacted>"
+    return data
+
+
+@dataclass
+class OutputPart:
+    """A generated output part held in memory."""
+    number: int
+    filename: str
+    data: bytes
+    word_count: int
+
+
+_rss_reader = None
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def _make_rss_reader():
+    """Returns a function reading this process's resident set size in bytes, or None if unsupported."""
+    if sys.platform.startswith('linux'):
+        page_size = os.sysconf('SC_PAGE_SIZE')
+
+        def read_statm():
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * page_size
+        return read_statm
+
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        kernel32 = ctypes.WinDLL('kernel32')
+        psapi = ctypes.WinDLL('psapi')
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+        process = kernel32.GetCurrentProcess()
+
+        def read_working_set():
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+            return counters.WorkingSetSize
+        return read_working_set
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Elsewhere only the peak RSS is available (bytes on macOS, KiB on BSDs)
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def current_rss():
+    """Returns the resident set size of this process in bytes, or 0 if it cannot be read."""
+    global _rss_reader
+    if _rss_reader is None:
+        _rss_reader = _make_rss_reader() or (lambda: 0)
+    try:
+        return _rss_reader()
+    except (OSError, ValueError):
+        return 0
+
+
+class MemoryMonitor:
+    """
+    Samples process memory around pipeline stages and enforces an optional budget.
+
+    RSS is sampled by a short-lived background thread while a stage runs. It is
+    process-wide, so with concurrent jobs a stage's peak includes the other jobs.
+    With trace_allocations, tracemalloc also reports the traced peak and the top
+    allocation sites of each stage.
+    """
+
+    TOP_ALLOCATIONS = 5
+
+    def __init__(self, trace_allocations=False, budget_mb=0, log=None):
+        self.trace_allocations = trace_allocations
+        self.budget = int(budget_mb or 0) * 1048576
+        self.log = log or _null_log
+        self._tracing = False
+        if trace_allocations:
+            self._start_tracing()
+
+    def _start_tracing(self):
+        global _tracemalloc_users
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            _tracemalloc_users += 1
+        self._tracing = True
+
+    def close(self):
+        """Stops tracemalloc if this was the last monitor using it."""
+        global _tracemalloc_users
+        if not self._tracing:
+            return
+        self._tracing = False
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0 and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def near_budget(self, extra_bytes=0):
+        """Returns True if current RSS plus extra_bytes would exceed the budget headroom."""
+        return bool(self.budget) and current_rss() + extra_bytes >= self.budget * MEMORY_BUDGET_HEADROOM
+
+    @contextlib.contextmanager
+    def sample(self, name, counters):
+        """Samples memory while the enclosed stage runs and stores the results in counters."""
+        rss_start = current_rss()
+        peak = [rss_start]
+        warned = [False]
+        done = threading.Event()
+
+        def check_budget(rss):
+            if self.budget and not warned[0] and rss >= self.budget * MEMORY_BUDGET_HEADROOM:
+                warned[0] = True
+                self.log(f"[MEM] Memory use {rss / 1048576:.0f} MB is close to the "
+                         f"{self.budget / 1048576:.0f} MB budget during '{name}'.", "warning")
+
+        def sample_loop():
+            while not done.wait(MEMORY_SAMPLE_INTERVAL):
+                rss = current_rss()
+                if rss > peak[0]:
+                    peak[0] = rss
+                    check_budget(rss)
+
+        check_budget(rss_start)
+        if self._tracing:
+            tracemalloc.reset_peak()
+        sampler = threading.Thread(target=sample_loop, daemon=True)
+        sampler.start()
+        try:
+            yield
+        finally:
+            done.set()
+            sampler.join()
+            rss_end = current_rss()
+            peak[0] = max(peak[0], rss_end)
+            counters["rss_start_mb"] = round(rss_start / 1048576, 1)
+            counters["rss_peak_mb"] = round(peak[0] / 1048576, 1)
+            counters["rss_end_mb"] = round(rss_end / 1048576, 1)
+            if self._tracing:
+                counters["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1048576, 1)
+                statistics = tracemalloc.take_snapshot().statistics('lineno')[:self.TOP_ALLOCATIONS]
+                counters["top_allocations"] = [
+                    f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} {stat.size / 1048576:.1f} MB"
+                    for stat in statistics
+                ]
+            self.log(f"[MEM] {name}: peak {counters['rss_peak_mb']:.1f} MB RSS "
+                     f"({(peak[0] - rss_start) / 1048576:+.1f} MB)", "debug")
+
+
+class RunTelemetry:
+    """
+    Per-stage timing and throughput counters for a merge run.
+
+    Each stage records wall time, CPU time of the calling thread, and the
+    bytes, characters and words it handled. Every processed file and output
+    part keeps its own per-stage record; stage totals are summed from them.
+    With a MemoryMonitor, each stage also records its RSS (and traced) peak.
+    """
+
+    STAGES = ("extract", "timestamps", "pii", "generate")
+    COUNTERS = ("wall_seconds", "cpu_seconds", "bytes", "chars", "words")
+
+    def __init__(self, memory=None):
+        self.memory = memory
+        self.started_at = time.time()
+        self._wall_start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.files = []
+        self.parts = []
+
+    @contextlib.contextmanager
+    def stage(self, name, record):
+        """Times the enclosed block as a stage of record. Yields a counters dict for bytes/chars/words."""
+        counters = {"bytes": 0, "chars": 0, "words": 0}
+        memory = self.memory.sample(name, counters) if self.memory else contextlib.nullcontext()
+        with memory:
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                yield counters
+            finally:
+                counters["wall_seconds"] = time.perf_counter() - wall_start
+                counters["cpu_seconds"] = time.thread_time() - cpu_start
+                record["stages"][name] = counters
+
+    def add_file(self, record):
+        """Stores a per-file record (also used for records returned by worker processes)."""
+        with self._lock:
+            self.files.append(record)
+
+    def add_part(self, record):
+        with self._lock:
+            self.parts.append(record)
+
+    def stage_summary(self):
+        """Returns the per-stage totals with MB/s and words/s throughput."""
+        totals = {stage: dict.fromkeys(("calls",) + self.COUNTERS, 0) for stage in self.STAGES}
+        with self._lock:
+            records = self.files + self.parts
+        for record in records:
+            for name, counters in record["stages"].items():
+                total = totals[name]
+                total["calls"] += 1
+                for key in self.COUNTERS:
+                    total[key] += counters[key]
+                for key in ("rss_peak_mb", "traced_peak_mb"):
+                    if key in counters:
+                        total[key] = max(total.get(key, 0), counters[key])
+
+        summary = {}
+        for name, total in totals.items():
+            if total["calls"]:
+                entry = dict(total)
+                wall = total["wall_seconds"]
+                entry["mb_per_second"] = round(total["bytes"] / 1048576 / wall, 3) if wall and total["bytes"] else None
+                entry["words_per_second"] = round(total["words"] / wall, 1) if wall else None
+                entry["wall_seconds"] = round(wall, 6)
+                entry["cpu_seconds"] = round(total["cpu_seconds"], 6)
+                summary[name] = entry
+        return summary
+
+    def report(self, **extra):
+        """Builds the JSON-serializable run report."""
+        report = {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "wall_seconds": round(time.perf_counter() - self._wall_start, 3),
+        }
+        report.update(extra)
+        report["stages"] = self.stage_summary()
+        with self._lock:
+            report["files"] = list(self.files)
+            report["parts"] = list(self.parts)
+        return report
+
+    def write_report(self, output_folder, base_name, **extra):
+        """Writes the run report as JSON to the output folder. Returns its path."""
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        path = os.path.join(output_folder, f"{base_name}_run_report_{stamp}.json")
+        counter = 1
+        while os.path.exists(path):
+            counter += 1
+            path = os.path.join(output_folder, f"{base_name}_run_report_{stamp}_{counter}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**extra), f, indent=2, default=str)
+        return path
+
+
+def _process_file_worker(file_path, options, passwords=None, cached_text=None):
+    """
+    Worker process entry point: processes a single file. Returns (text, telemetry record, None),
+    or (None, None, exception) so one failing file doesn't abort the pool.
+    cached_text is the file's text from the parent's extraction cache, if it had one.
+    """
+    # Already in a worker process: extractors must not start pools of their own
+    engine = MergeEngine(replace(options, workers=1), passwords=passwords)
+    if cached_text is not None:
+        _extracted_text_cache.put(file_path, cached_text)
+    try:
+        text = engine.process_file(file_path)
+        # Stage timings are returned to the parent, which aggregates them
+        return text, engine.telemetry.files[-1], None
+    except Exception as e:
+        return None, None, _picklable_error(e)
+    finally:
+        engine.close()
+
+
+def _picklable_error(error):
+    """Returns the exception if it can be sent back to the parent process, else an Exception naming its type."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return Exception(f"{type(error).__name__}: {error}")
+
+
+def _calibration_noop(delay=0.0):
+    """Worker task used to start pool workers and measure task dispatch overhead."""
+    if delay:
+        time.sleep(delay)
+
+
+def _calibration_task(file_path, options):
+    """Worker task for the self-benchmark: extracts and scrubs the calibration PDF."""
+    # Extracts directly: repeated tasks on the same file must not hit the extraction cache
+    engine = MergeEngine(options)
+    return len(engine.scrub_pii(engine._extract_text_from_pdf(file_path)))
+
+
+def calibrate_machine(log=None, token=None, max_workers=None, sample_words=CALIBRATION_SAMPLE_WORDS):
+    """
+    Short self-benchmark of this machine. Measures single-core throughput of PDF
+    generation, PDF extraction and PII scrubbing on synthetic text, then the
+    files/s of extraction + PII across worker process counts. Returns a dict
+    with the measurements and recommended workers, worker chunk size and
+    concurrent jobs.
+    """
+    log = log or _null_log
+    token = token or CancellationToken()
+    cpu_count = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers or cpu_count, cpu_count))
+    options = MergeOptions(remove_pii=True)
+    engine = MergeEngine(options, token=token)
+    text = make_synthetic_text(sample_words)
+    words = count_words(text)
+    results = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "cpu_count": cpu_count,
+        "sample_words": words,
+    }
+
+    temp_dir = tempfile.mkdtemp(prefix="pdf_merger_calibration_")
+    try:
+        # --- Single-core throughput ---
+        pdf_path = os.path.join(temp_dir, "calibration.pdf")
+        start = time.perf_counter()
+        engine._generate_pdf(text, pdf_path)
+        elapsed = time.perf_counter() - start
+        results["pdf_generate_words_per_second"] = round(words / elapsed, 1)
+        token.checkpoint()
+
+        start = time.perf_counter()
+        extracted = engine._extract_text_from_pdf(pdf_path)
+        elapsed = time.perf_counter() - start
+        results["extract_mb_per_second"] = round(os.path.getsize(pdf_path) / 1048576 / elapsed, 3)
+        results["extract_words_per_second"] = round(count_words(extracted) / elapsed, 1)
+        token.checkpoint()
+
+        start = time.perf_counter()
+        engine.scrub_pii(extracted)
+        elapsed = time.perf_counter() - start
+        results["pii_mb_per_second"] = round(len(extracted.encode('utf-8')) / 1048576 / elapsed, 3)
+        log(f"[BENCH] Single core: PDF generation {results['pdf_generate_words_per_second']:,.0f} words/s, "
+            f"PDF extraction {results['extract_words_per_second']:,.0f} words/s, "
+            f"PII scrub {results['pii_mb_per_second']:.2f} MB/s", "info")
+
+        # --- Scaling across worker processes ---
+        worker_counts = sorted({2 ** n for n in range(max_workers.bit_length()) if 2 ** n <= max_workers} | {max_workers})
+        scaling = {}
+        dispatch_overhead = 0.0
+        for workers in worker_counts:
+            token.checkpoint()
+            tasks = max(4, workers * 3)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Start every worker (and its imports) before timing
+                list(executor.map(_calibration_noop, [0.1] * workers))
+                if workers == 1:
+                    start = time.perf_counter()
+                    list(executor.map(_calibration_noop, [0.0] * 50))
+                    dispatch_overhead = (time.perf_counter() - start) / 50
+                start = time.perf_counter()
+                list(executor.map(_calibration_task, [pdf_path] * tasks, itertools.repeat(options)))
+                elapsed = time.perf_counter() - start
+            scaling[workers] = tasks / elapsed
+            log(f"[BENCH] {workers} worker(s): {scaling[workers]:.1f} files/s "
+                f"({scaling[workers] / scaling[1]:.2f}x)", "info")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # Fewest workers that reach most of the best throughput
+    best = max(scaling.values())
+    recommended_workers = min(w for w, rate in scaling.items() if rate >= best * CALIBRATION_SCALING_THRESHOLD)
+    # Enough files per task that dispatch overhead stays under ~10% of the work
+    task_seconds = 1 / scaling[1]
+    recommended_chunk = max(1, min(64, math.ceil(dispatch_overhead * 10 / task_seconds)))
+
+    results["scaling_files_per_second"] = {str(w): round(rate, 2) for w, rate in scaling.items()}
+    results["dispatch_overhead_seconds"] = round(dispatch_overhead, 6)
+    results["recommended_workers"] = recommended_workers
+    results["recommended_worker_chunk_size"] = recommended_chunk
+    results["recommended_max_concurrent_jobs"] = max(1, min(4, cpu_count // recommended_workers))
+    return results
+
+
+_profile_lock = threading.Lock()  # held while a ProfileCapture is running
+
+
+class ProfileCapture:
+    """
+    Profiles the calling thread with cProfile between start() and stop(), then
+    saves <base>_profile_<timestamp>.prof plus a top-N text summary (by
+    cumulative and by own time) to the output folder. Only one capture runs at
+    a time. Work done in worker processes is not seen, so profiled runs use
+    workers=1.
+    """
+
+    def __init__(self, output_folder, base_name, top_n=PROFILE_TOP_N):
+        import cProfile
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.profile_path = os.path.join(output_folder, f"{base_name}_profile_{stamp}.prof")
+        self.summary_path = os.path.join(output_folder, f"{base_name}_profile_{stamp}.txt")
+        self.top_n = top_n
+        self.hot_functions = []  # (own seconds, cumulative seconds, calls, "file:line(function)")
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        """Starts profiling. Returns False if another capture is already running."""
+        if not _profile_lock.acquire(blocking=False):
+            return False
+        self.profiler.enable()
+        return True
+
+    def stop(self):
+        """Stops profiling and saves the profile and summary."""
+        try:
+            self.profiler.disable()
+        finally:
+            _profile_lock.release()
+        self.save()
+
+    def save(self):
+        import pstats
+        self.profiler.dump_stats(self.profile_path)
+
+        summary = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=summary).strip_dirs()
+        summary.write(f"Top {self.top_n} functions by cumulative time\n")
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        summary.write(f"\nTop {self.top_n} functions by own time\n")
+        stats.sort_stats("tottime").print_stats(self.top_n)
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+
+        hot = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top_n]
+        self.hot_functions = [
+            (own, cumulative, calls, f"{filename}:{line}({function})")
+            for (filename, line, function), (_, calls, own, cumulative, _) in hot
+        ]
+
+
+def _output_base_and_extension(options, extension=None):
+    """Returns the output base name and extension for the configured filename and type."""
+    # Use custom filename if provided, otherwise use default
+    if options.output_filename.strip():
+        base_filename = options.output_filename.strip()
+        # Remove extension if provided
+        base, _ = os.path.splitext(base_filename)
+    else:
+        base, _ = os.path.splitext(DEFAULT_OUTPUT_FILENAME)
+
+    # Determine extension based on output type
+    if extension is None:
+        output_type = options.output_file_type.lower()
+        extension = OUTPUT_EXTENSIONS.get(output_type, '.pdf')
+
+    return base, extension
+
+
+class MergeEngine:
+    """
+    Extraction, scrubbing and output generation for the merge pipeline.
+    Holds no Tk state, so it can be driven by the GUI, the CLI or worker processes.
+
+    Sources can be file paths, bytes or binary file-like objects. Since bytes and
+    streams have no file name, pass a (name, source) tuple or let the engine
+    detect the format from the content.
+
+    An optional CancellationToken is checked between pages, paragraphs and
+    output parts; stopping it makes the running call raise MergeCancelled.
+
+    Encrypted PDFs are unlocked in memory with the passwords in an optional
+    PasswordStore; no decrypted copy is written.
+
+    Stage timings and throughput are collected in self.telemetry (RunTelemetry),
+    and memory peaks in self.memory when sampling or a memory budget is enabled.
+
+    Example:
+        engine = MergeEngine(MergeOptions(output_file_type="TXT", remove_pii=True))
+        for part in engine.iter_parts([("a.pdf", pdf_bytes), open("b.docx", "rb")]):
+            upload(part.filename, part.data)
+    """
+
+    def __init__(self, options=None, log=None, token=None, telemetry=None, passwords=None):
+        self.options = options or MergeOptions()
+        self.log = log or _null_log
+        self.token = token or CancellationToken()
+        self.passwords = passwords if passwords is not None else PasswordStore()
+        self.memory = None
+        if self.options.memory_sampling or self.options.trace_allocations or self.options.memory_budget_mb:
+            self.memory = MemoryMonitor(self.options.trace_allocations, self.options.memory_budget_mb, self.log)
+        self.telemetry = telemetry or RunTelemetry(self.memory)
+        self._name_offsets = {}  # extension -> index of the last existing output, see reserve_output_names
+        self._part_paths = {}  # (extension, counter) -> reserved output path
+        self._reserved_paths = set()  # this engine's entries in _reserved_output_paths
+
+    def close(self):
+        """Releases diagnostics resources (stops allocation tracing started by this engine) and output names."""
+        if self.memory:
+            self.memory.close()
+        with _output_names_lock:
+            _reserved_output_paths.difference_update(self._reserved_paths)
+            self._reserved_paths.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _resolve_source(self, source, name=None):
+        """Normalizes a source to a path or seekable binary stream and determines its extension."""
+        if isinstance(source, tuple):
+            name, source = source
+        if _is_path(source):
+            source = os.fspath(source)
+            return source, os.path.splitext(name or source)[1].lower()
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            stream = io.BytesIO(source)
+        elif hasattr(source, 'read'):
+            name = name or getattr(source, 'name', None)
+            stream = source if getattr(source, 'seekable', lambda: False)() else io.BytesIO(source.read())
+        else:
+            raise TypeError(f"Unsupported source type: {type(source).__name__}")
+
+        if name:
+            ext = os.path.splitext(str(name))[1].lower()
+        else:
+            ext = self._detect_format(stream)
+        return stream, ext
+
+    def _detect_format(self, stream):
+        """Guesses the extension of an unnamed stream from its content."""
+        start = stream.tell()
+        header = stream.read(8)
+        stream.seek(start)
+        if header.startswith(b'%PDF'):
+            return '.pdf'
+        if header.startswith(b'{\\rtf'):
+            return '.rtf'
+        if header.startswith(b'PK'):
+            try:
+                with zipfile.ZipFile(stream) as zf:
+                    names = zf.namelist()
+                    if 'word/document.xml' in names:
+                        return '.docx'
+                    if 'mimetype' in names:
+                        mimetype = zf.read('mimetype').decode('ascii', errors='ignore').strip()
+                        if mimetype == 'application/epub+zip':
+                            return '.epub'
+                        if mimetype == 'application/vnd.oasis.opendocument.text':
+                            return '.odt'
+            finally:
+                stream.seek(start)
+            raise ValueError("Unsupported file format: unrecognized zip container")
+        return '.txt'
+
+    def _read_text(self, source):
+        """Reads a text source (path or binary stream), memory-mapping files and decoding them in chunks."""
+        if _is_path(source):
+            with _mapped_file(source) as view:
+                chunks = (view[i:i + TEXT_CHUNK_SIZE] for i in range(0, len(view), TEXT_CHUNK_SIZE))
+                return self._decode_chunks(chunks, os.path.basename(source))
+        return self._decode_chunks(iter(lambda: source.read(TEXT_CHUNK_SIZE), b''), "stream")
+
+    def _decode_chunks(self, chunks, name):
+        """Decodes byte chunks incrementally with the encoding detected on the first one."""
+        pieces = []
+        decoder = None
+        for chunk in chunks:
+            self.token.checkpoint()
+            if decoder is None:
+                encoding = detect_text_encoding(bytes(chunk[:ENCODING_SAMPLE_SIZE]))
+                if encoding == 'cp1252':
+                    self.log(f"{name} is not valid UTF-8; decoding it as Windows-1252.", "warning")
+                # Invalid bytes after the sample become U+FFFD instead of being dropped silently
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            pieces.append(decoder.decode(chunk))
+        if decoder is not None:
+            pieces.append(decoder.decode(b'', final=True))
+        return ''.join(pieces)
+
+    def extract_text(self, source, name=None):
+        """
+        Extracts text from any supported file format (path, bytes or binary stream).
+        Text extracted from paths is cached per process until the file changes.
+        """
+        file_path, ext = self._resolve_source(source, name)
+        if not _is_path(file_path):
+            return self._extract_text_by_format(file_path, ext)
+        text = _extracted_text_cache.get(file_path)
+        if text is None:
+            text = self._extract_text_by_format(file_path, ext)
+            _extracted_text_cache.put(file_path, text, self._text_cache_chars())
+        return text
+
+    def _text_cache_chars(self):
+        """Returns the extraction cache limit for this engine: a share of its memory budget, if it has one."""
+        if not self.options.memory_budget_mb:
+            return EXTRACTED_TEXT_CACHE_CHARS
+        return int(self.options.memory_budget_mb * 1048576 * EXTRACTED_TEXT_CACHE_BUDGET_SHARE)
+
+    def _extract_text_by_format(self, file_path, ext):
+        """Runs the extractor for ext on a path or seekable stream."""
+        if ext == '.pdf':
+            return self._extract_text_from_pdf(file_path)
+        elif ext == '.txt':
+            return self._extract_text_from_txt(file_path)
+        elif ext == '.md':
+            return self._extract_text_from_md(file_path)
+        elif ext == '.docx':
+            return self._extract_text_from_docx(file_path)
+        elif ext == '.odt':
+            return self._extract_text_from_odt(file_path)
+        elif ext == '.rtf':
+            return self._extract_text_from_rtf(file_path)
+        elif ext == '.epub':
+            return self._extract_text_from_epub(file_path)
+        else:
+            raise ValueError(f"Unsupported file format: {ext}")
+
+    def _source_size(self, source):
+        """Returns the size in bytes of a path or seekable stream source, or 0 if unknown."""
+        if isinstance(source, tuple):
+            source = source[1]
+        try:
+            if _is_path(source):
+                return os.path.getsize(source)
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                return len(source)
+            if hasattr(source, 'seek'):
+                position = source.tell()
+                size = source.seek(0, os.SEEK_END)
+                source.seek(position)
+                return size
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    def process_file(self, source, name=None):
+        """Extracts text from a source and applies timestamp removal and PII scrubbing."""
+        record = {"file": name or self._source_label(source), "stages": {}}
+        size = self._source_size(source)
+        if self.memory and self.memory.near_budget(size):
+            self.log(f"[MEM] '{record['file']}' ({size / 1048576:.1f} MB) may exceed the memory budget "
+                     f"of {self.options.memory_budget_mb} MB.", "warning")
+        with self.telemetry.stage("extract", record) as counters:
+            text = self.extract_text(source, name)
+        counters["bytes"] = size
+        counters["chars"] = len(text)
+        counters["words"] = words = count_words(text)
+        self.token.checkpoint()
+
+        # Apply text processing options. The text stages count the size of the text they process
+        # as bytes (one per character, exact for ASCII), so their MB/s is comparable to extraction
+        if self.options.remove_timestamps:
+            with self.telemetry.stage("timestamps", record) as counters:
+                counters["bytes"] = len(text)
+                text = re.sub(TIMESTAMP_REGEX, '', text)
+            counters["chars"] = len(text)
+            counters["words"] = words
+
+        # Apply PII scrubbing
+        if self.options.remove_pii:
+            with self.telemetry.stage("pii", record) as counters:
+                counters["bytes"] = len(text)
+                text = self.scrub_pii(text)
+            counters["chars"] = len(text)
+            counters["words"] = words
+
+        self.telemetry.add_file(record)
+        return text
+
+    def process_files(self, files):
+        """
+        Processes file paths in order, yielding (file_path, text, error) for each.
+        With options.workers > 1 the files are processed in a process pool,
+        options.worker_chunk_size files per worker task; results still arrive in order.
+        """
+        workers = min(self.options.workers, len(files))
+        if workers <= 1:
+            for file_path in files:
+                self.token.checkpoint()
+                self.log(f"Processing '{os.path.basename(file_path)}'...", "progress")
+                try:
+                    yield file_path, self.process_file(file_path), None
+                except Exception as e:
+                    yield file_path, None, e
+            return
+
+        self.log(f"Processing {len(files)} file(s) with {workers} worker processes...", "progress")
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # Text the parent already extracted (e.g. for the word count) is sent along instead of re-extracted
+            cached_texts = [_extracted_text_cache.get(file_path) for file_path in files]
+            results = executor.map(_process_file_worker, files, itertools.repeat(self.options),
+                                   itertools.repeat(self.passwords), cached_texts,
+                                   chunksize=max(1, self.options.worker_chunk_size))
+            for file_path, (text, record, error) in zip(files, results):
+                # Workers keep running while paused; results are held back here
+                self.token.checkpoint()
+                if record is not None:
+                    self.telemetry.add_file(record)
+                yield file_path, text, error
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def merge_text(self, sources):
+        """Processes each source in order and returns the merged text. Failing sources are logged and skipped."""
+        pieces = []
+        for source in sources:
+            self.token.checkpoint()
+            try:
+                pieces.append(self.process_file(source))
+                pieces.append("\n\n")
+            except Exception as e:
+                self.log(f"  Error processing '{self._source_label(source)}': {e}. Skipping.", "error")
+        return ''.join(pieces)
+
+    def iter_parts(self, sources):
+        """
+        Merges the sources and yields each output part as an in-memory OutputPart
+        as soon as it has been generated. Nothing is written to disk.
+        """
+        merged_text = self.merge_text(sources)
+        if not merged_text.strip():
+            return
+        for number, chunk_text in enumerate(self._iter_chunks(merged_text), 1):
+            self.token.checkpoint()
+            filename = self.get_part_filename(number)
+            record = {"part": number, "file": filename, "stages": {}}
+            word_count = count_words(chunk_text)
+            buffer = self._generate_part(chunk_text, word_count, record)
+            self.telemetry.add_part(record)
+            yield OutputPart(number, filename, buffer.getvalue(), word_count)
+
+    def _source_label(self, source):
+        """Returns a human-readable name for a source, for log messages."""
+        if isinstance(source, tuple):
+            return str(source[0])
+        if _is_path(source):
+            return os.path.basename(os.fspath(source))
+        return getattr(source, 'name', None) or f"<{type(source).__name__}>"
+
+    def _extract_text_from_txt(self, file_path):
+        """Extracts text from TXT file."""
+        return self._read_text(file_path)
+
+    def _extract_text_from_md(self, file_path):
+        """Extracts text from Markdown file."""
+        return self._read_text(file_path)
+
+    def _extract_text_from_docx(self, file_path):
+        """Extracts text from DOCX file."""
+        try:
+            return '\n'.join(self._iter_docx_lines(file_path))
+        except MergeCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error reading DOCX file: {e}")
+
+    def _iter_docx_lines(self, file_path):
+        """
+        Streams word/document.xml out of the DOCX zip with iterparse and yields one
+        line per body paragraph and one tab-separated line per table row.
+        Parsed elements are cleared as they are consumed, so memory stays bounded.
+        """
+        paragraph_tag = DOCX_NS + 'p'
+        text_tag = DOCX_NS + 't'
+        cell_tag = DOCX_NS + 'tc'
+        row_tag = DOCX_NS + 'tr'
+        body_tag = DOCX_NS + 'body'
+        breaks = {DOCX_NS + 'tab': '\t', DOCX_NS + 'br': '\n', DOCX_NS + 'cr': '\n'}
+
+        with zipfile.ZipFile(file_path) as zf, zf.open('word/document.xml') as xml_stream:
+            body = None
+            runs = []  # text runs of each open paragraph (stack, for text boxes)
+            cells = []  # paragraphs of each open table cell (stack, for nested tables)
+            rows = []  # cells of each open table row (stack)
+            for event, elem in ElementTree.iterparse(xml_stream, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == paragraph_tag:
+                        runs.append([])
+                    elif tag == cell_tag:
+                        cells.append([])
+                    elif tag == row_tag:
+                        rows.append([])
+                    elif tag == body_tag:
+                        body = elem
+                    continue
+
+                if tag == text_tag:
+                    if runs:
+                        runs[-1].append(elem.text or '')
+                elif tag in breaks:
+                    if runs:
+                        runs[-1].append(breaks[tag])
+                elif tag == paragraph_tag:
+                    self.token.checkpoint()
+                    line = ''.join(runs.pop())
+                    if cells:
+                        cells[-1].append(line)
+                    else:
+                        yield line
+                elif tag == cell_tag:
+                    paragraphs = cells.pop()
+                    rows[-1].append(' '.join(p for p in paragraphs if p))
+                elif tag == row_tag:
+                    line = '\t'.join(rows.pop())
+                    if cells:
+                        cells[-1].append(line)
+                    else:
+                        yield line
+
+                # Drop finished top-level blocks so the tree doesn't grow with the document
+                if body is not None and not cells and not runs and tag in (paragraph_tag, DOCX_NS + 'tbl'):
+                    body.clear()
+
+    def _extract_text_from_odt(self, file_path):
+        """Extracts text from ODT file."""
+        try:
+            return '\n'.join(self._iter_odt_lines(file_path))
+        except MergeCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error reading ODT file: {e}")
+
+    def _iter_odt_lines(self, file_path):
+        """
+        Streams content.xml out of the ODT zip with iterparse and yields one line per
+        paragraph, heading and list item paragraph, and one tab-separated line per table row.
+        Finished top-level blocks are cleared as they are consumed, so memory stays bounded.
+        """
+        paragraph_tags = (ODT_TEXT_NS + 'p', ODT_TEXT_NS + 'h')
+        cell_tag = ODT_TABLE_NS + 'table-cell'
+        row_tag = ODT_TABLE_NS + 'table-row'
+        body_tag = ODT_OFFICE_NS + 'text'
+
+        with zipfile.ZipFile(file_path) as zf, zf.open('content.xml') as xml_stream:
+            body = None
+            body_depth = depth = 0
+            cells = []  # paragraphs of each open table cell (stack, for nested tables)
+            rows = []  # cells of each open table row (stack)
+            for event, elem in ElementTree.iterparse(xml_stream, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    depth += 1
+                    if tag == cell_tag:
+                        cells.append([])
+                    elif tag == row_tag:
+                        rows.append([])
+                    elif tag == body_tag:
+                        body, body_depth = elem, depth
+                    continue
+
+                depth -= 1
+                if tag in paragraph_tags:
+                    self.token.checkpoint()
+                    line = self._odt_paragraph_text(elem, paragraph_tags)
+                    if cells:
+                        cells[-1].append(line)
+                    else:
+                        yield line
+                elif tag == cell_tag:
+                    paragraphs = cells.pop()
+                    rows[-1].append(' '.join(p for p in paragraphs if p))
+                elif tag == row_tag:
+                    line = '\t'.join(rows.pop())
+                    if cells:
+                        cells[-1].append(line)
+                    else:
+                        yield line
+
+                # Drop finished top-level blocks so the tree doesn't grow with the document
+                if body is not None and depth == body_depth:
+                    body.clear()
+
+    def _odt_paragraph_text(self, paragraph, paragraph_tags):
+        """Returns the text of an ODT paragraph element, expanding spaces, tabs and line breaks."""
+        space_tag = ODT_TEXT_NS + 's'
+        special = {ODT_TEXT_NS + 'tab': '\t', ODT_TEXT_NS + 'line-break': '\n'}
+        parts = []
+
+        def walk(node):
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                tag = child.tag
+                if tag == space_tag:
+                    parts.append(' ' * int(child.get(ODT_TEXT_NS + 'c', 1)))
+                elif tag in special:
+                    parts.append(special[tag])
+                elif tag not in paragraph_tags:
+                    walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+
+        walk(paragraph)
+        return ''.join(parts)
+
+    def _extract_text_from_rtf(self, file_path):
+        """Extracts text from RTF file with the streaming RtfTextReader."""
+        try:
+            reader = RtfTextReader(checkpoint=self.token.checkpoint)
+            if _is_path(file_path):
+                with open(file_path, 'rb') as f:
+                    return ''.join(reader.iter_text(f))
+            return ''.join(reader.iter_text(file_path))
+        except MergeCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error reading RTF file: {e}")
+
+    def _extract_text_from_epub(self, file_path):
+        """Extracts text from EPUB file, reading the spine documents straight from the zip."""
+        try:
+            with zipfile.ZipFile(file_path) as zf:
+                spine = self._epub_spine(zf)
+                if not spine:
+                    raise ValueError("no readable documents in the spine")
+                total_size = sum(zf.getinfo(name).file_size for name in spine)
+
+                if self.options.workers > 1 and total_size >= EPUB_PARALLEL_MIN_BYTES:
+                    # Big books: strip the chapters in worker processes, results in spine order
+                    chapters = []
+                    for name in spine:
+                        self.token.checkpoint()
+                        chapters.append(zf.read(name))
+                    executor = ProcessPoolExecutor(max_workers=min(self.options.workers, len(chapters)))
+                    try:
+                        text_content = []
+                        for text in executor.map(_markup_to_text, chapters):
+                            self.token.checkpoint()
+                            text_content.append(text)
+                    finally:
+                        # On cancellation the chapters still queued are dropped instead of waited for
+                        executor.shutdown(wait=False, cancel_futures=True)
+                    return '\n'.join(text_content)
+
+                text_content = []
+                for name in spine:
+                    self.token.checkpoint()
+                    text_content.append(_markup_to_text(zf.read(name)))
+                return '\n'.join(text_content)
+        except EPUB_PARSE_ERRORS as e:
+            self.log(f"  Fast EPUB reader failed ({e}); falling back to ebooklib.", "debug")
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
+            return self._extract_text_from_epub_ebooklib(file_path)
+
+    def _epub_spine(self, zf):
+        """Returns the zip member names of the EPUB's (X)HTML spine documents, in reading order."""
+        container = ElementTree.fromstring(zf.read('META-INF/container.xml'))
+        rootfile = container.find(f'.//{EPUB_CONTAINER_NS}rootfile')
+        if rootfile is None or not rootfile.get('full-path'):
+            raise ValueError("container.xml has no rootfile")
+        opf_path = rootfile.get('full-path')
+        opf = ElementTree.fromstring(zf.read(opf_path))
+        opf_dir = posixpath.dirname(opf_path)
+
+        manifest = {}
+        for item in opf.iter(EPUB_OPF_NS + 'item'):
+            if item.get('media-type') in ('application/xhtml+xml', 'text/html'):
+                href = urllib.parse.unquote(item.get('href', '').split('#')[0])
+                manifest[item.get('id')] = posixpath.normpath(posixpath.join(opf_dir, href))
+
+        members = set(zf.namelist())
+        spine = []
+        for itemref in opf.iter(EPUB_OPF_NS + 'itemref'):
+            name = manifest.get(itemref.get('idref'))
+            if name in members and name not in spine:
+                spine.append(name)
+        return spine
+
+    def _extract_text_from_epub_ebooklib(self, file_path):
+        """Extracts text from EPUB file with ebooklib (fallback for books the fast reader can't parse)."""
+        try:
+            import ebooklib
+            from ebooklib import epub
+            from bs4 import BeautifulSoup
+
+            book = epub.read_epub(file_path)
+            text_content = []
+
+            for item in book.get_items():
+                self.token.checkpoint()
+                if item.get_type() == ebooklib.ITEM_DOCUMENT:
+                    soup = BeautifulSoup(item.get_content(), 'html.parser')
+                    text_content.append(soup.get_text())
+
+            return '\n'.join(text_content)
+        except Exception as e:
+            raise Exception(f"Error reading EPUB file: {e}")
+
+    @contextlib.contextmanager
+    def _open_pdf(self, source):
+        """
+        Opens a PDF path (memory-mapped), binary stream or open document; closes what it opened.
+        Encrypted documents are unlocked in memory with the engine's passwords.
+        """
+        if _is_path(source):
+            with _mapped_file(source) as view:
+                doc = fitz.open(stream=view, filetype="pdf")
+                try:
+                    self._unlock_pdf(doc, source)
+                    yield doc
+                finally:
+                    # The document must be closed before the mapping is released
+                    doc.close()
+        elif hasattr(source, 'read'):
+            with fitz.open(stream=source.read(), filetype="pdf") as doc:
+                self._unlock_pdf(doc)
+                yield doc
+        else:
+            self._unlock_pdf(source)
+            yield source
+
+    def _unlock_pdf(self, doc, path=None):
+        """Authenticates a password-protected document, or raises if no known password opens it."""
+        if doc.needs_pass and not self.passwords.authenticate(doc, path):
+            raise PdfPasswordRequired("the PDF is password protected and no known password opens it")
+
+    def _extract_text_from_pdf(self, pdf_path):
+        """Extracts text from a PDF for word counting."""
+        pieces = []
+        try:
+            # Accepts a path, a binary stream or an open document object
+            with self._open_pdf(pdf_path) as doc:
+                for page in doc:
+                    self.token.checkpoint()
+                    # Timestamps are removed by process_file, so the extracted text is the same for every option set
+                    pieces.append(page.get_text("text"))
+                    pieces.append(" ")
+        except (MergeCancelled, PdfPasswordRequired):
+            raise
+        except Exception as e:
+            self.log(f"Error extracting text from PDF: {e}", "error")
+            raise
+        return ''.join(pieces)
+
+    def _sanitize_text_for_xml(self, text):
+        """Remove control characters and NULL bytes that aren't valid in XML."""
+        import unicodedata
+        # Remove NULL bytes
+        text = text.replace('\x00', '')
+        # Remove other control characters except tab, newline, and carriage return
+        clean_text = []
+        for char in text:
+            # Allow tab (0x09), newline (0x0A), carriage return (0x0D)
+            if char in ('\t', '\n', '\r'):
+                clean_text.append(char)
+            # Remove other control characters (0x00-0x1F except the allowed ones above)
+            elif ord(char) < 0x20:
+                continue
+            # Remove control characters in the range 0x7F-0x9F
+            elif 0x7F <= ord(char) <= 0x9F:
+                continue
+            else:
+                clean_text.append(char)
+        return ''.join(clean_text)
+
+    def generate_output_file(self, text, output_filepath, sections=None):
+        """
+        Generate output in the selected format, to a file path or a writable binary stream.
+        sections, as returned by join_texts, marks the source files (EPUB starts a chapter at each).
+        """
+        output_type = self.options.output_file_type.lower()
+
+        # Sanitize text for XML-based formats (DOCX, ODT, EPUB)
+        if output_type == 'epub' and sections:
+            text, sections = self._sanitize_sections(text, sections)
+        elif output_type in ['docx', 'odt', 'epub']:
+            text = self._sanitize_text_for_xml(text)
+
+        if output_type == 'pdf':
+            self._generate_pdf(text, output_filepath)
+        elif output_type == 'txt':
+            self._generate_txt(text, output_filepath)
+        elif output_type == 'md':
+            self._generate_md(text, output_filepath)
+        elif output_type == 'docx':
+            self._generate_docx(text, output_filepath)
+        elif output_type == 'odt':
+            self._generate_odt(text, output_filepath)
+        elif output_type == 'rtf':
+            self._generate_rtf(text, output_filepath)
+        elif output_type == 'epub':
+            self._generate_epub(text, output_filepath, sections)
+        else:
+            raise ValueError(f"Unsupported output format: {output_type}")
+
+    def _sanitize_sections(self, text, sections):
+        """Sanitizes text for XML one section at a time. Returns the text and the shifted sections."""
+        starts = [0] + [start for _, start in sections[1:]]
+        ends = starts[1:] + [len(text)]
+        pieces = []
+        shifted = []
+        offset = 0
+        for (name, _), start, end in zip(sections, starts, ends):
+            piece = self._sanitize_text_for_xml(text[start:end])
+            shifted.append((name, offset))
+            pieces.append(piece)
+            offset += len(piece)
+        return ''.join(pieces), shifted
+
+    def _generate_part(self, text, word_count, record, sections=None):
+        """Generates an output part into memory as a timed stage. Returns the BytesIO buffer."""
+        with self.telemetry.stage("generate", record) as counters:
+            buffer = io.BytesIO()
+            self.generate_output_file(text, buffer, sections)
+        counters["bytes"] = buffer.tell()
+        counters["chars"] = len(text)
+        counters["words"] = word_count
+        return buffer
+
+    def write_part(self, text, output_filepath, number=1, sections=None):
+        """Generates an output part straight into output_filepath as a timed stage."""
+        record = {"part": number, "file": os.path.basename(output_filepath), "stages": {}}
+        word_count = count_words(text)
+        # Streamed into a uniquely named temp file and renamed when complete: the part is never held
+        # in memory, a crash never leaves a truncated part and concurrent writers never share a temp file
+        temp_path = _create_temp_file(output_filepath)
+        try:
+            with self.telemetry.stage("generate", record) as counters:
+                self.generate_output_file(text, temp_path, sections)
+            counters["bytes"] = os.path.getsize(temp_path)
+            counters["chars"] = len(text)
+            counters["words"] = word_count
+            os.replace(temp_path, output_filepath)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self.telemetry.add_part(record)
+
+    def _generate_pdf(self, text, output_filepath):
+        """Generate PDF output from text."""
+        doc = fitz.open()
+
+        # Page dimensions and margins
+        page_width = 595  # A4 width in points
+        page_height = 842  # A4 height in points
+        margin = 50
+        text_rect = fitz.Rect(margin, margin, page_width - margin, page_height - margin)
+
+        # Split text into paragraphs
+        paragraphs = text.split('\n')
+
+        page = doc.new_page(width=page_width, height=page_height)
+        current_text = []
+
+        for para in paragraphs:
+            self.token.checkpoint()
+            # Try adding this paragraph
+            test_text = '\n'.join(current_text + [para])
+            result = page.insert_textbox(
+                text_rect,
+                test_text,
+                fontsize=11,
+                fontname="helv",
+                align=0
+            )
+
+            # If result < 0, text doesn't fit - start a new page
+            if result < 0 and current_text:
+                # Save current page content
+                page.insert_textbox(
+                    text_rect,
+                    '\n'.join(current_text),
+                    fontsize=11,
+                    fontname="helv",
+                    align=0
+                )
+                # Create new page and start with current paragraph
+                page = doc.new_page(width=page_width, height=page_height)
+                current_text = [para]
+            else:
+                current_text.append(para)
+
+        # Add remaining text to last page
+        if current_text:
+            page.insert_textbox(
+                text_rect,
+                '\n'.join(current_text),
+                fontsize=11,
+                fontname="helv",
+                align=0
+            )
+
+        if _is_path(output_filepath):
+            doc.save(output_filepath)
+        else:
+            output_filepath.write(doc.tobytes())
+        doc.close()
+
+    def _write_text_output(self, text, output_filepath):
+        """Writes UTF-8 text to a file path or a binary stream."""
+        if _is_path(output_filepath):
+            with open(output_filepath, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            output_filepath.write(text.encode('utf-8'))
+
+    def _generate_txt(self, text, output_filepath):
+        """Generate TXT output from text."""
+        self._write_text_output(text, output_filepath)
+
+    def _generate_md(self, text, output_filepath):
+        """Generate MD (Markdown) output from text."""
+        self._write_text_output(text, output_filepath)
+
+    def _generate_docx(self, text, output_filepath):
+        """Generate DOCX output from text, streaming paragraphs into the package."""
+        with DocxWriter(output_filepath) as writer:
+            for para in _iter_lines(text):
+                self.token.checkpoint()
+                if para.strip():
+                    writer.add_paragraph(para)
+
+    def _generate_odt(self, text, output_filepath):
+        """Generate ODT output from text, streaming paragraphs into content.xml."""
+        with OdtWriter(output_filepath) as writer:
+            for para in _iter_lines(text):
+                self.token.checkpoint()
+                if para.strip():
+                    writer.add_paragraph(para)
+
+    def _generate_rtf(self, text, output_filepath):
+        """Generate RTF output from text, streaming one paragraph per line."""
+        with RtfWriter(output_filepath) as writer:
+            for para in _iter_lines(text):
+                self.token.checkpoint()
+                if para.strip():
+                    writer.add_paragraph(para)
+
+    def _generate_epub(self, text, output_filepath, sections=None):
+        """
+        Generate EPUB output from text, streaming it into chapters of about
+        options.epub_chapter_chars characters. With sections, each source file starts a chapter.
+        """
+        with EpubWriter(output_filepath, chapter_chars=self.options.epub_chapter_chars) as writer:
+            if sections:
+                starts = [0] + [start for _, start in sections[1:]]
+                ends = starts[1:] + [len(text)]
+                chapters = ((os.path.basename(name), text[start:end])
+                            for (name, _), start, end in zip(sections, starts, ends))
+            else:
+                chapters = [(writer.title, text)]
+            for title, chapter_text in chapters:
+                writer.start_chapter(title)
+                for para in _iter_lines(chapter_text):
+                    self.token.checkpoint()
+                    if para.strip():
+                        writer.add_paragraph(para)
+
+    def scrub_pii(self, text):
+        """Scrubs PII from text content using regex patterns."""
+        try:
+            # Apply custom string removal
+            custom_strings_raw = self.options.custom_pii_strings
+            if custom_strings_raw:
+                custom_strings = [s.strip() for s in custom_strings_raw.split(',') if s.strip()]
+                for custom_string in custom_strings:
+                    text = text.replace(custom_string, "[REDACTED]")
+
+            # Apply PII pattern removal
+            for pii_type, pattern in PII_PATTERNS.items():
+                self.token.checkpoint()
+                text = re.sub(pattern, "[REDACTED]", text, flags=re.IGNORECASE)
+
+            return text
+
+        except Exception as e:
+            self.log(f"    - Error scrubbing PII from text: {e}", "error")
+            return text
+
+    def _output_base_and_extension(self, extension=None):
+        """Returns the output base name and extension for the configured filename and type."""
+        return _output_base_and_extension(self.options, extension)
+
+    def get_part_filename(self, counter=None, extension=None):
+        """Returns the file name of an output part without checking the output folder."""
+        base, extension = self._output_base_and_extension(extension)
+        if counter is not None and counter > 1:
+            base = f"{base}{counter}"
+        return f"{base}{extension}"
+
+    def reserve_output_names(self, extension=None, offset=None):
+        """
+        Reserves this engine's output names with a single scan of the output folder.
+        Outputs are numbered Name, Name2, Name3, ...; part n gets the n-th number after
+        the run of consecutive outputs already in the folder or reserved by another
+        engine in this process, so earlier and concurrent outputs are never overwritten.
+        Returns the offset; passing a previously returned offset pins it without scanning.
+        """
+        base, extension = self._output_base_and_extension(extension)
+        with _output_names_lock:
+            if offset is None:
+                offset = self._scan_output_offset(base, extension)
+            self._name_offsets[extension] = offset
+        return offset
+
+    def _scan_output_offset(self, base, extension):
+        """
+        Returns the last number of the consecutive run Name, Name2, Name3, ... in the output folder
+        and among reserved paths. Hold _output_names_lock. Outliers such as "Name2024.pdf" don't
+        move the offset; get_output_filepath skips any name that is taken.
+        """
+        pattern = _output_name_pattern(base, extension)
+        folder = _path_key(self.options.output_folder)
+        names = [os.path.basename(path) for path in _reserved_output_paths if os.path.dirname(path) == folder]
+        try:
+            with os.scandir(self.options.output_folder) as entries:
+                names.extend(entry.name for entry in entries)
+        except OSError:
+            pass
+        numbers = set()
+        for name in names:
+            match = pattern.fullmatch(name)
+            if match:
+                numbers.add(int(match.group(1) or 1))
+        offset = 0
+        while offset + 1 in numbers:
+            offset += 1
+        return offset
+
+    def get_output_filepath(self, counter=None, extension=None):
+        """
+        Returns the reserved output path of a part (counter), scanning the output folder on first use.
+        A name that another engine reserved or wrote in the meantime is skipped for the next free number.
+        """
+        base, extension = self._output_base_and_extension(extension)
+        counter = counter or 1
+        with _output_names_lock:
+            path = self._part_paths.get((extension, counter))
+            if path is not None:
+                return path
+            offset = self._name_offsets.get(extension)
+            if offset is None:
+                offset = self._name_offsets[extension] = self._scan_output_offset(base, extension)
+            number = offset + counter
+            while True:
+                path = os.path.join(self.options.output_folder, self.get_part_filename(number, extension))
+                key = _path_key(path)
+                if key not in _reserved_output_paths and not os.path.exists(path):
+                    break
+                number += 1
+            _reserved_output_paths.add(key)
+            self._reserved_paths.add(key)
+            self._part_paths[(extension, counter)] = path
+        return path
+
+    def split_text(self, text):
+        """Yields chunks of at most split_word_count words from the merged text."""
+        words_per_file = self.options.split_word_count
+        words = text.split()
+        for start in range(0, len(words), words_per_file):
+            yield ' '.join(words[start:start + words_per_file])
+
+    def _iter_chunks(self, merged_text):
+        """Yields the text of each output part: split chunks, or the whole text."""
+        if self.options.split_by_words:
+            yield from self.split_text(merged_text)
+        else:
+            yield merged_text
+
+    def write_outputs(self, merged_text, journal=None, sections=None):
+        """
+        Generates the output file(s) for the merged text. Returns the list of saved paths.
+        With a journal, parts written by an earlier run of the same job are kept and skipped.
+        sections (from join_texts) marks the source files in an unsplit output.
+        """
+        saved_files = []
+        # Reserve the output names up front; the journal keeps the reservation for resumed runs
+        offset = self.reserve_output_names(offset=journal.name_offset if journal else None)
+        if journal:
+            journal.record_name_offset(offset)
+
+        if self.options.split_by_words:
+            # Split by words
+            for file_counter, chunk_text in enumerate(self.split_text(merged_text), 1):
+                self.token.checkpoint()
+
+                existing_part = journal.get_part(file_counter) if journal else None
+                if existing_part:
+                    saved_files.append(existing_part)
+                    self.log(f"Kept part {file_counter} from checkpoint: {os.path.basename(existing_part)}", "info")
+                    continue
+
+                output_filepath = self.get_output_filepath(counter=file_counter)
+                self.write_part(chunk_text, output_filepath, file_counter)
+                saved_files.append(output_filepath)
+                if journal:
+                    journal.record_part(file_counter, output_filepath)
+                self.log(f"Saved part {file_counter}: {os.path.basename(output_filepath)}", "success")
+        else:
+            # Standard merging (single file)
+            output_filepath = self.get_output_filepath()
+            self.write_part(merged_text, output_filepath, sections=sections)
+            saved_files.append(output_filepath)
+            if journal:
+                journal.record_part(1, output_filepath)
+            self.log(f"Merge completed successfully: {os.path.basename(output_filepath)}", "success")
+
+        return saved_files
+
+
+class MergeJournal:
+    """
+    Checkpoint journal for a merge job, kept in the output folder.
+
+    Records the job's file list and options, the processed text of every
+    completed file (in a sidecar checkpoint folder) and the output parts
+    already written. A stopped or crashed job can then be resumed from its
+    first unfinished file. The journal is removed when the job completes.
+
+    The .json header is written once. Completed files, parts and the output
+    name reservation are appended to a .jsonl event log, so checkpointing a
+    file costs O(1) I/O however large the job is. Sensitive options (custom
+    PII strings) are masked in the header and kept in a private file in the
+    checkpoint folder, so a resumed job scrubs exactly like the first run.
+    """
+
+    PREFIX = ".pdf_merger_job_"
+    PRIVATE_OPTIONS = "options.private.json"
+
+    def __init__(self, path, data):
+        self.path = path
+        self.checkpoint_dir = os.path.splitext(path)[0]
+        self.events_path = self.checkpoint_dir + ".jsonl"
+        self.data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, files, options):
+        """Creates a new journal for a job in the job's output folder."""
+        os.makedirs(options.output_folder, exist_ok=True)
+        job_key = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident() % 100000}"
+        path = os.path.join(options.output_folder, f"{cls.PREFIX}{job_key}.json")
+        journal = cls(path, {
+            "created": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "files": list(files),
+            "options": persistable_options(options),
+            "completed": {},  # file index -> {"file", "checkpoint" or "error"}
+            "parts": {},  # part number -> output path
+            "name_offset": None,  # output name reservation, see MergeEngine.reserve_output_names
+        })
+        journal._save_private_options(options)
+        journal.save()
+        return journal
+
+    @classmethod
+    def load(cls, path):
+        """Loads a journal from disk and replays its event log."""
+        with open(path, "r") as f:
+            journal = cls(path, json.load(f))
+        journal._replay_events()
+        return journal
+
+    def _save_private_options(self, options):
+        """Writes the sensitive option values to a file only the current user can read."""
+        private = {name: getattr(options, name) for name in SENSITIVE_OPTION_FIELDS if getattr(options, name)}
+        if not private:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        private_path = os.path.join(self.checkpoint_dir, self.PRIVATE_OPTIONS)
+        with open(os.open(private_path, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600), "w") as f:
+            json.dump(private, f)
+
+    def _load_private_options(self):
+        try:
+            with open(os.path.join(self.checkpoint_dir, self.PRIVATE_OPTIONS), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _replay_events(self):
+        """Applies the appended events to self.data. A line cut off by a crash is ignored."""
+        try:
+            with open(self.events_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if "completed" in event:
+                self.data["completed"][str(event.pop("completed"))] = event
+            elif "part" in event:
+                self.data["parts"][str(event["part"])] = event["path"]
+            elif "name_offset" in event:
+                self.data["name_offset"] = event["name_offset"]
+
+    def _append_event(self, event):
+        """Appends one event to the log."""
+        with self._lock:
+            with open(self.events_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")
+
+    @classmethod
+    def find_unfinished(cls, output_folder):
+        """Returns the journals of unfinished jobs in an output folder, oldest first."""
+        journals = []
+        try:
+            names = os.listdir(output_folder)
+        except OSError:
+            return journals
+        for name in names:
+            if name.startswith(cls.PREFIX) and name.endswith(".json"):
+                try:
+                    journals.append(cls.load(os.path.join(output_folder, name)))
+                except (OSError, ValueError):
+                    continue
+        journals.sort(key=lambda journal: journal.data.get("created", ""))
+        return journals
+
+    @property
+    def files(self):
+        return self.data["files"]
+
+    @property
+    def options(self):
+        """
+        Rebuilds the job's MergeOptions, ignoring fields unknown to this version.
+        Sensitive fields come from the private options file.
+        """
+        known = {field.name for field in fields(MergeOptions)} - set(SENSITIVE_OPTION_FIELDS)
+        values = {key: value for key, value in self.data["options"].items() if key in known}
+        values.update(self._load_private_options())
+        return MergeOptions(**values)
+
+    def save(self):
+        """Writes the journal header atomically, so a crash never leaves it half written."""
+        with self._lock:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.data, f, indent=4)
+            os.replace(temp_path, self.path)
+
+    def is_completed(self, index):
+        return str(index) in self.data["completed"]
+
+    def load_text(self, index):
+        """Returns the checkpointed text of a completed file, or None if it failed or is missing."""
+        entry = self.data["completed"].get(str(index), {})
+        checkpoint = entry.get("checkpoint")
+        if not checkpoint:
+            return None
+        try:
+            with open(os.path.join(self.checkpoint_dir, checkpoint), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def record_file(self, index, file_path, text):
+        """Checkpoints the processed text of a file."""
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        checkpoint = f"{index:06d}.txt"
+        with open(os.path.join(self.checkpoint_dir, checkpoint), "w", encoding="utf-8") as f:
+            f.write(text)
+        self.data["completed"][str(index)] = {"file": file_path, "checkpoint": checkpoint}
+        self._append_event({"completed": index, "file": file_path, "checkpoint": checkpoint})
+
+    def record_failed(self, index, file_path, error):
+        """Records a file that failed, so a resumed job does not retry it."""
+        self.data["completed"][str(index)] = {"file": file_path, "error": str(error)}
+        self._append_event({"completed": index, "file": file_path, "error": str(error)})
+
+    def get_part(self, number):
+        """Returns the path of an already written output part, if it still exists."""
+        path = self.data["parts"].get(str(number))
+        return path if path and os.path.exists(path) else None
+
+    def record_part(self, number, path):
+        self.data["parts"][str(number)] = path
+        self._append_event({"part": number, "path": path})
+
+    @property
+    def name_offset(self):
+        return self.data.get("name_offset")
+
+    def record_name_offset(self, offset):
+        if self.data.get("name_offset") != offset:
+            self.data["name_offset"] = offset
+            self._append_event({"name_offset": offset})
+
+    def finish(self):
+        """Removes the journal, its event log and its checkpoints after the job completes."""
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+        for path in (self.events_path, self.path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class ConsoleHistory:
+    """
+    Bounded ring buffer of console messages with a per-level index.
+
+    Entries are (sequence, message, tag, level) tuples. Each level keeps its
+    own deque of the same entries, so a filtered view only walks the levels
+    it shows. When the ring is full the oldest entry is evicted from both
+    the ring and its level deque in O(1).
+    """
+
+    def __init__(self, capacity=DEFAULT_CONSOLE_HISTORY_SIZE):
+        self.capacity = max(1, int(capacity))
+        self._entries = collections.deque()
+        self._by_level = {level: collections.deque() for level in CONSOLE_LEVELS}
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, message, tag, level):
+        if len(self._entries) >= self.capacity:
+            oldest = self._entries.popleft()
+            # The oldest entry overall is also the oldest of its level
+            self._by_level[oldest[3]].popleft()
+        entry = (next(self._sequence), message, tag, level)
+        self._entries.append(entry)
+        self._by_level[level].append(entry)
+
+    def resize(self, capacity):
+        """Changes the capacity, evicting the oldest entries if needed."""
+        self.capacity = max(1, int(capacity))
+        while len(self._entries) > self.capacity:
+            oldest = self._entries.popleft()
+            self._by_level[oldest[3]].popleft()
+
+    def tail(self, levels=None, limit=None):
+        """Returns the newest entries (oldest first) for the given levels, or all levels if None."""
+        if levels is None:
+            sources = [self._entries]
+        else:
+            sources = [self._by_level[level] for level in levels if level in self._by_level]
+        # Merge newest-first so only the visible tail is touched
+        newest_first = heapq.merge(*(reversed(entries) for entries in sources), key=lambda entry: -entry[0])
+        entries = list(itertools.islice(newest_first, limit))
+        entries.reverse()
+        return entries
+
+
+class MergeJob:
+    """
+    A single merge run. Snapshots its own file list and options when created,
+    and has its own stop/pause controls and progress, so jobs don't interfere.
+    Status and progress are written from the job thread and read from the GUI
+    thread, so they are guarded by the job's lock.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, files, options, journal=None):
+        self.job_id = next(MergeJob._ids)
+        self.files = list(files)
+        self.options = options
+        self.journal = journal  # MergeJournal; created when the job starts unless resuming
+        self.token = CancellationToken()
+        self._lock = threading.Lock()
+        self._status = "queued"  # queued, running, paused, stopped, done, failed
+        self._progress = 0
+        self.saved_files = []
+        self.error = None
+        self.thread = None
+        self.profile = False  # Run under the profiler and save the profile to the output folder
+        self.passwords = None  # PasswordStore for encrypted inputs (memory only)
+
+    @property
+    def status(self):
+        with self._lock:
+            return self._status
+
+    @status.setter
+    def status(self, status):
+        with self._lock:
+            self._status = status
+
+    @property
+    def progress(self):
+        with self._lock:
+            return self._progress
+
+    @progress.setter
+    def progress(self, progress):
+        with self._lock:
+            self._progress = progress
+
+    def transition(self, from_statuses, status):
+        """Sets the status only if it is currently one of from_statuses. Returns True if it changed."""
+        with self._lock:
+            if self._status not in from_statuses:
+                return False
+            self._status = status
+            return True
+
+    @property
+    def is_active(self):
+        """True while the job is queued, running or paused."""
+        return self.status in ("queued", "running", "paused")
+
+    def pause(self):
+        """Pauses the job at the next checkpoint."""
+        if self.transition(("running",), "paused"):
+            self.token.pause()
+
+    def resume(self):
+        """Resumes a paused job."""
+        if self.transition(("paused",), "running"):
+            self.token.resume()
+
+    def stop(self):
+        """Requests the job to stop. Queued jobs are cancelled before they start."""
+        self.token.stop()
+        self.transition(("queued",), "stopped")
+
+    def describe(self):
+        """Returns a one-line summary for display in the jobs list."""
+        with self._lock:
+            status, progress = self._status, self._progress
+        text = f"#{self.job_id} [{status}] {progress}% - {len(self.files)} file(s) -> {self.options.output_file_type}"
+        if self.journal is not None and status == "queued":
+            text += " (resume)"
+        if status == "done" and self.saved_files:
+            text += f" ({len(self.saved_files)} saved)"
+        elif self.error:
+            text += f" ({self.error})"
+        return text
+
+
+class MergeJobQueue:
+    """
+    Runs merge jobs in background threads, at most max_concurrent at a time.
+    Jobs beyond the limit wait in submission order.
+    """
+
+    def __init__(self, runner, max_concurrent=DEFAULT_MAX_CONCURRENT_JOBS, on_change=None):
+        self.runner = runner  # Callable(job) -> list of saved files
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.on_change = on_change or (lambda job: None)
+        self.jobs = []
+        self._lock = threading.Lock()
+
+    def submit(self, job):
+        """Adds a job to the queue and starts it if a slot is free."""
+        with self._lock:
+            self.jobs.append(job)
+            self._start_pending()
+        self.on_change(job)
+        return job
+
+    def set_max_concurrent(self, max_concurrent):
+        """Changes the concurrency limit. Raising it starts waiting jobs immediately."""
+        with self._lock:
+            self.max_concurrent = max(1, int(max_concurrent))
+            self._start_pending()
+
+    def _start_pending(self):
+        """Starts queued jobs while there are free slots. Must be called with the lock held."""
+        running = sum(1 for job in self.jobs if job.thread is not None and job.is_active)
+        for job in self.jobs:
+            if running >= self.max_concurrent:
+                break
+            # A job stopped from the GUI thread in the meantime is not started
+            if job.thread is not None or not job.transition(("queued",), "running"):
+                continue
+            job.thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+            job.thread.start()
+            running += 1
+
+    def _run(self, job):
+        """Thread body: runs a job and then frees its slot for the next one."""
+        try:
+            job.saved_files = self.runner(job) or []
+            job.status = "stopped" if job.token.is_stopped else "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            with self._lock:
+                self._start_pending()
+            self.on_change(job)
+
+    def active_jobs(self):
+        """Returns the jobs that are queued, running or paused."""
+        with self._lock:
+            return [job for job in self.jobs if job.is_active]
+
+    def clear_finished(self):
+        """Removes finished jobs from the queue."""
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.is_active]
+
+    def stop_all(self, timeout=None):
+        """Stops all jobs and optionally waits up to timeout seconds for running ones."""
+        for job in self.active_jobs():
+            job.stop()
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            for job in list(self.jobs):
+                if job.thread is not None:
+                    job.thread.join(max(0, deadline - time.monotonic()))
+
+
+class FolderWatcher:
+    """
+    Watches an input folder and merges new or changed files into the output as
+    they arrive. The folder is polled with cheap stat calls, and a file is only
+    processed once its size and modification time have been stable for
+    settle_seconds, so scans that are still being written are skipped.
+
+    Processed files are recorded in a state file in the output folder, so a
+    restarted watcher only picks up the deltas. Text is appended to the current
+    output part, which rolls over to a new part when split by words is enabled
+    and the word limit is reached. Without splitting, TXT and MD parts are
+    appended to in place, and other formats roll over at WATCH_PART_MAX_WORDS
+    so each rewrite of the current part stays bounded.
+
+    The text of each merged file is spooled to a temp folder for the session.
+    When a file merged in this session changes, its text is replaced in place
+    and the parts from the one it started in onwards are rebuilt.
+    """
+
+    STATE_FILENAME = ".pdf_merger_watch.json"
+
+    def __init__(self, engine, input_folder, poll_interval=2.0, settle_seconds=5.0):
+        self.engine = engine
+        self.input_folder = input_folder
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.token = engine.token  # Stopping the token also interrupts the file being processed
+        self.log = engine.log
+        self.state_path = os.path.join(engine.options.output_folder, self.STATE_FILENAME)
+        self.processed = self._load_state()  # path -> [size, mtime_ns] of the last processed version
+        self.pending = {}  # path -> ((size, mtime_ns), first time this signature was seen)
+        self.segments = {}  # path -> [spool file, first part], in the order the files were merged
+        self.spool_dir = None
+        self.part_number = 0
+        self.part_path = None
+        self.part_text = ""
+        self.part_words = 0
+        self.saved_files = []  # Output parts of this session, indexed by part number - 1
+        self._rewrite_from = 1  # Parts before this number are kept as they are while rebuilding
+
+    def _load_state(self):
+        """Loads the processed-file signatures from the state file."""
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f).get("processed", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        """Saves the processed-file signatures to the state file."""
+        try:
+            with open(self.state_path, "w") as f:
+                json.dump({"input_folder": self.input_folder, "processed": self.processed}, f, indent=4)
+        except OSError as e:
+            self.log(f"[WARNING] Could not save watch state: {e}", "warning")
+
+    def _is_own_output(self, path):
+        """Returns True for output files written by the merger, when input and output folders coincide."""
+        if _path_key(path) in {_path_key(saved) for saved in self.saved_files}:
+            return True
+        if _path_key(os.path.dirname(path)) != _path_key(self.engine.options.output_folder):
+            return False
+        base, extension = self.engine._output_base_and_extension()
+        return _output_name_pattern(base, extension).fullmatch(os.path.basename(path)) is not None
+
+    def _snapshot(self):
+        """Stats the supported files in the input folder. Returns {path: (size, mtime_ns)}."""
+        signatures = {}
+        try:
+            with os.scandir(self.input_folder) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() not in SUPPORTED_INPUT_EXTENSIONS:
+                        continue
+                    if self._is_own_output(entry.path):
+                        continue
+                    stat = entry.stat()
+                    signatures[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        except OSError as e:
+            self.log(f"[WARNING] Could not scan input folder {self.input_folder}: {e}", "warning")
+        return signatures
+
+    def poll(self, now=None):
+        """Runs one polling pass. Returns (path, signature) pairs that are ready to process, oldest first."""
+        now = time.monotonic() if now is None else now
+        signatures = self._snapshot()
+        ready = []
+        for path, signature in signatures.items():
+            if self.processed.get(path) == list(signature):
+                continue
+            pending = self.pending.get(path)
+            if pending is None or pending[0] != signature:
+                # New file, or still being written: (re)start the debounce timer
+                self.pending[path] = (signature, now)
+            elif now - pending[1] >= self.settle_seconds:
+                ready.append((path, signature))
+                del self.pending[path]
+        # Forget files that disappeared before they settled
+        for path in list(self.pending):
+            if path not in signatures:
+                del self.pending[path]
+        ready.sort(key=lambda item: item[1][1])
+        return ready
+
+    def process(self, ready):
+        """Processes the ready files and merges their text into the output parts."""
+        try:
+            for path, signature in ready:
+                self.token.checkpoint()
+                name = os.path.basename(path)
+                self.log(f"[WATCH] Processing '{name}'...", "progress")
+                try:
+                    text = self.engine.process_file(path)
+                except Exception as e:
+                    # Unreadable files are recorded, so they are retried only once they change again
+                    self.log(f"  Error processing '{name}': {e}. Skipping.", "error")
+                    self.processed[path] = list(signature)
+                    continue
+                try:
+                    if path in self.segments:
+                        self.log(f"[WATCH] '{name}' changed, replacing its earlier text...", "info")
+                        self._replace(path, text)
+                    else:
+                        self._add(path, text)
+                except Exception as e:
+                    # Not recorded: the file is retried on the next poll once it has settled again
+                    self.log(f"  Error writing output for '{name}': {e}. Will retry.", "error")
+                    continue
+                self.processed[path] = list(signature)
+        finally:
+            self._save_state()
+
+    def _spool(self, path, text):
+        """Saves the text of a merged file to the session spool folder. Returns the spool file path."""
+        if self.spool_dir is None:
+            self.spool_dir = tempfile.mkdtemp(prefix="pdf_merger_watch_")
+        segment = self.segments.get(path)
+        spool_path = segment[0] if segment else os.path.join(self.spool_dir, f"{len(self.segments):06d}.txt")
+        with open(spool_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return spool_path
+
+    def _add(self, path, text):
+        """Merges the text of a new file after everything merged so far."""
+        spool_path = self._spool(path, text)
+        # The text lands in the current part, or in the next one if the current part is closed
+        first_part = self.part_number if self.part_path is not None else self.part_number + 1
+        self.segments[path] = [spool_path, max(first_part, 1)]
+        self._append(text)
+
+    def _replace(self, path, text):
+        """Replaces the text of a file merged earlier in this session and rebuilds the parts from there on."""
+        self._spool(path, text)
+        self._rebuild(self.segments[path][1])
+
+    def _rebuild(self, first_part):
+        """Replays the spooled texts, rewriting parts from first_part onwards and removing stale parts."""
+        self.part_number = 0
+        self.part_path = None
+        self.part_text = ""
+        self.part_words = 0
+        self._rewrite_from = first_part
+        try:
+            for segment in self.segments.values():
+                self.token.checkpoint()
+                segment[1] = max(self.part_number if self.part_path is not None else self.part_number + 1, 1)
+                with open(segment[0], 'r', encoding='utf-8') as f:
+                    self._append(f.read())
+        finally:
+            self._rewrite_from = 1
+        # The replaced text may be shorter: drop parts past the new last part
+        for stale in self.saved_files[self.part_number:]:
+            try:
+                os.remove(stale)
+                self.log(f"[WATCH] Removed stale part: {os.path.basename(stale)}", "info")
+            except OSError:
+                pass
+        del self.saved_files[self.part_number:]
+
+    def _append(self, text):
+        """Appends text to the current part, rolling over to new parts at the word limit."""
+        options = self.engine.options
+        if not options.split_by_words and options.output_file_type.lower() in ('txt', 'md'):
+            # Plain text parts are appended to in place instead of being rewritten
+            self._append_text(text + "\n\n")
+            return
+        if not options.split_by_words:
+            # Other formats are rewritten whole: roll over at a word cap so each rewrite stays bounded
+            words = count_words(text)
+            if self.part_text and self.part_words + words > WATCH_PART_MAX_WORDS:
+                self.part_path = None
+                self.part_text = ""
+                self.part_words = 0
+            self.part_words += words
+        self.part_text += text + "\n\n"
+        if options.split_by_words:
+            words_per_file = options.split_word_count
+            words = self.part_text.split()
+            while len(words) > words_per_file:
+                self._write_part(' '.join(words[:words_per_file]))
+                # The part is full: the next write starts a new part
+                self.part_path = None
+                words = words[words_per_file:]
+            self.part_text = ' '.join(words) + "\n\n" if words else ""
+        if self.part_text.strip():
+            self._write_part(self.part_text)
+
+    def _append_text(self, text):
+        """Appends text to the current TXT/MD part, creating the part on first use."""
+        if not text.strip():
+            return
+        if self.part_path is None:
+            self._write_part(text)
+            return
+        if self.part_number < self._rewrite_from:
+            return
+        with open(self.part_path, 'a', encoding='utf-8') as f:
+            f.write(text)
+        self.log(f"[WATCH] Updated part {self.part_number}: {os.path.basename(self.part_path)}", "success")
+
+    def _write_part(self, text):
+        """(Re)writes the current output part with the given text."""
+        if self.part_path is None:
+            self.part_number += 1
+            if self.part_number <= len(self.saved_files):
+                # Rebuilding: parts keep the paths they were first written to
+                self.part_path = self.saved_files[self.part_number - 1]
+            else:
+                self.part_path = self.engine.get_output_filepath(counter=self.part_number)
+                self.saved_files.append(self.part_path)
+        if self.part_number < self._rewrite_from:
+            return
+        self.engine.write_part(text, self.part_path, self.part_number)
+        self.log(f"[WATCH] Updated part {self.part_number}: {os.path.basename(self.part_path)}", "success")
+
+    def close(self):
+        """Removes the session spool folder."""
+        if self.spool_dir is not None:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+            self.spool_dir = None
+
+    def run(self):
+        """Polls the input folder until the stop event is set."""
+        self.log(f"[WATCH] Watching {self.input_folder} (poll every {self.poll_interval:g}s, settle {self.settle_seconds:g}s)", "info")
+        try:
+            while not self.token.is_stopped:
+                ready = self.poll()
+                if ready:
+                    self.process(ready)
+                self.token.wait(self.poll_interval)
+        except MergeCancelled:
+            pass
+        finally:
+            self.close()
+        self.log("[WATCH] Stopped watching input folder.", "info")
+        return self.saved_files
+
+
+@dataclass
+class DecryptResult:
+    """Outcome of decrypting one PDF."""
+    source: str
+    status: str  # "decrypted", "not_encrypted", "wrong_password", "timeout" or "failed"
+    output: str = ""
+    method: str = ""  # "fitz" or "qpdf"
+    error: str = ""
+
+
+class PdfDecryptor:
+    """
+    Decrypts batches of PDFs into the output folder as <name>_decrypted.pdf.
+
+    Files are decrypted in parallel by a pool of up to `workers` processes
+    (PyMuPDF is not thread-safe). Each file is first decrypted with PyMuPDF
+    (authenticate and save without encryption); files PyMuPDF can't handle
+    go to qpdf, if it is configured, with a timeout that grows with the file
+    size. Files without encryption are skipped. Outputs are written to a
+    uniquely named temp file and renamed when complete.
+    """
+
+    def __init__(self, output_folder, password=None, qpdf_path=None, workers=DEFAULT_DECRYPT_WORKERS,
+                 log=None, token=None, use_qpdf_only=False):
+        self.output_folder = output_folder
+        self.password = password or None
+        self.qpdf_path = qpdf_path
+        self.workers = max(1, workers)
+        self.log = log or _null_log
+        self.token = token or CancellationToken()
+        self.use_qpdf_only = use_qpdf_only
+        self._taken = None  # lowercased names in the output folder, scanned once per batch
+        self._taken_lock = threading.Lock()
+
+    @staticmethod
+    def qpdf_timeout(path):
+        """Returns the qpdf timeout in seconds for a file, scaled by its size."""
+        try:
+            size_mb = os.path.getsize(path) / 1048576
+        except OSError:
+            size_mb = 0
+        return DECRYPT_TIMEOUT_BASE + DECRYPT_TIMEOUT_PER_MB * size_mb
+
+    def output_path_for(self, path):
+        """Reserves a unique <name>_decrypted.pdf path, scanning the output folder once per batch."""
+        with self._taken_lock:
+            if self._taken is None:
+                try:
+                    self._taken = {name.lower() for name in os.listdir(self.output_folder)}
+                except OSError:
+                    self._taken = set()
+            base_name = os.path.splitext(os.path.basename(path))[0]
+            output_filename = f"{base_name}_decrypted.pdf"
+            counter = 1
+            while output_filename.lower() in self._taken:
+                output_filename = f"{base_name}_decrypted_{counter}.pdf"
+                counter += 1
+            self._taken.add(output_filename.lower())
+        return os.path.join(self.output_folder, output_filename)
+
+    def decrypt_file(self, path, output_path):
+        """Decrypts one PDF to output_path: PyMuPDF first, then qpdf. Returns a DecryptResult."""
+        result = None if self.use_qpdf_only and self.qpdf_path else self._decrypt_with_fitz(path, output_path)
+        if result is None:
+            result = self._decrypt_with_qpdf(path, output_path)
+        return result
+
+    def _decrypt_with_fitz(self, path, output_path):
+        """Decrypts with PyMuPDF. Returns a DecryptResult, or None if the file needs qpdf."""
+        try:
+            with fitz.open(path) as doc:
+                # Files with only an owner password open without one but still report their encryption
+                if not doc.needs_pass and not (doc.metadata or {}).get('encryption'):
+                    return DecryptResult(path, "not_encrypted")
+                if doc.needs_pass and not doc.authenticate(self.password or ""):
+                    return DecryptResult(path, "wrong_password", method="fitz",
+                                         error="The password is incorrect." if self.password else "A password is required.")
+                temp_path = _create_temp_file(output_path)
+                try:
+                    doc.save(temp_path, encryption=fitz.PDF_ENCRYPT_NONE)
+                    os.replace(temp_path, output_path)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+                return DecryptResult(path, "decrypted", output_path, "fitz")
+        except Exception as e:
+            if self.qpdf_path:
+                self.log(f"[DECRYPT] PyMuPDF could not decrypt {os.path.basename(path)} ({e}); using qpdf.", "debug")
+                return None
+            return DecryptResult(path, "failed", method="fitz", error=str(e))
+
+    def _decrypt_with_qpdf(self, path, output_path):
+        """Decrypts with a qpdf subprocess."""
+        try:
+            temp_path = _create_temp_file(output_path)
+        except OSError as e:
+            return DecryptResult(path, "failed", method="qpdf", error=str(e))
+        cmd = [self.qpdf_path]
+        if self.password:
+            cmd.append(f"--password={self.password}")
+        cmd.extend(["--decrypt", path, temp_path])
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.qpdf_timeout(path))
+            # Exit code 3 means success with warnings
+            if result.returncode in (0, 3) and os.path.exists(temp_path):
+                os.replace(temp_path, output_path)
+                return DecryptResult(path, "decrypted", output_path, "qpdf")
+            error = (result.stderr or result.stdout).strip()
+            status = "wrong_password" if "password" in error.lower() else "failed"
+            return DecryptResult(path, status, method="qpdf", error=error)
+        except subprocess.TimeoutExpired:
+            return DecryptResult(path, "timeout", method="qpdf",
+                                 error=f"qpdf timed out after {self.qpdf_timeout(path):.0f}s")
+        except OSError as e:
+            return DecryptResult(path, "failed", method="qpdf", error=str(e))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def run(self, paths):
+        """Decrypts the PDFs and returns a DecryptResult per file, in input order."""
+        os.makedirs(self.output_folder, exist_ok=True)
+        self._taken = None
+        # Output names are reserved up front in this process, so workers never pick the same one
+        jobs = [(path, self.output_path_for(path)) for path in paths]
+        results = []
+        workers = min(self.workers, len(jobs))
+        if workers <= 1:
+            for path, output_path in jobs:
+                self.token.checkpoint()
+                results.append(self.decrypt_file(path, output_path))
+                self._log_result(results[-1])
+            return results
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(_decrypt_pdf_worker, path, output_path, self.password, self.qpdf_path,
+                                   self.use_qpdf_only)
+                       for path, output_path in jobs]
+            for (path, _), future in zip(jobs, futures):
+                self.token.checkpoint()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = DecryptResult(path, "failed", error=str(e))
+                results.append(result)
+                self._log_result(result)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def _log_result(self, result):
+        name = os.path.basename(result.source)
+        if result.status == "decrypted":
+            self.log(f"[DECRYPT] {name} -> {os.path.basename(result.output)} ({result.method})", "success")
+        elif result.status == "not_encrypted":
+            self.log(f"[DECRYPT] {name} is not encrypted; skipped.", "info")
+        else:
+            self.log(f"[DECRYPT] {name}: {result.status.replace('_', ' ')}. {result.error}", "error")
+
+
+def _decrypt_pdf_worker(path, output_path, password, qpdf_path, use_qpdf_only):
+    """Worker process entry point for PdfDecryptor: decrypts one PDF and returns its DecryptResult."""
+    decryptor = PdfDecryptor(os.path.dirname(output_path), password, qpdf_path, workers=1,
+                             use_qpdf_only=use_qpdf_only)
+    return decryptor.decrypt_file(path, output_path)
+
 
 class PDFMergerApp:
     def __init__(self, master):
@@ -60,11 +3429,39 @@ class PDFMergerApp:
         self.models_directory = MODELS_DIR  # Default to app directory
         # New: Variable for qpdf executable path
         self.qpdf_path = None  # Will be loaded from settings
+        # New: Batch decryption (qpdf processes run at the same time)
+        self.decrypt_workers = DEFAULT_DECRYPT_WORKERS
+        self.decrypt_token = None
+        # New: Passwords of encrypted inputs, kept in memory for this session only (never saved)
+        self.pdf_passwords = PasswordStore()
+        # New: Hot-folder watcher settings
+        self.watch_poll_interval = 2.0  # Seconds between folder scans
+        self.watch_settle_seconds = 5.0  # Seconds a file must be unchanged before processing
+        self.folder_watcher = None
+        # New: Profile the next merge job (one-shot)
+        self.profile_next_run_var = tk.BooleanVar(value=False)
+        # New: Extraction parallelism (tuned by the self-benchmark)
+        self.extraction_workers = 1
+        self.worker_chunk_size = 1
+        self.self_benchmark_results = None
+        self.benchmark_token = None
+        # New: Memory diagnostics (settings.json only)
+        self.memory_sampling = False
+        self.memory_trace_allocations = False
+        self.memory_budget_mb = 0
+        # New: EPUB chapter size (settings.json only)
+        self.epub_chapter_chars = EPUB_CHAPTER_CHARS
+        # New: Merge job queue (replaces the single global merge thread)
+        self.max_concurrent_jobs_var = tk.StringVar(value=str(DEFAULT_MAX_CONCURRENT_JOBS))
+        self.job_queue = MergeJobQueue(self._merge_pdfs_threaded, on_change=self._on_job_changed)
         # New: Console visibility and filter variables
         self.console_visible_var = tk.BooleanVar(value=True)
         self.console_filter_level_var = tk.StringVar(value="ALL")
-        # Message buffer for filtering
-        self.console_message_buffer = []  # List of (message, tag, level) tuples
+        # Bounded message history for filtering
+        self.console_history = ConsoleHistory(DEFAULT_CONSOLE_HISTORY_SIZE)
+        # Pending log messages from any thread; drained into the widget by the Tk thread
+        self.console_queue = collections.deque()
+        self._console_drain_id = None
         # New: Multi-format support variables
         self.output_file_type_var = tk.StringVar(value="PDF")  # Output format
         self.output_filename_var = tk.StringVar(value="")  # Optional custom output filename
@@ -72,6 +3469,7 @@ class PDFMergerApp:
 
         # Initialize widgets first so console_output exists before load_settings
         self.create_widgets() # Build the GUI elements
+        self._drain_console_queue() # Start the console log drain timer
         self.load_settings() # Load saved settings on startup
         self.update_word_count_display() # Update the word count label initially
         self._update_pii_field_visibility() # Set initial state of custom PII field
@@ -108,6 +3506,10 @@ class PDFMergerApp:
         self.add_btn = tk.Button(input_folder_frame, text="Add File(s)", command=self.add_pdf_file, width=12)
         self.add_btn.pack(side=tk.LEFT, padx=2)
 
+        # Watch Folder button (hot-folder mode)
+        self.watch_btn = tk.Button(input_folder_frame, text="Watch Folder", command=self.toggle_watch_folder, width=12)
+        self.watch_btn.pack(side=tk.LEFT, padx=2)
+
         # Files for Merger list
         tk.Label(input_config_frame, text="Files for Merger:", font=("Arial", 12)).pack(side=tk.TOP, anchor="w", pady=(5,2))
 
@@ -172,6 +3574,18 @@ class PDFMergerApp:
         self.pause_btn.pack(side=tk.LEFT, padx=2)
         self.pause_btn.bind("<Enter>", lambda e: self.pause_btn.config(cursor="hand2") if self.pause_btn.cget("state") == tk.NORMAL else None)
 
+        # Resume button (continues stopped or crashed jobs from their journal)
+        self.resume_btn = tk.Button(
+            toolbar,
+            text="⟲",
+            font=("Arial", 14, "bold"),
+            command=self.resume_merge,
+            width=3,
+            relief=tk.RAISED,
+            bd=1
+        )
+        self.resume_btn.pack(side=tk.LEFT, padx=2)
+
         # Separator 1
         separator1 = tk.Frame(toolbar, width=2, bg="gray", relief=tk.SUNKEN)
         separator1.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=2)
@@ -240,6 +3654,22 @@ class PDFMergerApp:
         self.clear_all_btn = tk.Button(toolbar, text="Clear All", command=self.clear_all_pdfs, state=tk.DISABLED, width=12)
         self.clear_all_btn.pack(side=tk.LEFT, padx=2)
 
+        # Jobs list (each Start queues a job; pause/stop act on the selected jobs, or all)
+        jobs_header = tk.Frame(input_config_frame)
+        jobs_header.pack(side=tk.TOP, fill=tk.X, pady=(10, 2))
+
+        tk.Label(jobs_header, text="Jobs:", font=("Arial", 12)).pack(side=tk.LEFT)
+        self.clear_jobs_btn = tk.Button(jobs_header, text="Clear Finished", command=self.clear_finished_jobs, width=12)
+        self.clear_jobs_btn.pack(side=tk.RIGHT, padx=2)
+        self.max_jobs_spinbox = tk.Spinbox(jobs_header, from_=1, to=max(1, os.cpu_count() or 1), width=4, textvariable=self.max_concurrent_jobs_var, command=self.on_max_jobs_change)
+        self.max_jobs_spinbox.pack(side=tk.RIGHT, padx=2)
+        self.max_jobs_spinbox.bind("<FocusOut>", lambda e: self.on_max_jobs_change())
+        tk.Label(jobs_header, text="Max concurrent:").pack(side=tk.RIGHT)
+
+        self.jobs_listbox = tk.Listbox(input_config_frame, selectmode=tk.EXTENDED, height=4, exportselection=False)
+        self.jobs_listbox.pack(side=tk.TOP, fill=tk.X)
+        self.jobs_listbox.bind("<<ListboxSelect>>", lambda e: self.update_ui_for_process())
+
         # --- Tools Section ---
         tools_frame = tk.LabelFrame(self.master, text="Tools", bd=2, relief="groove", padx=10, pady=10)
         tools_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
@@ -268,6 +3698,20 @@ class PDFMergerApp:
         link_label.pack(side=tk.RIGHT, padx=5)
         link_label.bind("<Button-1>", lambda e: self._open_qpdf_download_page())
 
+        # Batch decryption (PyMuPDF, with qpdf as fallback when configured)
+        self.batch_decrypt_btn = tk.Button(decrypt_frame, text="Batch Decrypt", command=self.batch_decrypt, width=15)
+        self.batch_decrypt_btn.pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Self-benchmark
+        benchmark_frame = tk.Frame(tools_frame)
+        benchmark_frame.pack(side=tk.TOP, fill=tk.X)
+
+        tk.Label(benchmark_frame, text="Performance Calibration:", font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+        self.benchmark_btn = tk.Button(benchmark_frame, text="Run Self-Benchmark", command=self.run_self_benchmark, width=18)
+        self.benchmark_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        self.benchmark_label = tk.Label(benchmark_frame, text="", fg="green", font=("Arial", 8))
+        self.benchmark_label.pack(side=tk.LEFT, padx=5, pady=5)
+
         # --- OUTPUT Configuration Section ---
         output_config_frame = tk.LabelFrame(self.master, text="OUTPUT Configuration", bd=2, relief="groove", padx=10, pady=10)
         output_config_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
@@ -413,6 +3857,15 @@ class PDFMergerApp:
         self.console_filter_dropdown = tk.OptionMenu(console_header, self.console_filter_level_var, *filter_levels, command=self._on_filter_change)
         self.console_filter_dropdown.pack(side=tk.LEFT)
 
+        # Profile next run checkbox
+        self.profile_next_run_checkbox = tk.Checkbutton(
+            console_header,
+            text="Profile Next Run",
+            variable=self.profile_next_run_var,
+            command=lambda: self.log_and_save_setting("Profile Next Run", self.profile_next_run_var)
+        )
+        self.profile_next_run_checkbox.pack(side=tk.RIGHT)
+
         self.console_output = scrolledtext.ScrolledText(console_frame, wrap=tk.WORD, height=8, bg="black", fg="lime", font=("Consolas", 10))
         self.console_output.pack(fill=tk.BOTH, expand=True)
         self.console_output.tag_config("info", foreground="white")
@@ -449,6 +3902,44 @@ class PDFMergerApp:
             self.print_to_console(f"Input folder set to: {folder}", "info")
             self.save_settings()
 
+    def toggle_watch_folder(self):
+        """Starts or stops watching the input folder for new files."""
+        if self.folder_watcher:
+            self.folder_watcher.token.stop()
+            self.watch_btn.config(state=tk.DISABLED)
+            self.print_to_console("[WATCH] Stopping folder watcher...", "info")
+            return
+
+        if not os.path.isdir(self.input_folder):
+            messagebox.showerror("Invalid Folder", f"Input folder does not exist:\n\n{self.input_folder}")
+            return
+
+        watcher = self.folder_watcher = FolderWatcher(
+            self._create_engine(),
+            self.input_folder,
+            poll_interval=self.watch_poll_interval,
+            settle_seconds=self.watch_settle_seconds,
+        )
+        self.watch_btn.config(text="Stop Watching", relief=tk.SUNKEN)
+        self.select_input_folder_btn.config(state=tk.DISABLED)
+
+        def watch_thread():
+            try:
+                watcher.run()
+            except Exception as e:
+                self.print_to_console(f"[ERROR] Folder watcher failed: {e}", "error")
+            finally:
+                watcher.engine.close()
+                self.master.after(0, self._on_watch_stopped)
+
+        threading.Thread(target=watch_thread, daemon=True).start()
+
+    def _on_watch_stopped(self):
+        """Resets the watch controls once the watcher thread has finished."""
+        self.folder_watcher = None
+        self.watch_btn.config(text="Watch Folder", relief=tk.RAISED, state=tk.NORMAL)
+        self.select_input_folder_btn.config(state=tk.NORMAL)
+
     def on_output_type_change(self, *args):
         """Handle output file type change."""
         output_type = self.output_file_type_var.get()
@@ -827,43 +4318,55 @@ startxref
         }
         return level_mapping.get(tag_lower, "INFO")
     
-    def _should_show_message(self, level):
-        """Determines if a message should be shown based on current filter."""
+    def _visible_levels(self):
+        """Returns the log levels shown by the current filter, or None for all."""
         filter_level = self.console_filter_level_var.get()
-        if filter_level == "ALL":
-            return True
-        
-        # Define level hierarchy (lower number = higher priority)
-        level_hierarchy = {
-            "DEBUG": 0,
-            "INFO": 1,
-            "WARNING": 2,
-            "ERROR": 3,
-            "CRITICAL": 4
-        }
-        
-        filter_value = level_hierarchy.get(filter_level, 1)
-        message_value = level_hierarchy.get(level, 1)
-        
+        if filter_level not in CONSOLE_LEVELS:
+            return None
         # Show messages at or above the filter level
-        return message_value >= filter_value
+        return CONSOLE_LEVELS[CONSOLE_LEVELS.index(filter_level):]
+
+    def _should_show_message(self, level):
+        """Determines if a message should be shown based on current filter."""
+        levels = self._visible_levels()
+        return levels is None or level in levels
     
     def print_to_console(self, message, tag=None):
-        """Prints a message to the console output widget with filtering support."""
-        # Determine log level from tag
-        level = self._get_log_level_from_tag(tag)
-        
-        # Store message in buffer
-        self.console_message_buffer.append((message, tag, level))
-        
-        # Check if message should be shown based on filter
-        if not self._should_show_message(level):
-            return
-        
-        # Only insert if console is visible
-        if self.console_visible_var.get():
-            self.console_output.insert(tk.END, message + "\n", tag)
-            self.console_output.see(tk.END)
+        """
+        Queues a message for the console output widget. Safe to call from any
+        thread: deque.append is atomic, and only the Tk thread touches the widget.
+        """
+        self.console_queue.append((message, tag))
+
+    def _drain_console_queue(self):
+        """Moves queued messages into the console in one batched insert. Runs on the Tk thread."""
+        batch = []
+        try:
+            while len(batch) < CONSOLE_MAX_BATCH:
+                batch.append(self.console_queue.popleft())
+        except IndexError:
+            pass
+
+        if batch:
+            show = self.console_visible_var.get()
+            visible_levels = self._visible_levels()
+            insert_args = []
+            for message, tag in batch:
+                # Determine log level from tag and store message in history
+                level = self._get_log_level_from_tag(tag)
+                self.console_history.append(message, tag, level)
+                # Check if message should be shown based on filter
+                if show and (visible_levels is None or level in visible_levels):
+                    # An empty tag list, not None: Tcl would truncate the arguments at None
+                    insert_args.extend((message + "\n", tag or ""))
+            if insert_args:
+                self.console_output.insert(tk.END, *insert_args)
+                self._trim_console_display()
+                self.console_output.see(tk.END)
+
+        # Come back sooner if messages are still waiting
+        delay = 1 if self.console_queue else CONSOLE_FLUSH_INTERVAL_MS
+        self._console_drain_id = self.master.after(delay, self._drain_console_queue)
     
     def _toggle_console_visibility(self):
         """Shows or hides the console based on checkbox state."""
@@ -880,22 +4383,29 @@ startxref
         self.save_settings()
     
     def _refresh_console_display(self):
-        """Refreshes the console display based on current filter and visibility."""
+        """Redraws the console with the newest messages that match the filter, in one insert."""
         if not self.console_visible_var.get():
             return
         
         # Clear current display
         self.console_output.delete(1.0, tk.END)
         
-        # Re-insert messages that match the current filter
-        filter_level = self.console_filter_level_var.get()
-        for message, tag, level in self.console_message_buffer:
-            if self._should_show_message(level):
-                self.console_output.insert(tk.END, message + "\n", tag)
+        # Insert only the visible tail of the history
+        insert_args = []
+        for _, message, tag, _ in self.console_history.tail(self._visible_levels(), CONSOLE_DISPLAY_LINES):
+            insert_args.extend((message + "\n", tag or ""))
+        if insert_args:
+            self.console_output.insert(tk.END, *insert_args)
         
         # Scroll to end
         self.console_output.see(tk.END)
 
+    def _trim_console_display(self):
+        """Deletes the oldest lines so the widget holds at most CONSOLE_DISPLAY_LINES messages."""
+        line_count = int(self.console_output.index("end-1c").split(".")[0]) - 1
+        if line_count > CONSOLE_DISPLAY_LINES:
+            self.console_output.delete("1.0", f"{line_count - CONSOLE_DISPLAY_LINES + 1}.0")
+
     def log_and_save_setting(self, setting_name, var):
         """Logs checkbox state changes and saves all settings."""
         state = "Enabled" if var.get() else "Disabled"
@@ -930,9 +4440,29 @@ startxref
                     self.models_directory = settings.get("models_directory", MODELS_DIR)
                     # New: Load qpdf path
                     self.qpdf_path = settings.get("qpdf_path", None)
+                    self.decrypt_workers = max(1, int(settings.get("decrypt_workers", DEFAULT_DECRYPT_WORKERS)))
+                    # New: Load hot-folder watcher settings
+                    self.watch_poll_interval = float(settings.get("watch_poll_interval", 2.0))
+                    self.watch_settle_seconds = float(settings.get("watch_settle_seconds", 5.0))
+                    # New: Load profiling setting
+                    self.profile_next_run_var.set(settings.get("profile_next_run", False))
+                    # New: Load extraction parallelism settings
+                    self.extraction_workers = max(1, int(settings.get("extraction_workers", 1)))
+                    self.worker_chunk_size = max(1, int(settings.get("worker_chunk_size", 1)))
+                    self.self_benchmark_results = settings.get("self_benchmark")
+                    # New: Load memory diagnostics settings
+                    self.memory_sampling = bool(settings.get("memory_sampling_enabled", False))
+                    self.memory_trace_allocations = bool(settings.get("memory_trace_allocations", False))
+                    self.memory_budget_mb = int(settings.get("memory_budget_mb", 0))
+                    # New: Load EPUB chapter size
+                    self.epub_chapter_chars = max(1000, int(settings.get("epub_chapter_chars", EPUB_CHAPTER_CHARS)))
+                    # New: Load job queue settings
+                    self.max_concurrent_jobs_var.set(str(settings.get("max_concurrent_jobs", DEFAULT_MAX_CONCURRENT_JOBS)))
+                    self.on_max_jobs_change(save=False)
                     # New: Load console settings
                     self.console_visible_var.set(settings.get("console_visible", True))
                     self.console_filter_level_var.set(settings.get("console_filter_level", "ALL"))
+                    self.console_history.resize(settings.get("console_history_size", DEFAULT_CONSOLE_HISTORY_SIZE))
                     # New: Load multi-format settings
                     self.output_file_type_var.set(settings.get("output_file_type", "PDF"))
                     self.output_filename_var.set(settings.get("output_filename", ""))
@@ -946,8 +4476,10 @@ startxref
                     for file_path in self.pdf_files:
                         if os.path.exists(file_path):
                             try:
-                                text = self._extract_text_from_file(file_path)
-                                self.total_word_count += self._count_words(text)
+                                words_in_file = self._count_file_words(file_path)
+                                if words_in_file is None:
+                                    self._log_locked_file(file_path)
+                                self.total_word_count += words_in_file or 0
                                 files_to_keep.append(file_path)
                                 self.pdf_listbox.insert(tk.END, os.path.basename(file_path))
                             except Exception as e:
@@ -976,6 +4508,7 @@ startxref
 
         # Update qpdf UI status after loading settings
         self._update_qpdf_ui_status()
+        self._update_benchmark_label()
 
         # Update console visibility and refresh display after loading settings
         self._toggle_console_visibility()
@@ -996,338 +4529,116 @@ startxref
             "split_word_count": self.split_word_count_var.get(),
             # New: Save markdown setting
             "generate_markdown_enabled": self.generate_markdown_var.get(),
-            # New: Save simple markdown setting
-            "simple_markdown_enabled": self.simple_markdown_var.get(),
-            # New: Save markdown type
-            "markdown_type": self.markdown_type_var.get(),
-            # New: Save GPU setting
-            "use_gpu_enabled": self.use_gpu_var.get(),
-            # New: Save models directory
-            "models_directory": self.models_directory,
-            # New: Save qpdf path
-            "qpdf_path": self.qpdf_path,
-            # New: Save console settings
-            "console_visible": self.console_visible_var.get(),
-            "console_filter_level": self.console_filter_level_var.get(),
-            # New: Save multi-format settings
-            "output_file_type": self.output_file_type_var.get(),
-            "output_filename": self.output_filename_var.get(),
-            "preserve_formatting": self.preserve_formatting_var.get()
-        }
-        try:
-            with open(SETTINGS_FILE, "w") as f:
-                json.dump(settings, f, indent=4)
-        except Exception as e:
-            self.print_to_console(f"Error saving settings: {e}", "error")
-
-    def _extract_text_from_file(self, file_path):
-        """Extracts text from any supported file format."""
-        ext = os.path.splitext(file_path)[1].lower()
-
-        if ext == '.pdf':
-            return self._extract_text_from_pdf(file_path)
-        elif ext == '.txt':
-            return self._extract_text_from_txt(file_path)
-        elif ext == '.md':
-            return self._extract_text_from_md(file_path)
-        elif ext == '.docx':
-            return self._extract_text_from_docx(file_path)
-        elif ext == '.odt':
-            return self._extract_text_from_odt(file_path)
-        elif ext == '.rtf':
-            return self._extract_text_from_rtf(file_path)
-        elif ext == '.epub':
-            return self._extract_text_from_epub(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {ext}")
-
-    def _extract_text_from_txt(self, file_path):
-        """Extracts text from TXT file."""
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
-
-    def _extract_text_from_md(self, file_path):
-        """Extracts text from Markdown file."""
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
-
-    def _extract_text_from_docx(self, file_path):
-        """Extracts text from DOCX file."""
-        try:
-            from docx import Document
-            doc = Document(file_path)
-            text = []
-            for paragraph in doc.paragraphs:
-                text.append(paragraph.text)
-            return '\n'.join(text)
-        except Exception as e:
-            raise Exception(f"Error reading DOCX file: {e}")
-
-    def _extract_text_from_odt(self, file_path):
-        """Extracts text from ODT file."""
-        try:
-            from odf import text, teletype
-            from odf.opendocument import load
-            doc = load(file_path)
-            all_text = []
-            for paragraph in doc.getElementsByType(text.P):
-                all_text.append(teletype.extractText(paragraph))
-            return '\n'.join(all_text)
-        except Exception as e:
-            raise Exception(f"Error reading ODT file: {e}")
-
-    def _extract_text_from_rtf(self, file_path):
-        """Extracts text from RTF file."""
-        try:
-            from striprtf.striprtf import rtf_to_text
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                rtf_content = f.read()
-            return rtf_to_text(rtf_content)
-        except Exception as e:
-            raise Exception(f"Error reading RTF file: {e}")
-
-    def _extract_text_from_epub(self, file_path):
-        """Extracts text from EPUB file."""
-        try:
-            import ebooklib
-            from ebooklib import epub
-            from bs4 import BeautifulSoup
-
-            book = epub.read_epub(file_path)
-            text_content = []
-
-            for item in book.get_items():
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    text_content.append(soup.get_text())
-
-            return '\n'.join(text_content)
-        except Exception as e:
-            raise Exception(f"Error reading EPUB file: {e}")
-
-    def _extract_text_from_pdf(self, pdf_path):
-        """Extracts text from a PDF for word counting."""
-        text = ""
-        timestamp_regex = r'\[(?:(?:\d{2}:)?\d{2}:\d{2}\.\d{3})\s*-->\s*(?:(?:\d{2}:)?\d{2}:\d{2}\.\d{3})\]\s*'
-        try:
-            # Modified: Can now accept a document object or a path
-            if isinstance(pdf_path, str):
-                doc = fitz.open(pdf_path)
-                close_doc = True
-            else:
-                doc = pdf_path
-                close_doc = False
-
-            for page in doc:
-                page_text = page.get_text("text")
-                if self.remove_timestamps_var.get():
-                    page_text = re.sub(timestamp_regex, '', page_text)
-                text += page_text + " "
-
-            if close_doc:
-                doc.close()
-        except Exception as e:
-            self.print_to_console(f"Error extracting text from PDF: {e}", "error")
-            if 'close_doc' in locals() and close_doc and 'doc' in locals():
-                doc.close()
-            raise
-        return text
-
-    def _count_words(self, text):
-        """Counts words in a given text string."""
-        return len(re.findall(r'\b\w+\b', text.lower()))
-
-    def _sanitize_text_for_xml(self, text):
-        """Remove control characters and NULL bytes that aren't valid in XML."""
-        import unicodedata
-        # Remove NULL bytes
-        text = text.replace('\x00', '')
-        # Remove other control characters except tab, newline, and carriage return
-        clean_text = []
-        for char in text:
-            # Allow tab (0x09), newline (0x0A), carriage return (0x0D)
-            if char in ('\t', '\n', '\r'):
-                clean_text.append(char)
-            # Remove other control characters (0x00-0x1F except the allowed ones above)
-            elif ord(char) < 0x20:
-                continue
-            # Remove control characters in the range 0x7F-0x9F
-            elif 0x7F <= ord(char) <= 0x9F:
-                continue
-            else:
-                clean_text.append(char)
-        return ''.join(clean_text)
-
-    def _generate_output_file(self, text, output_filepath):
-        """Generate output file in the selected format."""
-        output_type = self.output_file_type_var.get().lower()
-
-        # Sanitize text for XML-based formats (DOCX, ODT, EPUB)
-        if output_type in ['docx', 'odt', 'epub']:
-            text = self._sanitize_text_for_xml(text)
-
-        if output_type == 'pdf':
-            self._generate_pdf(text, output_filepath)
-        elif output_type == 'txt':
-            self._generate_txt(text, output_filepath)
-        elif output_type == 'md':
-            self._generate_md(text, output_filepath)
-        elif output_type == 'docx':
-            self._generate_docx(text, output_filepath)
-        elif output_type == 'odt':
-            self._generate_odt(text, output_filepath)
-        elif output_type == 'rtf':
-            self._generate_rtf(text, output_filepath)
-        elif output_type == 'epub':
-            self._generate_epub(text, output_filepath)
-        else:
-            raise ValueError(f"Unsupported output format: {output_type}")
-
-    def _generate_pdf(self, text, output_filepath):
-        """Generate PDF output from text."""
-        doc = fitz.open()
-
-        # Page dimensions and margins
-        page_width = 595  # A4 width in points
-        page_height = 842  # A4 height in points
-        margin = 50
-        text_rect = fitz.Rect(margin, margin, page_width - margin, page_height - margin)
-
-        # Split text into paragraphs
-        paragraphs = text.split('\n')
-
-        page = doc.new_page(width=page_width, height=page_height)
-        current_text = []
-
-        for para in paragraphs:
-            # Try adding this paragraph
-            test_text = '\n'.join(current_text + [para])
-            result = page.insert_textbox(
-                text_rect,
-                test_text,
-                fontsize=11,
-                fontname="helv",
-                align=0
-            )
+            # New: Save simple markdown setting
+            "simple_markdown_enabled": self.simple_markdown_var.get(),
+            # New: Save markdown type
+            "markdown_type": self.markdown_type_var.get(),
+            # New: Save GPU setting
+            "use_gpu_enabled": self.use_gpu_var.get(),
+            # New: Save models directory
+            "models_directory": self.models_directory,
+            # New: Save qpdf path
+            "qpdf_path": self.qpdf_path,
+            "decrypt_workers": self.decrypt_workers,
+            # New: Save hot-folder watcher settings
+            "watch_poll_interval": self.watch_poll_interval,
+            "watch_settle_seconds": self.watch_settle_seconds,
+            # New: Save profiling setting
+            "profile_next_run": self.profile_next_run_var.get(),
+            # New: Save extraction parallelism settings
+            "extraction_workers": self.extraction_workers,
+            "worker_chunk_size": self.worker_chunk_size,
+            "self_benchmark": self.self_benchmark_results,
+            # New: Save memory diagnostics settings
+            "memory_sampling_enabled": self.memory_sampling,
+            "memory_trace_allocations": self.memory_trace_allocations,
+            "memory_budget_mb": self.memory_budget_mb,
+            # New: Save EPUB chapter size
+            "epub_chapter_chars": self.epub_chapter_chars,
+            # New: Save job queue settings
+            "max_concurrent_jobs": self.job_queue.max_concurrent,
+            # New: Save console settings
+            "console_visible": self.console_visible_var.get(),
+            "console_filter_level": self.console_filter_level_var.get(),
+            "console_history_size": self.console_history.capacity,
+            # New: Save multi-format settings
+            "output_file_type": self.output_file_type_var.get(),
+            "output_filename": self.output_filename_var.get(),
+            "preserve_formatting": self.preserve_formatting_var.get()
+        }
+        try:
+            with open(SETTINGS_FILE, "w") as f:
+                json.dump(settings, f, indent=4)
+        except Exception as e:
+            self.print_to_console(f"Error saving settings: {e}", "error")
 
-            # If result < 0, text doesn't fit - start a new page
-            if result < 0 and current_text:
-                # Save current page content
-                page.insert_textbox(
-                    text_rect,
-                    '\n'.join(current_text),
-                    fontsize=11,
-                    fontname="helv",
-                    align=0
-                )
-                # Create new page and start with current paragraph
-                page = doc.new_page(width=page_width, height=page_height)
-                current_text = [para]
-            else:
-                current_text.append(para)
+    def _snapshot_options(self):
+        """Takes a Tk-free snapshot of the current configuration for the merge engine."""
+        try:
+            split_word_count = int(self.split_word_count_var.get())
+        except ValueError:
+            split_word_count = 10000
+            if self.split_by_words_var.get():
+                self.print_to_console(f"Invalid word count, using default: {split_word_count}", "warning")
+        return MergeOptions(
+            output_folder=self.output_folder,
+            output_file_type=self.output_file_type_var.get(),
+            output_filename=self.output_filename_var.get(),
+            remove_timestamps=self.remove_timestamps_var.get(),
+            remove_images=self.remove_images_var.get(),
+            remove_pii=self.remove_pii_var.get(),
+            custom_pii_strings=self.custom_pii_var.get(),
+            split_by_words=self.split_by_words_var.get(),
+            split_word_count=split_word_count,
+            markdown_type=self.markdown_type_var.get(),
+            memory_sampling=self.memory_sampling,
+            trace_allocations=self.memory_trace_allocations,
+            memory_budget_mb=self.memory_budget_mb,
+            workers=self.extraction_workers,
+            worker_chunk_size=self.worker_chunk_size,
+            epub_chapter_chars=self.epub_chapter_chars,
+        )
 
-        # Add remaining text to last page
-        if current_text:
-            page.insert_textbox(
-                text_rect,
-                '\n'.join(current_text),
-                fontsize=11,
-                fontname="helv",
-                align=0
-            )
+    def _create_engine(self):
+        """
+        Creates a MergeEngine bound to the current settings that logs to the console.
+        Callers close it (or use it as a context manager) so allocation tracing is released.
+        """
+        return MergeEngine(self._snapshot_options(), log=self.print_to_console, passwords=self.pdf_passwords)
 
-        doc.save(output_filepath)
-        doc.close()
+    def _extract_text_from_file(self, file_path):
+        """Extracts text from any supported file format."""
+        with self._create_engine() as engine:
+            return engine.extract_text(file_path)
 
-    def _generate_txt(self, text, output_filepath):
-        """Generate TXT output from text."""
-        with open(output_filepath, 'w', encoding='utf-8') as f:
-            f.write(text)
+    def _count_words(self, text):
+        """Counts words in a given text string."""
+        return count_words(text)
 
-    def _generate_md(self, text, output_filepath):
-        """Generate MD (Markdown) output from text."""
-        with open(output_filepath, 'w', encoding='utf-8') as f:
-            f.write(text)
+    def _count_file_words(self, file_path):
+        """
+        Counts the words in a file. Returns None for an encrypted PDF that no known
+        password opens yet: it stays in the list, uncounted, until its password is entered.
+        """
+        try:
+            return self._count_words(self._extract_text_from_file(file_path))
+        except PdfPasswordRequired:
+            return None
 
-    def _generate_docx(self, text, output_filepath):
-        """Generate DOCX output from text."""
-        from docx import Document
-        doc = Document()
-        # Split text by paragraphs and add to document
-        paragraphs = text.split('\n')
-        for para in paragraphs:
-            if para.strip():
-                doc.add_paragraph(para)
-        doc.save(output_filepath)
+    def _log_locked_file(self, file_path):
+        self.print_to_console(f"  - '{os.path.basename(file_path)}' is encrypted and stays in the list uncounted; "
+                              "its password is asked for when the merge starts.", "warning")
 
-    def _generate_odt(self, text, output_filepath):
-        """Generate ODT output from text."""
-        from odf.opendocument import OpenDocumentText
-        from odf.text import P
-        from odf import text as odf_text
+    def _scrub_pii_from_text(self, text):
+        """Scrubs PII from text content using regex patterns."""
+        with self._create_engine() as engine:
+            return engine.scrub_pii(text)
 
-        doc = OpenDocumentText()
-        paragraphs = text.split('\n')
-        for para in paragraphs:
-            if para.strip():
-                p = P(text=para)
-                doc.text.appendChild(p)
-        doc.save(output_filepath)
+    def _generate_output_file(self, text, output_filepath):
+        """Generate output file in the selected format."""
+        with self._create_engine() as engine:
+            engine.generate_output_file(text, output_filepath)
 
-    def _generate_rtf(self, text, output_filepath):
-        """Generate RTF output from text using pypandoc."""
-        try:
-            import pypandoc
-            # Write text to a temporary file
-            temp_txt = output_filepath + ".tmp.txt"
-            with open(temp_txt, 'w', encoding='utf-8') as f:
-                f.write(text)
-            # Convert using pypandoc
-            pypandoc.convert_file(temp_txt, 'rtf', outputfile=output_filepath)
-            # Clean up temp file
-            os.remove(temp_txt)
-        except Exception as e:
-            # Fallback to basic RTF if pypandoc fails
-            with open(output_filepath, 'w', encoding='utf-8') as f:
-                f.write(r'{\rtf1\ansi\deff0 {\fonttbl {\f0 Times New Roman;}}')
-                f.write(r'\f0\fs24 ')
-                # Escape special RTF characters
-                rtf_text = text.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
-                f.write(rtf_text)
-                f.write(r'}')
-
-    def _generate_epub(self, text, output_filepath):
-        """Generate EPUB output from text."""
-        import ebooklib
-        from ebooklib import epub
-        import html
-
-        book = epub.EpubBook()
-        book.set_identifier('merged_document')
-        book.set_title('Merged Document')
-        book.set_language('en')
-
-        # Create chapter
-        c1 = epub.EpubHtml(title='Chapter 1', file_name='chap_01.xhtml', lang='en')
-        # Convert text to HTML paragraphs (escape HTML special characters)
-        html_content = '<h1>Merged Document</h1>'
-        paragraphs = text.split('\n')
-        for para in paragraphs:
-            if para.strip():
-                # Escape HTML special characters
-                escaped_para = html.escape(para)
-                html_content += f'<p>{escaped_para}</p>'
-        c1.content = html_content
-
-        # Add chapter to book
-        book.add_item(c1)
-        book.toc = (epub.Link('chap_01.xhtml', 'Chapter 1', 'chap_01'),)
-        book.add_item(epub.EpubNcx())
-        book.add_item(epub.EpubNav())
-        book.spine = ['nav', c1]
-
-        # Write EPUB file
-        epub.write_epub(output_filepath, book, {})
 
     def update_word_count_display(self):
         """Updates the total word count label in the GUI."""
@@ -1354,14 +4665,23 @@ startxref
         if not file_paths:
             return
 
+        # Ask for the passwords of encrypted PDFs first, so they can be counted
+        self._ask_input_passwords([path for path in file_paths if path not in self.pdf_files],
+                                  lambda: self._add_selected_files(file_paths),
+                                  skip_note="its words are not counted yet")
+
+    def _add_selected_files(self, file_paths):
+        """Adds the selected files to the list and counts their words."""
         for file_path in file_paths:
             if file_path not in self.pdf_files:
                 self.pdf_files.append(file_path)
                 self.pdf_listbox.insert(tk.END, os.path.basename(file_path))
                 self.print_to_console(f"Added: {os.path.basename(file_path)}", "info")
                 try:
-                    text = self._extract_text_from_file(file_path)
-                    words_in_file = self._count_words(text)
+                    words_in_file = self._count_file_words(file_path)
+                    if words_in_file is None:
+                        self._log_locked_file(file_path)
+                        continue
                     self.total_word_count += words_in_file
                     self.print_to_console(f"  - Words in '{os.path.basename(file_path)}': {words_in_file}", "info")
                 except Exception as e:
@@ -1389,8 +4709,7 @@ startxref
         self.total_word_count = 0
         for pdf_path in self.pdf_files:
             try:
-                text = self._extract_text_from_pdf(pdf_path) 
-                self.total_word_count += self._count_words(text)
+                self.total_word_count += self._count_file_words(pdf_path) or 0
             except Exception as e:
                 self.print_to_console(f"Error recalculating words for {os.path.basename(pdf_path)}: {e}", "error")
 
@@ -1555,6 +4874,53 @@ startxref
         self._update_qpdf_ui_status()
         self.print_to_console(f"[SUCCESS] qpdf executable configured: {qpdf_path}", "success")
     
+    def _update_benchmark_label(self):
+        """Shows the extraction parallelism settings next to the self-benchmark button."""
+        text = f"Workers: {self.extraction_workers}, files per task: {self.worker_chunk_size}"
+        if self.self_benchmark_results:
+            text += f" (calibrated {self.self_benchmark_results.get('date', '')})"
+        self.benchmark_label.config(text=text)
+
+    def run_self_benchmark(self):
+        """Runs the machine calibration in the background and applies its recommendations."""
+        if self.benchmark_token is not None:
+            return
+        if self.job_queue.active_jobs():
+            if not messagebox.askyesno("Self-Benchmark", "Merge jobs are running and will skew the results. Run the benchmark anyway?"):
+                return
+        self.benchmark_token = CancellationToken()
+        self.benchmark_btn.config(state=tk.DISABLED, text="Benchmarking...")
+        self.print_to_console("[BENCH] Calibrating extraction, PII and PDF generation throughput on this machine...", "info")
+
+        def worker():
+            try:
+                results = calibrate_machine(log=self.print_to_console, token=self.benchmark_token)
+            except MergeCancelled:
+                results = None
+            except Exception as e:
+                self.print_to_console(f"[BENCH] Self-benchmark failed: {e}", "error")
+                results = None
+            self.master.after(0, lambda: self._on_self_benchmark_done(results))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_self_benchmark_done(self, results):
+        """Applies the self-benchmark recommendations and saves them to settings.json."""
+        self.benchmark_token = None
+        self.benchmark_btn.config(state=tk.NORMAL, text="Run Self-Benchmark")
+        if results is None:
+            return
+        self.self_benchmark_results = results
+        self.extraction_workers = results["recommended_workers"]
+        self.worker_chunk_size = results["recommended_worker_chunk_size"]
+        self.max_concurrent_jobs_var.set(str(results["recommended_max_concurrent_jobs"]))
+        self.on_max_jobs_change(save=False)
+        self.save_settings()
+        self._update_benchmark_label()
+        self.print_to_console(
+            f"[BENCH] Applied: {self.extraction_workers} extraction worker(s), {self.worker_chunk_size} file(s) per task, "
+            f"{self.job_queue.max_concurrent} concurrent job(s). Saved to {SETTINGS_FILE}.", "success")
+
     def _open_qpdf_download_page(self):
         """Opens the qpdf releases page in the default browser."""
         url = "https://github.com/qpdf/qpdf/releases/"
@@ -1660,12 +5026,12 @@ startxref
                 
                 self.master.after(0, lambda: self.print_to_console(f"[PROGRESS] Running qpdf decryption...", "progress"))
                 
-                # Run qpdf
+                # Run qpdf (the timeout grows with the file size)
                 result = subprocess.run(
                     cmd,
                     capture_output=True,
                     text=True,
-                    timeout=60  # 60 second timeout
+                    timeout=PdfDecryptor.qpdf_timeout(pdf_path)
                 )
                 
                 if result.returncode == 0:
@@ -1707,64 +5073,131 @@ startxref
         # Start decryption in background thread
         threading.Thread(target=decrypt_thread, daemon=True).start()
 
-    def update_ui_for_process(self, processing):
-        """Updates UI state for start/stop of the merge process."""
-        state = tk.DISABLED if processing else tk.NORMAL
-        self.start_btn.config(state=tk.DISABLED if processing else tk.NORMAL)
-        self.pause_btn.config(state=tk.NORMAL if processing else tk.DISABLED)
-        # Update pause button text based on state
-        if processing:
-            self.pause_btn.config(text="⏸")
-        else:
-            self.pause_btn.config(text="⏸")
-        self.stop_btn.config(state=tk.NORMAL if processing else tk.DISABLED)
-        
-        # Add PDF button is now in toolbar
-        if hasattr(self, 'add_btn'):
-            self.add_btn.config(state=state)
-        self.pdf_listbox.config(state=state)
-        self.select_folder_btn.config(state=state)
-        self.remove_timestamps_checkbox.config(state=state)
-        self.remove_images_checkbox.config(state=state)
-        self.remove_pii_checkbox.config(state=state)
-        self.custom_pii_entry.config(state=state)
-        self.custom_pii_label.config(state=state)
-        # New: Disable split controls during processing
-        self.split_by_words_checkbox.config(state=state)
-        self.split_word_count_entry.config(state=state)
-        self.split_word_count_label.config(state=state)
-        # New: Disable output controls during processing
-        self.output_type_dropdown.config(state=state)
-        self.output_filename_entry.config(state=state)
-        # Disable markdown radio buttons if enabled
-        if self.output_file_type_var.get() == "MD":
-            md_state = state
+    def batch_decrypt(self):
+        """Decrypts every PDF in the current list or in a chosen folder with a common password."""
+        if self.decrypt_token is not None:
+            # A batch is running: the button stops it
+            self.decrypt_token.stop()
+            return
+        choice = messagebox.askyesnocancel(
+            "Batch Decrypt",
+            "Decrypt the PDFs in the current file list?\n\n"
+            "Yes: the current list\nNo: choose a folder"
+        )
+        if choice is None:
+            return
+        if choice:
+            paths = [path for path in self.pdf_files if path.lower().endswith('.pdf')]
         else:
-            md_state = tk.DISABLED
-        self.simple_markdown_radio.config(state=md_state)
-        self.advanced_markdown_radio.config(state=md_state)
-        # GPU and models buttons (only if advanced markdown is selected)
-        if self.markdown_type_var.get() == "advanced" and self.output_file_type_var.get() == "MD":
-            adv_md_state = state
+            folder = filedialog.askdirectory(title="Select Folder of PDFs to Decrypt")
+            if not folder:
+                return
+            paths = sorted(glob.glob(os.path.join(folder, "*.pdf")) + glob.glob(os.path.join(folder, "*.PDF")))
+            paths = list(dict.fromkeys(paths))
+        if not paths:
+            messagebox.showinfo("Batch Decrypt", "No PDF files to decrypt.")
+            return
+        password = simpledialog.askstring(
+            "PDF Password",
+            f"Password for the {len(paths)} PDF(s) (leave empty if only an owner password is set):",
+            show="*"
+        )
+        if password is None:
+            return
+
+        qpdf_path = self.qpdf_path if self.qpdf_path and self._check_qpdf_executable(self.qpdf_path) else None
+        self.decrypt_token = CancellationToken()
+        decryptor = PdfDecryptor(self.output_folder, password, qpdf_path, self.decrypt_workers,
+                                 log=self.print_to_console, token=self.decrypt_token)
+        self.batch_decrypt_btn.config(text="Stop Decrypt")
+        self.print_to_console(f"[DECRYPT] Decrypting {len(paths)} PDF(s) into {self.output_folder}...", "info")
+
+        def worker():
+            start = time.time()
+            try:
+                results = decryptor.run(paths)
+            except MergeCancelled:
+                results = None
+            except Exception as e:
+                self.print_to_console(f"[DECRYPT] Batch decryption failed: {e}", "error")
+                results = None
+            self.master.after(0, lambda: self._on_batch_decrypt_done(results, time.time() - start))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_batch_decrypt_done(self, results, elapsed):
+        """Reports the outcome of a batch decryption."""
+        self.decrypt_token = None
+        self.batch_decrypt_btn.config(text="Batch Decrypt")
+        if results is None:
+            self.print_to_console("[DECRYPT] Batch decryption stopped.", "warning")
+            return
+        counts = collections.Counter(result.status for result in results)
+        summary = (f"{counts['decrypted']} decrypted, {counts['not_encrypted']} not encrypted, "
+                   f"{len(results) - counts['decrypted'] - counts['not_encrypted']} failed")
+        self.print_to_console(f"[DECRYPT] Batch finished in {elapsed:.1f}s: {summary}.", "success")
+        messagebox.showinfo("Batch Decrypt", f"Batch decryption finished:\n\n{summary}.\n\nSaved to:\n{self.output_folder}")
+
+    def update_ui_for_process(self):
+        """Updates the job controls for the current state of the job queue."""
+        targets = self._target_jobs()
+        self.pause_btn.config(state=tk.NORMAL if targets else tk.DISABLED)
+        self.stop_btn.config(state=tk.NORMAL if targets else tk.DISABLED)
+        # Show resume icon when every targeted job is paused
+        if targets and all(job.status == "paused" for job in targets):
+            self.pause_btn.config(text="▶")
         else:
-            adv_md_state = tk.DISABLED
-        self.use_gpu_checkbox.config(state=adv_md_state)
-        # Always allow changing models folder (unless currently downloading)
-        if self.preload_models_btn.cget('text') != "Downloading...":
-            self.preload_models_btn.config(state=adv_md_state if not processing else tk.DISABLED)
+            self.pause_btn.config(text="⏸")
 
-        if not processing:
-            self._update_pii_field_visibility()
-            self._update_split_field_visibility()
+    def _target_jobs(self):
+        """Returns the active jobs selected in the jobs list, or all active jobs if none are selected."""
+        active = self.job_queue.active_jobs()
+        selected = self.jobs_listbox.curselection()
+        if selected:
+            jobs = list(self.job_queue.jobs)
+            selected_jobs = [jobs[i] for i in selected if i < len(jobs)]
+            return [job for job in selected_jobs if job in active]
+        return active
+
+    def _on_job_changed(self, job):
+        """Called from any thread when a job changes state or progress."""
+        self.master.after(0, self._refresh_jobs_list)
+
+    def _refresh_jobs_list(self):
+        """Redraws the jobs list, keeping the selection."""
+        selected = self.jobs_listbox.curselection()
+        self.jobs_listbox.delete(0, tk.END)
+        for job in list(self.job_queue.jobs):
+            self.jobs_listbox.insert(tk.END, job.describe())
+        for index in selected:
+            if index < self.jobs_listbox.size():
+                self.jobs_listbox.selection_set(index)
+        self.update_ui_for_process()
+
+    def on_max_jobs_change(self, save=True):
+        """Applies the max concurrent jobs setting to the job queue."""
+        try:
+            max_jobs = int(self.max_concurrent_jobs_var.get())
+            if max_jobs < 1:
+                raise ValueError
+        except ValueError:
+            self.max_concurrent_jobs_var.set(str(self.job_queue.max_concurrent))
+            return
+        if max_jobs != self.job_queue.max_concurrent:
+            self.job_queue.set_max_concurrent(max_jobs)
+            self.print_to_console(f"Configuration: Max concurrent jobs set to {max_jobs}.", "info")
+            self._refresh_jobs_list()
+        if save:
+            self.save_settings()
 
-        self.on_listbox_select(None)
+    def clear_finished_jobs(self):
+        """Removes finished jobs from the jobs list."""
+        self.jobs_listbox.selection_clear(0, tk.END)
+        self.job_queue.clear_finished()
+        self._refresh_jobs_list()
 
     def start_merge(self):
-        """Starts the merge process in a new thread."""
-        global merge_thread, merge_running
-        if merge_running:
-            self.print_to_console("Merge process is already running.", "info")
-            return
+        """Queues a merge job for the current file list and settings."""
         if not self.pdf_files:
             messagebox.showerror("No Files", "Please add PDF files to the list first.")
             return
@@ -1780,75 +5213,128 @@ startxref
                 messagebox.showerror("Invalid Input", "Word count for splitting must be a valid number.")
                 return
 
-        merge_stop_event.clear()
-        merge_pause_event.clear()
-        merge_running = True
-        
-        self.update_ui_for_process(processing=True)
-        self.print_to_console("Starting PDF merge process...", "info")
-        
-        merge_thread = threading.Thread(target=self._merge_pdfs_threaded, daemon=True)
-        merge_thread.start()
+        # The job snapshots the files and settings as they are now, before the password prompts
+        files, options = list(self.pdf_files), self._snapshot_options()
+        profile = self._take_profile_request()
+
+        def submit():
+            job = MergeJob(files, options)
+            job.profile = profile
+            job.passwords = self.pdf_passwords
+            running = len(self.job_queue.active_jobs())
+            if running >= self.job_queue.max_concurrent:
+                self.print_to_console(f"Queued merge job #{job.job_id} ({len(job.files)} file(s)); waiting for a free slot.", "info")
+            else:
+                self.print_to_console(f"Starting merge job #{job.job_id} ({len(job.files)} file(s))...", "info")
+            self.job_queue.submit(job)
 
-    def pause_merge(self):
-        """Pauses or resumes the merge process."""
-        global merge_paused
-        if not merge_running: return
-        merge_paused = not merge_paused
-        if merge_paused:
-            merge_pause_event.set()
-            self.pause_btn.config(text="▶")  # Resume icon when paused
-            self.print_to_console("Merge process paused.", "info")
-        else:
-            merge_pause_event.clear()
-            self.pause_btn.config(text="⏸")  # Pause icon when running
-            self.print_to_console("Merge process resumed.", "info")
+        self._ask_input_passwords(files, submit)
 
-    def stop_merge(self):
-        """Stops the merge process."""
-        if merge_running:
-            merge_stop_event.set()
-            self.print_to_console("Stopping merge process...", "info")
-
-    def _get_output_filepath(self, counter=None, extension=None):
-        """Generates a unique output filename, with an optional counter for splitting."""
-        # Use custom filename if provided, otherwise use default
-        if self.output_filename_var.get().strip():
-            base_filename = self.output_filename_var.get().strip()
-            # Remove extension if provided
-            base, _ = os.path.splitext(base_filename)
-        else:
-            base, _ = os.path.splitext(DEFAULT_OUTPUT_FILENAME)
-
-        # Determine extension based on output type
-        if extension is None:
-            output_type = self.output_file_type_var.get().lower()
-            extension_map = {
-                'pdf': '.pdf',
-                'odt': '.odt',
-                'docx': '.docx',
-                'txt': '.txt',
-                'rtf': '.rtf',
-                'epub': '.epub',
-                'md': '.md'
-            }
-            extension = extension_map.get(output_type, '.pdf')
-
-        # New: Handle numbered files for splitting
-        if counter is not None and counter > 1:
-            base = f"{base}{counter}"
+    def _ask_input_passwords(self, files, on_done, skip_note="it will be skipped"):
+        """
+        Asks for the password of each encrypted PDF in files that no known password opens,
+        then calls on_done on the Tk thread. The PDFs are probed on a background thread,
+        so adding a large batch doesn't freeze the window.
+        Passwords stay in memory (self.pdf_passwords) and are tried on the other files too.
+        skip_note is logged for a file whose password prompt is left empty.
+        """
+        files = list(files)
+
+        def probe():
+            locked = []
+            try:
+                locked = find_locked_pdfs(files, self.pdf_passwords)
+            finally:
+                self.master.after(0, lambda: self._prompt_pdf_passwords(locked, on_done, skip_note))
 
-        output_filepath = os.path.join(self.output_folder, f"{base}{extension}")
+        threading.Thread(target=probe, daemon=True).start()
 
-        # Ensure the first file is also unique if it exists
-        if counter is None or counter == 1:
-            path_template = os.path.join(self.output_folder, base)
-            file_counter = 1
-            while os.path.exists(output_filepath):
-                file_counter += 1
-                output_filepath = f"{path_template}{file_counter}{extension}"
+    def _prompt_pdf_passwords(self, locked, on_done, skip_note):
+        """Prompts for the password of each locked PDF, then calls on_done."""
+        for path in locked:
+            try:
+                with fitz.open(path) as doc:
+                    # A password entered for an earlier file may open this one too
+                    if self.pdf_passwords.authenticate(doc, path):
+                        continue
+                    name = os.path.basename(path)
+                    while True:
+                        password = simpledialog.askstring(
+                            "PDF Password",
+                            f"{name} is encrypted.\n\nEnter its password (kept in memory for this session only; "
+                            "leave empty to skip):",
+                            show="*"
+                        )
+                        if not password:
+                            self.print_to_console(f"[DECRYPT] No password for {name}; {skip_note}.", "warning")
+                            break
+                        if doc.authenticate(password):
+                            self.pdf_passwords.set(path, password)
+                            # Statements often share one password: try it on the next files first
+                            self.pdf_passwords.add_common(password)
+                            break
+                        messagebox.showerror("Wrong Password", f"The password for {name} is incorrect.")
+            except FITZ_OPEN_ERRORS:
+                # Unreadable files are reported when the job processes them
+                continue
+        on_done()
+
+    def _take_profile_request(self):
+        """Returns True once if "Profile Next Run" is set, and clears the setting."""
+        if not self.profile_next_run_var.get():
+            return False
+        self.profile_next_run_var.set(False)
+        self.save_settings()
+        return True
+
+    def resume_merge(self):
+        """Queues the unfinished jobs recorded in the output folder's job journals."""
+        active_journals = {job.journal.path for job in self.job_queue.jobs if job.journal is not None and job.is_active}
+        journals = [journal for journal in MergeJournal.find_unfinished(self.output_folder) if journal.path not in active_journals]
+        if not journals:
+            messagebox.showinfo("Resume", f"No unfinished merge jobs found in:\n\n{self.output_folder}")
+            return
+
+        details = "\n".join(
+            f"- {journal.data.get('created', '?')}: {len(journal.data['completed'])}/{len(journal.files)} file(s) done"
+            for journal in journals
+        )
+        if not messagebox.askyesno("Resume", f"Resume {len(journals)} unfinished merge job(s)?\n\n{details}"):
+            return
+
+        profile = self._take_profile_request()
+
+        def submit():
+            for index, journal in enumerate(journals):
+                job = MergeJob(journal.files, journal.options, journal=journal)
+                job.profile = profile and index == 0  # One profile capture at a time
+                job.passwords = self.pdf_passwords
+                self.print_to_console(f"Resuming merge job #{job.job_id} from {os.path.basename(journal.path)} ({len(journal.data['completed'])}/{len(job.files)} file(s) already done)...", "info")
+                self.job_queue.submit(job)
 
-        return output_filepath
+        self._ask_input_passwords(list(dict.fromkeys(path for journal in journals for path in journal.files)), submit)
+
+    def pause_merge(self):
+        """Pauses or resumes the selected jobs (or all jobs if none are selected)."""
+        targets = self._target_jobs()
+        if not targets: return
+        if all(job.status == "paused" for job in targets):
+            for job in targets:
+                job.resume()
+                self.print_to_console(f"Merge job #{job.job_id} resumed.", "info")
+        else:
+            for job in targets:
+                if job.status == "running":
+                    job.pause()
+                    self.print_to_console(f"Merge job #{job.job_id} paused.", "info")
+        self._refresh_jobs_list()
+
+    def stop_merge(self):
+        """Stops the selected jobs (or all jobs if none are selected)."""
+        for job in self._target_jobs():
+            job.stop()
+            self.print_to_console(f"Stopping merge job #{job.job_id}...", "info")
+        self._refresh_jobs_list()
 
     def _scrub_pii_from_doc(self, doc):
         """
@@ -1874,7 +5360,7 @@ startxref
 
         pii_patterns = {
             "FULL_NAME": r'\b[A-Z]{4,}\s[A-Z]{4,}\b',
-            "STREET_ADDRESS": r'\b\d{1,5}\s(?:[A-Z0-9]+\s?)+(?:STREET|ST|AVENUE|AVE|ROAD|RD|LANE|LN|DRIVE|DR|COURT|CT|PLACE|PL|BOULEVARD|BLVD)\b',
+            "STREET_ADDRESS": r'\b\d{1,5}\s[A-Z0-9]+(?:\s[A-Z0-9]+)*\s?(?:STREET|ST|AVENUE|AVE|ROAD|RD|LANE|LN|DRIVE|DR|COURT|CT|PLACE|PL|BOULEVARD|BLVD)\b',
             "CITY_STATE_ZIP": r'\b[A-Z\s]+,\s[A-Z]{2}\s\d{5}(?:-\d{4})?\b',
             "ACCOUNT_NUMBER": r'\b\d{5}-\d{5}(?:-\d)?\b',
             "ID_NUMBER": r'\b\d{8,19}\b',
@@ -2022,35 +5508,6 @@ startxref
             self.print_to_console(f"    - Error converting {os.path.basename(pdf_path)} to markdown: {e}", "error")
             return None
 
-    def _scrub_pii_from_text(self, text):
-        """Scrubs PII from text content using regex patterns."""
-        try:
-            # Apply custom string removal
-            custom_strings_raw = self.custom_pii_var.get()
-            if custom_strings_raw:
-                custom_strings = [s.strip() for s in custom_strings_raw.split(',') if s.strip()]
-                for custom_string in custom_strings:
-                    text = text.replace(custom_string, "[REDACTED]")
-            
-            # Apply PII pattern removal
-            pii_patterns = {
-                "FULL_NAME": r'\b[A-Z]{4,}\s[A-Z]{4,}\b',
-                "STREET_ADDRESS": r'\b\d{1,5}\s(?:[A-Z0-9]+\s?)+(?:STREET|ST|AVENUE|AVE|ROAD|RD|LANE|LN|DRIVE|DR|COURT|CT|PLACE|PL|BOULEVARD|BLVD)\b',
-                "CITY_STATE_ZIP": r'\b[A-Z\s]+,\s[A-Z]{2}\s\d{5}(?:-\d{4})?\b',
-                "ACCOUNT_NUMBER": r'\b\d{5}-\d{5}(?:-\d)?\b',
-                "ID_NUMBER": r'\b\d{8,19}\b',
-                "EMAIL": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            }
-            
-            for pii_type, pattern in pii_patterns.items():
-                text = re.sub(pattern, "[REDACTED]", text, flags=re.IGNORECASE)
-            
-            return text
-            
-        except Exception as e:
-            self.print_to_console(f"    - Error scrubbing PII from text: {e}", "error")
-            return text
-
     def _convert_pdf_to_markdown_main_thread(self, pdf_path):
         """Converts a PDF file to markdown using marker-pdf library with proper GPU support"""
         try:
@@ -2227,284 +5684,334 @@ startxref
             self.print_to_console(f"    - Error converting {os.path.basename(pdf_path)} to markdown: {e}", "error")
             return None
 
-    def _merge_pdfs_threaded(self):
-        """The core multi-format file processing and merging logic that runs in a thread."""
-        global merge_running, merge_paused
-
-        try:
-            # --- Stage 1: Extract text from all files ---
-            total_files = len(self.pdf_files)
-            merged_text = ""
-
-            for i, file_path in enumerate(self.pdf_files):
-                if merge_stop_event.is_set(): break
-                while merge_pause_event.is_set(): time.sleep(0.1)
-
-                self.print_to_console(f"Processing '{os.path.basename(file_path)}' ({i+1}/{total_files})...", "progress")
-
-                try:
-                    # Extract text from file
-                    text = self._extract_text_from_file(file_path)
-
-                    # Apply text processing options
-                    if self.remove_timestamps_var.get():
-                        timestamp_regex = r'\[(?:(?:\d{2}:)?\d{2}:\d{2}\.\d{3})\s*-->\s*(?:(?:\d{2}:)?\d{2}:\d{2}\.\d{3})\]\s*'
-                        text = re.sub(timestamp_regex, '', text)
+    def _job_logger(self, job):
+        """Returns a log callback that prefixes console messages with the job number."""
+        return lambda message, tag=None: self.print_to_console(f"[Job {job.job_id}] {message}", tag)
 
-                    # Apply PII scrubbing
-                    if self.remove_pii_var.get():
-                        text = self._scrub_pii_from_text(text)
+    def _merge_pdfs_threaded(self, job):
+        """The core multi-format file processing and merging logic that runs in a job thread."""
+        if job.profile:
+            job.profile = False
+            return self._merge_profiled(job)
 
-                    # Add to merged text
-                    merged_text += text + "\n\n"
+        log = self._job_logger(job)
+        saved_files = []
+        engine = None
+        status = "done"
 
-                except Exception as e:
-                    self.print_to_console(f"  Error processing '{os.path.basename(file_path)}': {e}. Skipping.", "error")
-                    continue
+        try:
+            engine = MergeEngine(job.options, log=log, token=job.token, passwords=job.passwords)
+            if job.journal is None:
+                job.journal = MergeJournal.create(job.files, job.options)
+            journal = job.journal
 
-                progress_percent = int(((i + 1) / total_files) * 100)
-                self.print_to_console(f"  Processing progress: {progress_percent}%", "progress")
+            # --- Stage 1: Extract text from all files ---
+            total_files = len(job.files)
+            texts = {}  # file index -> processed text
+            pending = []  # (file index, path) still to process
+            done = 0
+
+            for i, file_path in enumerate(job.files):
+                # Files completed by an earlier run are restored from the journal
+                if journal.is_completed(i):
+                    text = journal.load_text(i)
+                    if text is not None:
+                        texts[i] = text
+                        done += 1
+                        log(f"Restored '{os.path.basename(file_path)}' ({i+1}/{total_files}) from checkpoint.", "info")
+                        continue
+                    if "error" in journal.data["completed"][str(i)]:
+                        done += 1
+                        continue
+                pending.append((i, file_path))
+            job.progress = int(done / total_files * 100)
+
+            # Extract text and apply timestamp/PII options, in worker processes if configured.
+            # Blocks while paused and raises MergeCancelled when stopped.
+            results = engine.process_files([file_path for _, file_path in pending])
+            for (i, file_path), (_, text, error) in zip(pending, results):
+                done += 1
+                if error is not None:
+                    log(f"  Error processing '{os.path.basename(file_path)}': {error}. Skipping.", "error")
+                    journal.record_failed(i, file_path, error)
+                else:
+                    texts[i] = text
+                    journal.record_file(i, file_path, text)
 
-            if merge_stop_event.is_set():
-                self.print_to_console("Process stopped during file processing.", "warning")
-                raise SystemExit()
+                    progress_percent = int(done / total_files * 100)
+                    log(f"  Processing progress: {progress_percent}%", "progress")
+                    job.progress = progress_percent
+                    self._on_job_changed(job)
 
+            merged_text, sections = join_texts((job.files[i], texts[i]) for i in sorted(texts))
             if not merged_text.strip():
-                self.print_to_console("No content was successfully processed to merge.", "warning")
-                raise SystemExit()
+                log("No content was successfully processed to merge.", "warning")
+                journal.finish()
+                return saved_files
 
-            self.print_to_console("All files processed. Starting final merge...", "progress")
+            log("All files processed. Starting final merge...", "progress")
 
             # --- Stage 2: Generate output file(s) ---
-            saved_files = []
-
-            if self.split_by_words_var.get():
-                # Split by words
-                try:
-                    words_per_file = int(self.split_word_count_var.get())
-                except ValueError:
-                    words_per_file = 10000
-                    self.print_to_console(f"Invalid word count, using default: {words_per_file}", "warning")
-
-                words = merged_text.split()
-                file_counter = 1
-                while words:
-                    if merge_stop_event.is_set(): break
-
-                    chunk_words = words[:words_per_file]
-                    words = words[words_per_file:]
-                    chunk_text = ' '.join(chunk_words)
-
-                    output_filepath = self._get_output_filepath(counter=file_counter)
-                    self._generate_output_file(chunk_text, output_filepath)
-                    saved_files.append(output_filepath)
-                    self.print_to_console(f"Saved part {file_counter}: {os.path.basename(output_filepath)}", "success")
-                    file_counter += 1
-            else:
-                # Standard merging (single file)
-                output_filepath = self._get_output_filepath()
-                self._generate_output_file(merged_text, output_filepath)
-                saved_files.append(output_filepath)
-                self.print_to_console(f"Merge completed successfully: {os.path.basename(output_filepath)}", "success")
+            saved_files = engine.write_outputs(merged_text, journal=journal, sections=sections)
+            journal.finish()
 
             # --- Generate Markdown if output type is MD and advanced mode selected ---
-            if self.output_file_type_var.get() == "MD" and self.markdown_type_var.get() == "advanced" and saved_files:
-                self.print_to_console("Advanced markdown conversion not yet implemented for multi-format merging.", "warning")
+            if job.options.output_file_type == "MD" and job.options.markdown_type == "advanced" and saved_files:
+                log("Advanced markdown conversion not yet implemented for multi-format merging.", "warning")
 
-        except SystemExit: # Graceful exit on stop
-             self.print_to_console("Merge process was stopped by user. No file saved.", "info")
+        except MergeCancelled: # Graceful exit on stop
+             status = "stopped"
+             log("Merge process was stopped by user. Progress was saved to the job journal; click Resume to continue.", "info")
         except Exception as e:
-            self.print_to_console(f"An unexpected error occurred during the merge process: {e}", "error")
+            status = "failed"
+            log(f"An unexpected error occurred during the merge process: {e}", "error")
             import traceback
             traceback.print_exc()
+            raise
+        finally:
+            if engine is not None:
+                self._write_run_report(job, engine, status, saved_files, log)
+                engine.close()
+
+        return saved_files
+
+    def _merge_profiled(self, job):
+        """Runs a merge job under the profiler and saves the profile and a hot-function summary."""
+        log = self._job_logger(job)
+        base, _ = _output_base_and_extension(job.options)
+        capture = ProfileCapture(job.options.output_folder, base)
+        if not capture.start():
+            log("Another profiler is already running; running this job without profiling.", "warning")
+            return self._merge_pdfs_threaded(job)
+
+        log("Profiling this merge job...", "info")
+        if job.options.workers > 1:
+            # cProfile only sees this thread: keep the extraction in-process so it shows up in the profile
+            log("Profiling runs the extraction in this process (workers = 1).", "info")
+            job.options = replace(job.options, workers=1)
+        try:
+            return self._merge_pdfs_threaded(job)
         finally:
-            merge_running = False
-            merge_paused = False
-            self.master.after(0, lambda: self.update_ui_for_process(processing=False))
+            try:
+                capture.stop()
+            except Exception as e:
+                log(f"Could not save profile: {e}", "warning")
+            else:
+                log(f"Profile saved: {os.path.basename(capture.profile_path)} (summary: {os.path.basename(capture.summary_path)})", "success")
+                for own, cumulative, calls, function in capture.hot_functions[:5]:
+                    log(f"  {own:.3f}s own, {cumulative:.3f}s total, {calls} calls: {function}", "info")
+
+    def _write_run_report(self, job, engine, status, saved_files, log):
+        """Writes the job's stage timings to a JSON run report in the output folder."""
+        try:
+            base, _ = engine._output_base_and_extension()
+            report_path = engine.telemetry.write_report(
+                job.options.output_folder, base,
+                job_id=job.job_id, status=status, options=persistable_options(job.options),
+                files_total=len(job.files), outputs=saved_files)
+        except Exception as e:
+            log(f"Could not write run report: {e}", "warning")
+            return
+        for name, stage in engine.telemetry.stage_summary().items():
+            log(f"  {name}: {stage['wall_seconds']:.3f}s wall, {stage['cpu_seconds']:.3f}s CPU, "
+                f"{stage['bytes'] / 1048576:.2f} MB, {stage['words']} words", "debug")
+            if "rss_peak_mb" in stage:
+                log(f"  {name}: peak memory {stage['rss_peak_mb']:.1f} MB RSS", "info")
+        log(f"Run report saved: {os.path.basename(report_path)}", "info")
 
     def _merge_standard(self, temp_files):
         """Merges all temp files into a single output PDF. Returns list of saved PDF paths."""
-        final_merged_doc = fitz.open()
-        for temp_path in temp_files:
-            try:
-                with fitz.open(temp_path) as temp_doc:
-                    final_merged_doc.insert_pdf(temp_doc)
-            except Exception as e:
-                self.print_to_console(f"Could not merge temp file {os.path.basename(temp_path)}: {e}", "error")
-
-        saved_pdfs = []
-        if len(final_merged_doc) > 0:
-            output_filepath = self._get_output_filepath()
-            final_merged_doc.save(output_filepath)
-            self.print_to_console(f"Successfully merged PDFs to: {output_filepath}", "success")
-            saved_pdfs.append(output_filepath)
-        else:
-            self.print_to_console("Final document is empty after merge attempts.", "warning")
+        # The engine holds the output name reservation until the file is written
+        with self._create_engine() as engine:
+            final_merged_doc = fitz.open()
+            for temp_path in temp_files:
+                try:
+                    with fitz.open(temp_path) as temp_doc:
+                        final_merged_doc.insert_pdf(temp_doc)
+                except Exception as e:
+                    self.print_to_console(f"Could not merge temp file {os.path.basename(temp_path)}: {e}", "error")
+
+            saved_pdfs = []
+            if len(final_merged_doc) > 0:
+                output_filepath = engine.get_output_filepath()
+                final_merged_doc.save(output_filepath)
+                self.print_to_console(f"Successfully merged PDFs to: {output_filepath}", "success")
+                saved_pdfs.append(output_filepath)
+            else:
+                self.print_to_console("Final document is empty after merge attempts.", "warning")
 
-        final_merged_doc.close()
-        return saved_pdfs
+            final_merged_doc.close()
+            return saved_pdfs
 
-    def _merge_with_splitting(self, temp_files):
+    def _merge_with_splitting(self, temp_files, stop_event=None):
         """Merges temp files into multiple PDFs, split by word count. Returns list of saved PDF paths."""
-        try:
-            word_limit = int(self.split_word_count_var.get())
-            self.print_to_console(f"Splitting output into files of approximately {word_limit} words.", "info")
-        except ValueError:
-            self.print_to_console("Invalid word count for splitting. Aborting.", "error")
-            return []
+        # The engine holds the output name reservation until the file is written
+        with self._create_engine() as engine:
+            stop_event = stop_event or threading.Event()
+            try:
+                word_limit = int(self.split_word_count_var.get())
+                self.print_to_console(f"Splitting output into files of approximately {word_limit} words.", "info")
+            except ValueError:
+                self.print_to_console("Invalid word count for splitting. Aborting.", "error")
+                return []
             
-        output_doc = fitz.open()
-        current_word_count = 0
-        file_counter = 1
-        saved_pdfs = []
+            output_doc = fitz.open()
+            current_word_count = 0
+            file_counter = 1
+            saved_pdfs = []
 
-        for temp_path in temp_files:
-            if merge_stop_event.is_set(): break
-            try:
-                with fitz.open(temp_path) as temp_doc:
-                    for page in temp_doc:
-                        if merge_stop_event.is_set(): break
-                        page_text = page.get_text("text")
-                        page_word_count = self._count_words(page_text)
+            for temp_path in temp_files:
+                if stop_event.is_set(): break
+                try:
+                    with fitz.open(temp_path) as temp_doc:
+                        for page in temp_doc:
+                            if stop_event.is_set(): break
+                            page_text = page.get_text("text")
+                            page_word_count = self._count_words(page_text)
                         
-                        # If adding this page exceeds the limit, save the current doc first
-                        if current_word_count + page_word_count > word_limit and current_word_count > 0:
-                            output_filepath = self._get_output_filepath(file_counter)
-                            output_doc.save(output_filepath)
-                            self.print_to_console(f"Saved split file: {os.path.basename(output_filepath)} ({current_word_count} words)", "success")
-                            saved_pdfs.append(output_filepath)
+                            # If adding this page exceeds the limit, save the current doc first
+                            if current_word_count + page_word_count > word_limit and current_word_count > 0:
+                                output_filepath = engine.get_output_filepath(counter=file_counter)
+                                output_doc.save(output_filepath)
+                                self.print_to_console(f"Saved split file: {os.path.basename(output_filepath)} ({current_word_count} words)", "success")
+                                saved_pdfs.append(output_filepath)
                             
-                            output_doc.close()
-                            output_doc = fitz.open()
-                            current_word_count = 0
-                            file_counter += 1
+                                output_doc.close()
+                                output_doc = fitz.open()
+                                current_word_count = 0
+                                file_counter += 1
                         
-                        # Add the page to the current output doc
-                        output_doc.insert_pdf(temp_doc, from_page=page.number, to_page=page.number)
-                        current_word_count += page_word_count
-            except Exception as e:
-                self.print_to_console(f"Error during splitting of {os.path.basename(temp_path)}: {e}", "error")
+                            # Add the page to the current output doc
+                            output_doc.insert_pdf(temp_doc, from_page=page.number, to_page=page.number)
+                            current_word_count += page_word_count
+                except Exception as e:
+                    self.print_to_console(f"Error during splitting of {os.path.basename(temp_path)}: {e}", "error")
 
-        # Save the last remaining document if it has content
-        if not merge_stop_event.is_set() and len(output_doc) > 0:
-            output_filepath = self._get_output_filepath(file_counter)
-            output_doc.save(output_filepath)
-            self.print_to_console(f"Saved final split file: {os.path.basename(output_filepath)} ({current_word_count} words)", "success")
-            saved_pdfs.append(output_filepath)
+            # Save the last remaining document if it has content
+            if not stop_event.is_set() and len(output_doc) > 0:
+                output_filepath = engine.get_output_filepath(counter=file_counter)
+                output_doc.save(output_filepath)
+                self.print_to_console(f"Saved final split file: {os.path.basename(output_filepath)} ({current_word_count} words)", "success")
+                saved_pdfs.append(output_filepath)
 
-        if saved_pdfs:
-            self.print_to_console(f"Successfully created {len(saved_pdfs)} split PDF files.", "success")
-        else:
-            self.print_to_console("No split files were generated.", "warning")
+            if saved_pdfs:
+                self.print_to_console(f"Successfully created {len(saved_pdfs)} split PDF files.", "success")
+            else:
+                self.print_to_console("No split files were generated.", "warning")
             
-        output_doc.close()
-        return saved_pdfs
+            output_doc.close()
+            return saved_pdfs
 
     def _generate_markdown_output_main_thread(self):
         """Generates a combined markdown file from all PDF files - runs in main thread."""
-        try:
-            self.print_to_console("Starting markdown generation in main thread...", "progress")
+        # The engine holds the output name reservation until the file is written
+        with self._create_engine() as engine:
+            try:
+                self.print_to_console("Starting markdown generation in main thread...", "progress")
             
-            combined_markdown = ""
-            total_files = len(self.pdf_files)
+                combined_markdown = ""
+                total_files = len(self.pdf_files)
             
-            for i, pdf_path in enumerate(self.pdf_files):
-                self.print_to_console(f"Converting to markdown: {os.path.basename(pdf_path)} ({i+1}/{total_files})", "progress")
+                for i, pdf_path in enumerate(self.pdf_files):
+                    self.print_to_console(f"Converting to markdown: {os.path.basename(pdf_path)} ({i+1}/{total_files})", "progress")
                 
-                # Add file header
-                filename = os.path.basename(pdf_path)
-                combined_markdown += f"\n\n# {filename}\n\n"
-                combined_markdown += f"*Source: {filename}*\n\n"
-                combined_markdown += "---\n\n"
+                    # Add file header
+                    filename = os.path.basename(pdf_path)
+                    combined_markdown += f"\n\n# {filename}\n\n"
+                    combined_markdown += f"*Source: {filename}*\n\n"
+                    combined_markdown += "---\n\n"
                 
-                # Convert PDF to markdown (now in main thread)
-                markdown_content = self._convert_pdf_to_markdown_main_thread(pdf_path)
-                if markdown_content:
-                    combined_markdown += markdown_content
-                    combined_markdown += "\n\n"
-                else:
-                    combined_markdown += "*[Error: Could not convert this PDF to markdown]*\n\n"
+                    # Convert PDF to markdown (now in main thread)
+                    markdown_content = self._convert_pdf_to_markdown_main_thread(pdf_path)
+                    if markdown_content:
+                        combined_markdown += markdown_content
+                        combined_markdown += "\n\n"
+                    else:
+                        combined_markdown += "*[Error: Could not convert this PDF to markdown]*\n\n"
             
-            # Save combined markdown file
-            if combined_markdown.strip():
-                markdown_filepath = self._get_output_filepath(extension=".md")
+                # Save combined markdown file
+                if combined_markdown.strip():
+                    markdown_filepath = engine.get_output_filepath(extension=".md")
                 
-                try:
-                    with open(markdown_filepath, 'w', encoding='utf-8') as f:
-                        # Add document header
-                        f.write("# Combined PDF Content\n\n")
-                        f.write(f"*Generated from {len(self.pdf_files)} PDF files*\n\n")
-                        f.write("---\n")
-                        f.write(combined_markdown)
+                    try:
+                        with open(markdown_filepath, 'w', encoding='utf-8') as f:
+                            # Add document header
+                            f.write("# Combined PDF Content\n\n")
+                            f.write(f"*Generated from {len(self.pdf_files)} PDF files*\n\n")
+                            f.write("---\n")
+                            f.write(combined_markdown)
                     
-                    self.print_to_console(f"[OK] Successfully generated markdown: {os.path.basename(markdown_filepath)}", "success")
+                        self.print_to_console(f"[OK] Successfully generated markdown: {os.path.basename(markdown_filepath)}", "success")
                     
-                except Exception as e:
-                    self.print_to_console(f"[ERROR] Failed to save markdown file: {e}", "error")
-            else:
-                self.print_to_console("[WARNING] No markdown content generated.", "warning")
+                    except Exception as e:
+                        self.print_to_console(f"[ERROR] Failed to save markdown file: {e}", "error")
+                else:
+                    self.print_to_console("[WARNING] No markdown content generated.", "warning")
                 
-        except Exception as e:
-            self.print_to_console(f"[ERROR] Unexpected error during markdown generation: {e}", "error")
+            except Exception as e:
+                self.print_to_console(f"[ERROR] Unexpected error during markdown generation: {e}", "error")
 
-    def _generate_markdown_output(self):
+    def _generate_markdown_output(self, stop_event=None):
         """Generates a combined markdown file from all PDF files - runs in background thread."""
-        try:
-            self.print_to_console("Starting markdown generation...", "progress")
+        # The engine holds the output name reservation until the file is written
+        with self._create_engine() as engine:
+            stop_event = stop_event or threading.Event()
+            try:
+                self.print_to_console("Starting markdown generation...", "progress")
             
-            combined_markdown = ""
-            total_files = len(self.pdf_files)
+                combined_markdown = ""
+                total_files = len(self.pdf_files)
             
-            for i, pdf_path in enumerate(self.pdf_files):
-                if merge_stop_event.is_set():
-                    break
+                for i, pdf_path in enumerate(self.pdf_files):
+                    if stop_event.is_set():
+                        break
                     
-                self.print_to_console(f"Converting to markdown: {os.path.basename(pdf_path)} ({i+1}/{total_files})", "progress")
+                    self.print_to_console(f"Converting to markdown: {os.path.basename(pdf_path)} ({i+1}/{total_files})", "progress")
                 
-                # Add file header
-                filename = os.path.basename(pdf_path)
-                combined_markdown += f"\n\n# {filename}\n\n"
-                combined_markdown += f"*Source: {filename}*\n\n"
-                combined_markdown += "---\n\n"
+                    # Add file header
+                    filename = os.path.basename(pdf_path)
+                    combined_markdown += f"\n\n# {filename}\n\n"
+                    combined_markdown += f"*Source: {filename}*\n\n"
+                    combined_markdown += "---\n\n"
                 
-                # Convert PDF to markdown (now with proper thread-safe output capture)
-                markdown_content = self._convert_pdf_to_markdown_threaded(pdf_path)
-                if markdown_content:
-                    combined_markdown += markdown_content
-                    combined_markdown += "\n\n"
-                else:
-                    combined_markdown += "*[Error: Could not convert this PDF to markdown]*\n\n"
+                    # Convert PDF to markdown (now with proper thread-safe output capture)
+                    markdown_content = self._convert_pdf_to_markdown_threaded(pdf_path)
+                    if markdown_content:
+                        combined_markdown += markdown_content
+                        combined_markdown += "\n\n"
+                    else:
+                        combined_markdown += "*[Error: Could not convert this PDF to markdown]*\n\n"
             
-            if merge_stop_event.is_set():
-                self.print_to_console("Markdown generation stopped by user.", "warning")
-                return
+                if stop_event.is_set():
+                    self.print_to_console("Markdown generation stopped by user.", "warning")
+                    return
             
-            # Save combined markdown file
-            if combined_markdown.strip():
-                markdown_filepath = self._get_output_filepath(extension=".md")
+                # Save combined markdown file
+                if combined_markdown.strip():
+                    markdown_filepath = engine.get_output_filepath(extension=".md")
                 
-                try:
-                    with open(markdown_filepath, 'w', encoding='utf-8') as f:
-                        # Add document header
-                        f.write("# Combined PDF Content\n\n")
-                        f.write(f"*Generated from {len(self.pdf_files)} PDF files*\n\n")
-                        f.write("---\n")
-                        f.write(combined_markdown)
+                    try:
+                        with open(markdown_filepath, 'w', encoding='utf-8') as f:
+                            # Add document header
+                            f.write("# Combined PDF Content\n\n")
+                            f.write(f"*Generated from {len(self.pdf_files)} PDF files*\n\n")
+                            f.write("---\n")
+                            f.write(combined_markdown)
                     
-                    self.print_to_console(f"[OK] Successfully generated markdown: {os.path.basename(markdown_filepath)}", "success")
+                        self.print_to_console(f"[OK] Successfully generated markdown: {os.path.basename(markdown_filepath)}", "success")
                     
-                except Exception as e:
-                    self.print_to_console(f"[ERROR] Failed to save markdown file: {e}", "error")
-            else:
-                self.print_to_console("[WARNING] No markdown content generated.", "warning")
+                    except Exception as e:
+                        self.print_to_console(f"[ERROR] Failed to save markdown file: {e}", "error")
+                else:
+                    self.print_to_console("[WARNING] No markdown content generated.", "warning")
                 
-        except Exception as e:
-            self.print_to_console(f"[ERROR] Unexpected error during markdown generation: {e}", "error")
+            except Exception as e:
+                self.print_to_console(f"[ERROR] Unexpected error during markdown generation: {e}", "error")
 
-    def _convert_merged_pdf_to_markdown(self, pdf_path):
+    def _convert_merged_pdf_to_markdown(self, pdf_path, stop_event=None):
         """Converts a single merged PDF file to markdown. Much more efficient than converting each original file."""
         try:
-            if merge_stop_event.is_set():
+            if stop_event is not None and stop_event.is_set():
                 return
             
             pdf_basename = os.path.basename(pdf_path)
@@ -2588,20 +6095,162 @@ def main():
     # CRITICAL: Freeze support for multiprocessing in frozen executables
     # This prevents the "process pool terminated" error and multiple instances spawning
     multiprocessing.freeze_support()
-    
+
+    if tk is None:
+        sys.exit("The GUI needs tkinter, which is not installed. Pass input files to run headless (see --help).")
+
     root = tk.Tk()
     app = PDFMergerApp(root)
     
     def on_closing():
-        if merge_running:
-            merge_stop_event.set()
-            if merge_thread:
-                merge_thread.join(timeout=2) # Give thread time to stop
+        if app.folder_watcher:
+            app.folder_watcher.token.stop()
+        if app.benchmark_token:
+            app.benchmark_token.stop()
+        if app.decrypt_token:
+            app.decrypt_token.stop()
+        app.job_queue.stop_all(timeout=2) # Give job threads time to stop
         app.save_settings() # Ensure settings are saved on close
+        if app._console_drain_id:
+            root.after_cancel(app._console_drain_id)
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
     root.mainloop()
 
+def _cli_log(message, tag=None):
+    """Log callback for headless runs: writes console messages to stderr."""
+    print(message, file=sys.stderr, flush=True)
+
+
+def _expand_cli_inputs(patterns):
+    """Expands file paths and glob patterns into an ordered, de-duplicated list of supported files."""
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches and os.path.isfile(pattern):
+            matches = [pattern]
+        for path in matches:
+            path = os.path.abspath(path)
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in SUPPORTED_INPUT_EXTENSIONS and path not in files:
+                files.append(path)
+    return files
+
+
+def cli_main(argv=None):
+    """
+    Headless command-line entry point. Runs the same merge pipeline as the GUI
+    and prints a JSON summary to stdout. Returns the process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pdf_merger_app",
+        description="Merge documents headlessly (PDF, ODT, DOCX, TXT, RTF, EPUB, MD) with optional PII scrubbing."
+    )
+    parser.add_argument("inputs", nargs="+", help="Input files or glob patterns (e.g. 'scans/**/*.pdf').")
+    parser.add_argument("-o", "--output-folder", default=os.getcwd(), help="Folder for the merged output (default: current directory).")
+    parser.add_argument("-f", "--format", default="PDF", type=str.upper, choices=[t.upper() for t in OUTPUT_EXTENSIONS], help="Output file type (default: PDF).")
+    parser.add_argument("-n", "--output-name", default="", help="Output filename without extension (default: MergedPDFs).")
+    parser.add_argument("--split-words", type=int, default=0, metavar="N", help="Split the output into files of N words each.")
+    parser.add_argument("--remove-pii", action="store_true", help="Redact PII (names, addresses, account numbers, e-mails).")
+    parser.add_argument("--custom-pii", default="", help="Comma-separated custom strings to redact (implies --remove-pii).")
+    parser.add_argument("--remove-timestamps", action="store_true", help="Remove transcript-style timestamps.")
+    parser.add_argument("--epub-chapter-chars", type=int, default=EPUB_CHAPTER_CHARS, metavar="N", help=f"Start a new EPUB chapter after about N characters (default: {EPUB_CHAPTER_CHARS}).")
+    parser.add_argument("--password", action="append", default=[], metavar="PASSWORD", help="Password to try on encrypted PDFs (repeatable). Used in memory only.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of parallel worker processes for extraction (default: 1).")
+    parser.add_argument("--profile", action="store_true", help="Profile the run and save the profile and a hot-function summary to the output folder. Implies --jobs 1.")
+    parser.add_argument("--memory-sampling", action="store_true", help="Record peak memory per stage in the JSON summary.")
+    parser.add_argument("--trace-allocations", action="store_true", help="Also record tracemalloc peaks and top allocation sites (slow).")
+    parser.add_argument("--memory-budget", type=int, default=0, metavar="MB", help="Warn when memory use nears MB, and keep the extraction cache within a quarter of it.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr.")
+    args = parser.parse_args(argv)
+
+    if args.split_words < 0:
+        parser.error("--split-words must be a positive number")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.epub_chapter_chars < 1:
+        parser.error("--epub-chapter-chars must be a positive number")
+
+    log = _cli_log if args.verbose else _null_log
+    options = MergeOptions(
+        output_folder=os.path.abspath(args.output_folder),
+        output_file_type=args.format,
+        output_filename=args.output_name,
+        remove_timestamps=args.remove_timestamps,
+        remove_pii=args.remove_pii or bool(args.custom_pii.strip()),
+        custom_pii_strings=args.custom_pii,
+        split_by_words=args.split_words > 0,
+        split_word_count=args.split_words or 10000,
+        memory_sampling=args.memory_sampling,
+        trace_allocations=args.trace_allocations,
+        memory_budget_mb=args.memory_budget,
+        # cProfile only sees the main process, so profiled runs extract in-process
+        workers=1 if args.profile else args.jobs,
+        epub_chapter_chars=args.epub_chapter_chars,
+    )
+    engine = MergeEngine(options, log=log, passwords=PasswordStore(args.password))
+
+    capture = None
+    if args.profile:
+        os.makedirs(options.output_folder, exist_ok=True)
+        capture = ProfileCapture(options.output_folder, _output_base_and_extension(options)[0])
+        capture.start()
+
+    start_time = time.time()
+    files = _expand_cli_inputs(args.inputs)
+    summary = {
+        "status": "ok",
+        "options": persistable_options(options),
+        "jobs": args.jobs,
+        "files_total": len(files),
+        "files_processed": 0,
+        "failed_files": [],
+        "word_count": 0,
+        "outputs": [],
+        "elapsed_seconds": 0.0,
+    }
+
+    texts = []
+    if files:
+        os.makedirs(options.output_folder, exist_ok=True)
+        # Results arrive in input order, so the merged output matches the argument order
+        for file_path, text, error in engine.process_files(files):
+            if error is not None:
+                log(f"  Error processing '{os.path.basename(file_path)}': {error}. Skipping.", "error")
+                summary["failed_files"].append({"file": file_path, "error": str(error)})
+                continue
+            texts.append((file_path, text))
+            summary["files_processed"] += 1
+
+    merged_text, sections = join_texts(texts)
+    if not merged_text.strip():
+        log("No content was successfully processed to merge.", "warning")
+        summary["status"] = "empty"
+    else:
+        try:
+            summary["outputs"] = engine.write_outputs(merged_text, sections=sections)
+            summary["word_count"] = count_words(merged_text)
+            if summary["failed_files"]:
+                summary["status"] = "partial"
+        except Exception as e:
+            log(f"An unexpected error occurred during the merge process: {e}", "error")
+            summary["status"] = "failed"
+            summary["error"] = str(e)
+
+    summary["elapsed_seconds"] = round(time.time() - start_time, 3)
+    summary["stages"] = engine.telemetry.stage_summary()
+    engine.close()
+    if capture:
+        capture.stop()
+        summary["profile"] = capture.profile_path
+    print(json.dumps(summary, indent=2))
+
+    # 0 = success, 1 = output written but some inputs failed, 2 = nothing written
+    return {"ok": 0, "partial": 1}.get(summary["status"], 2)
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        multiprocessing.freeze_support()
+        sys.exit(cli_main())
     main()
\ No newline at end of file
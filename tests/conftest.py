@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_merger_app  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_process_state():
+    """Keeps the process-wide extraction cache and output reservations from leaking between tests."""
+    pdf_merger_app._extracted_text_cache.clear()
+    yield
+    pdf_merger_app._extracted_text_cache.clear()
+    pdf_merger_app._reserved_output_paths.clear()
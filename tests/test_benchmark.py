@@ -0,0 +1,26 @@
+import benchmark
+from pdf_merger_app import count_words, make_synthetic_text
+
+
+def test_synthetic_text_is_deterministic_and_sized():
+    text = make_synthetic_text(1000, seed=3)
+    assert text == make_synthetic_text(1000, seed=3) != make_synthetic_text(1000, seed=4)
+    assert 900 <= count_words(text) <= 1300  # PII samples and timestamps add a few tokens
+
+
+def test_every_format_is_benchmarked(tmp_path):
+    report = benchmark.run_benchmarks(word_count=300, repeat=1, split_word_count=100, corpus_dir=str(tmp_path))
+    results = report["results"]
+    expected = [f"{stage}.{fmt}" for stage in ("extract", "generate") for fmt in benchmark.FORMATS]
+    assert set(expected + ["scrub_pii", "split_text"]) == set(results)
+    for name, entry in results.items():
+        assert "error" not in entry, name
+        assert entry["words"] > 0 and entry["seconds"] >= 0
+    assert sorted(path.name for path in tmp_path.glob("corpus.*")) == sorted(f"corpus.{fmt}" for fmt in benchmark.FORMATS)
+
+
+def test_compare_reports_regressions_beyond_the_tolerance():
+    report = {"results": {"fast": {"words_per_second": 90.0}, "slow": {"words_per_second": 70.0}, "new": {"words_per_second": 5.0}}}
+    baseline = {"results": {"fast": {"words_per_second": 100.0}, "slow": {"words_per_second": 100.0}}}
+    assert benchmark.compare(report, baseline, tolerance=0.2) == ["slow"]
+    assert report["results"]["fast"]["change"] == -0.1 and report["results"]["new"]["change"] is None
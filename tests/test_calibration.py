@@ -0,0 +1,25 @@
+import pytest
+
+import pdf_merger_app
+from pdf_merger_app import CancellationToken, MergeCancelled, calibrate_machine
+
+
+def test_calibration_measures_and_recommends(monkeypatch):
+    monkeypatch.setattr(pdf_merger_app.os, "cpu_count", lambda: 2)
+    messages = []
+    results = calibrate_machine(log=lambda message, tag=None: messages.append(message), sample_words=300)
+    assert results["cpu_count"] == 2
+    assert set(results["scaling_files_per_second"]) == {"1", "2"}
+    for key in ("pdf_generate_words_per_second", "extract_words_per_second", "pii_mb_per_second"):
+        assert results[key] > 0
+    assert results["recommended_workers"] in (1, 2)
+    assert 1 <= results["recommended_worker_chunk_size"] <= 64
+    assert results["recommended_max_concurrent_jobs"] == max(1, 2 // results["recommended_workers"])
+    assert any(message.startswith("[BENCH] 2 worker(s)") for message in messages)
+
+
+def test_calibration_can_be_cancelled():
+    token = CancellationToken()
+    token.stop()
+    with pytest.raises(MergeCancelled):
+        calibrate_machine(token=token, sample_words=100)
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import fitz
+import pytest
+
+from pdf_merger_app import CancellationToken, MergeCancelled, MergeEngine, MergeOptions
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for number in range(pages):
+        doc.new_page().insert_text((72, 72), f"page {number}")
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+class CountingToken(CancellationToken):
+    """Stops itself at the given checkpoint."""
+
+    def __init__(self, stop_at):
+        super().__init__()
+        self.stop_at = stop_at
+        self.checkpoints = 0
+
+    def checkpoint(self):
+        self.checkpoints += 1
+        if self.checkpoints == self.stop_at:
+            self.stop()
+        super().checkpoint()
+
+
+def test_checkpoint_blocks_while_paused_until_resumed():
+    token = CancellationToken()
+    token.pause()
+    passed = threading.Event()
+    thread = threading.Thread(target=lambda: (token.checkpoint(), passed.set()))
+    thread.start()
+    assert not passed.wait(0.2)
+    token.resume()
+    assert passed.wait(5)
+    thread.join(5)
+
+
+def test_stop_wakes_a_paused_checkpoint():
+    token = CancellationToken()
+    token.pause()
+    errors = []
+
+    def run():
+        try:
+            token.checkpoint()
+        except MergeCancelled:
+            errors.append("cancelled")
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.05)
+    token.stop()
+    thread.join(5)
+    assert errors == ["cancelled"]
+
+
+def test_wait_returns_early_when_stopped():
+    token = CancellationToken()
+    threading.Timer(0.05, token.stop).start()
+    started = time.monotonic()
+    assert token.wait(10) is True
+    assert time.monotonic() - started < 5
+
+
+def test_pdf_extraction_stops_within_a_page(tmp_path):
+    path = make_pdf(tmp_path / "long.pdf", pages=50)
+    token = CountingToken(stop_at=3)
+    with pytest.raises(MergeCancelled):
+        MergeEngine(MergeOptions(), token=token).extract_text(path)
+    assert token.checkpoints == 3
+
+
+def test_split_output_stops_between_parts(tmp_path):
+    token = CountingToken(stop_at=2)
+    engine = MergeEngine(MergeOptions(output_folder=str(tmp_path), output_file_type="TXT",
+                                      split_by_words=True, split_word_count=2), token=token)
+    with pytest.raises(MergeCancelled):
+        engine.write_outputs("one two three four five six seven eight")
+    engine.close()
+    # The first part is complete; no second part or temp file is left behind
+    assert [path.name for path in tmp_path.iterdir()] == ["MergedPDFs.txt"]
@@ -0,0 +1,134 @@
+import collections
+import threading
+
+import pdf_merger_app
+from pdf_merger_app import ConsoleHistory, PDFMergerApp
+
+
+class Var:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class Text:
+    """Records the calls the console makes on its Tk Text widget."""
+
+    def __init__(self):
+        self.lines = []
+        self.inserts = 0
+
+    def insert(self, index, *args):
+        self.inserts += 1
+        self.lines.extend(args[0::2])
+
+    def index(self, index):
+        return f"{len(self.lines) + 1}.0"
+
+    def delete(self, start, end=None):
+        del self.lines[:int(str(end).split(".")[0]) - 1]
+
+    def see(self, index):
+        pass
+
+
+class Master:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(delay)
+
+
+class App:
+    """The console parts of PDFMergerApp, without Tk."""
+
+    print_to_console = PDFMergerApp.print_to_console
+    _drain_console_queue = PDFMergerApp._drain_console_queue
+    _get_log_level_from_tag = PDFMergerApp._get_log_level_from_tag
+    _visible_levels = PDFMergerApp._visible_levels
+    _trim_console_display = PDFMergerApp._trim_console_display
+
+    def __init__(self, filter_level="All"):
+        self.master = Master()
+        self.console_queue = collections.deque()
+        self.console_history = ConsoleHistory()
+        self.console_output = Text()
+        self.console_visible_var = Var(True)
+        self.console_filter_level_var = Var(filter_level)
+
+
+def test_messages_from_many_threads_arrive_in_one_batch():
+    app = App()
+
+    def worker(number):
+        for index in range(200):
+            app.print_to_console(f"worker {number} message {index}", "info")
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    app._drain_console_queue()
+    assert app.console_output.inserts == 1
+    assert len(app.console_history) == 800
+    for number in range(4):
+        own = [line for line in app.console_output.lines if line.startswith(f"worker {number} ")]
+        assert own == [f"worker {number} message {index}\n" for index in range(200)]
+
+
+def test_backlog_beyond_one_batch_is_drained_on_the_next_tick(monkeypatch):
+    monkeypatch.setattr(pdf_merger_app, "CONSOLE_MAX_BATCH", 10)
+    app = App()
+    for index in range(25):
+        app.print_to_console(f"message {index}")
+    app._drain_console_queue()
+    assert len(app.console_history) == 10 and app.master.scheduled == [1]
+    app._drain_console_queue()
+    app._drain_console_queue()
+    assert len(app.console_history) == 25
+    assert app.master.scheduled[-1] == pdf_merger_app.CONSOLE_FLUSH_INTERVAL_MS
+
+
+def test_filtered_messages_are_kept_in_history_only(monkeypatch):
+    monkeypatch.setattr(pdf_merger_app, "CONSOLE_DISPLAY_LINES", 3)
+    app = App(filter_level="WARNING")
+    for index in range(5):
+        app.print_to_console(f"warning {index}", "warning")
+        app.print_to_console(f"info {index}", "info")
+    app._drain_console_queue()
+    assert len(app.console_history) == 10
+    assert app.console_output.lines == ["warning 2\n", "warning 3\n", "warning 4\n"]
+
+
+def test_history_evicts_the_oldest_entries_from_every_index():
+    history = ConsoleHistory(capacity=4)
+    for index, level in enumerate(["INFO", "ERROR", "INFO", "WARNING", "INFO", "ERROR"]):
+        history.append(f"message {index}", None, level)
+    assert len(history) == 4
+    assert [entry[1] for entry in history.tail()] == ["message 2", "message 3", "message 4", "message 5"]
+    assert [entry[1] for entry in history.tail(["ERROR"])] == ["message 5"]
+
+
+def test_tail_merges_levels_in_order_and_limits_to_the_newest():
+    history = ConsoleHistory()
+    for index, level in enumerate(["DEBUG", "INFO", "WARNING", "ERROR", "INFO", "WARNING", "CRITICAL"]):
+        history.append(f"message {index}", None, level)
+    assert [entry[1] for entry in history.tail(["WARNING", "ERROR", "CRITICAL"])] == \
+        ["message 2", "message 3", "message 5", "message 6"]
+    assert [entry[1] for entry in history.tail(["INFO", "WARNING"], limit=2)] == ["message 4", "message 5"]
+    assert history.tail(["UNKNOWN"]) == []
+
+
+def test_resize_keeps_the_newest_entries():
+    history = ConsoleHistory(capacity=10)
+    for index in range(10):
+        history.append(f"message {index}", None, "INFO" if index % 2 else "ERROR")
+    history.resize(3)
+    assert [entry[1] for entry in history.tail()] == ["message 7", "message 8", "message 9"]
+    assert [entry[1] for entry in history.tail(["ERROR"])] == ["message 8"]
+    history.append("message 10", None, "ERROR")
+    assert len(history) == 3
@@ -0,0 +1,39 @@
+import os
+
+import fitz
+import pytest
+
+from pdf_merger_app import PdfDecryptor
+
+
+def make_pdf(path, text="hello", user_pw=None):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    if user_pw:
+        doc.save(path, encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=user_pw, owner_pw="owner")
+    else:
+        doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_decrypts_in_input_order(tmp_path, workers):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    paths = [
+        make_pdf(tmp_path / "a" / "statement.pdf", "first", user_pw="pw"),
+        make_pdf(tmp_path / "b" / "statement.pdf", "second", user_pw="pw"),
+        make_pdf(tmp_path / "plain.pdf"),
+        make_pdf(tmp_path / "other.pdf", user_pw="different"),
+    ]
+    out = tmp_path / "out"
+    results = PdfDecryptor(str(out), password="pw", workers=workers).run(paths)
+
+    assert [result.status for result in results] == ["decrypted", "decrypted", "not_encrypted", "wrong_password"]
+    assert [os.path.basename(result.output) for result in results[:2]] == ["statement_decrypted.pdf", "statement_decrypted_1.pdf"]
+    for result, text in zip(results, ("first", "second")):
+        with fitz.open(result.output) as doc:
+            assert not doc.needs_pass
+            assert text in doc[0].get_text()
+    assert sorted(os.listdir(out)) == ["statement_decrypted.pdf", "statement_decrypted_1.pdf"]
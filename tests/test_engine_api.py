@@ -0,0 +1,41 @@
+import io
+
+import fitz
+import pytest
+
+from pdf_merger_app import MergeEngine, MergeOptions, OutputPart
+
+
+def pdf_bytes(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.mark.parametrize("source", [
+    ("scan.pdf", pdf_bytes("from a named pdf")),
+    pdf_bytes("from unnamed bytes"),
+    io.BytesIO(pdf_bytes("from a stream")),
+])
+def test_pdf_sources_without_paths(source):
+    expected = {bytes: "from unnamed bytes", tuple: "from a named pdf", io.BytesIO: "from a stream"}[type(source)]
+    assert expected in MergeEngine().extract_text(source)
+
+
+def test_text_formats_are_detected_from_the_name():
+    engine = MergeEngine()
+    assert engine.extract_text(("notes.md", io.BytesIO("# Title\nbody".encode("utf-8")))) == "# Title\nbody"
+    assert engine.extract_text(io.BytesIO(b"plain text"), name="notes.txt") == "plain text"
+
+
+def test_iter_parts_yields_in_memory_outputs_in_source_order(tmp_path):
+    sources = [("a.pdf", pdf_bytes("alpha one")), ("b.txt", b"bravo two three"), ("c.txt", b"charlie four")]
+    engine = MergeEngine(MergeOptions(output_folder=str(tmp_path), output_file_type="TXT",
+                                      split_by_words=True, split_word_count=3))
+    parts = list(engine.iter_parts(sources))
+    assert all(isinstance(part, OutputPart) for part in parts)
+    assert [part.number for part in parts] == [1, 2, 3]
+    assert b" ".join(part.data for part in parts).split() == b"alpha one bravo two three charlie four".split()
+    assert list(tmp_path.iterdir()) == []  # Nothing is written to disk
@@ -0,0 +1,128 @@
+import pytest
+
+import pdf_merger_app
+from pdf_merger_app import CancellationToken, EpubWriter, MergeCancelled, MergeEngine, MergeOptions, join_texts
+
+ebooklib = pytest.importorskip("ebooklib")
+from bs4 import BeautifulSoup  # noqa: E402
+from ebooklib import epub  # noqa: E402
+
+CHAPTERS = [
+    ("Opening", "<p>It was a <b>bright</b> cold day in April.</p><p>The clocks&nbsp;were striking thirteen.</p>"),
+    ("Middle", "<h2>Part two</h2><ul><li>First item</li><li>Second &amp; last</li></ul>"),
+    ("Ending", "<p>Café naïve — fin.</p><script>var hidden = 1;</script>"),
+]
+
+
+def make_epub(path, chapters=CHAPTERS):
+    book = epub.EpubBook()
+    book.set_identifier("test-book")
+    book.set_title("Test Book")
+    book.set_language("en")
+    items = []
+    for number, (title, body) in enumerate(chapters, 1):
+        item = epub.EpubHtml(title=title, file_name=f"chapter{number}.xhtml", lang="en")
+        item.content = f"<html><body><h1>{title}</h1>{body}</body></html>"
+        book.add_item(item)
+        items.append(item)
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.spine = items
+    epub.write_epub(str(path), book)
+    return str(path)
+
+
+def ebooklib_words(path):
+    """The text the removed ebooklib reader produced for the chapters, as words."""
+    book = epub.read_epub(path)
+    words = []
+    for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT):
+        if isinstance(item, epub.EpubNav):
+            continue
+        soup = BeautifulSoup(item.get_content(), "html.parser")
+        for element in soup(["script", "style"]):
+            element.decompose()
+        words.extend(soup.body.get_text().split())
+    return words
+
+
+def make_engine(token=None, **options):
+    return MergeEngine(MergeOptions(**options), token=token)
+
+
+def test_chapters_match_ebooklib(tmp_path):
+    path = make_epub(tmp_path / "book.epub")
+    assert make_engine().extract_text(path).split() == ebooklib_words(path)
+
+
+def test_parallel_chapters_keep_spine_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_merger_app, "EPUB_PARALLEL_MIN_BYTES", 0)
+    path = make_epub(tmp_path / "book.epub")
+    assert make_engine(workers=2).extract_text(path) == make_engine().extract_text(path)
+
+
+def test_cancelling_drops_queued_chapters(tmp_path, monkeypatch):
+    token = CancellationToken()
+    shutdowns = []
+
+    class Executor:
+        def __init__(self, max_workers):
+            pass
+
+        def map(self, function, chapters):
+            for chapter in chapters:
+                token.stop()
+                yield function(chapter)
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            shutdowns.append((wait, cancel_futures))
+
+    monkeypatch.setattr(pdf_merger_app, "EPUB_PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(pdf_merger_app, "ProcessPoolExecutor", Executor)
+    path = make_epub(tmp_path / "book.epub")
+    with pytest.raises(MergeCancelled):
+        make_engine(token, workers=2).extract_text(path)
+    assert shutdowns == [(False, True)]
+
+
+def test_only_parse_errors_fall_back_to_ebooklib(tmp_path, monkeypatch):
+    path = make_epub(tmp_path / "book.epub")
+    engine = make_engine()
+
+    def malformed(zf):
+        raise KeyError("META-INF/container.xml")
+
+    monkeypatch.setattr(engine, "_epub_spine", malformed)
+    assert "thirteen." in engine.extract_text(path)
+
+    def broken(zf):
+        raise RuntimeError("not a parse error")
+
+    monkeypatch.setattr(engine, "_epub_spine", broken)
+    pdf_merger_app._extracted_text_cache.clear()
+    with pytest.raises(RuntimeError):
+        engine.extract_text(path)
+
+
+def test_writer_output_opens_in_ebooklib(tmp_path):
+    path = str(tmp_path / "written.epub")
+    with EpubWriter(path, title="Merged & Bound") as writer:
+        writer.start_chapter("First <file>")
+        writer.add_paragraph("Café & croissant.")
+        writer.start_chapter("Second")
+        writer.add_paragraph("The end.")
+    book = epub.read_epub(path)
+    assert book.get_metadata("DC", "title")[0][0] == "Merged & Bound"
+    assert ebooklib_words(path) == ["First", "<file>", "Café", "&", "croissant.", "Second", "The", "end."]
+    assert make_engine().extract_text(path).split() == ebooklib_words(path)
+
+
+def test_sources_start_chapters_and_long_chapters_continue(tmp_path):
+    merged_text, sections = join_texts([("a.txt", "alpha " * 30), ("b.txt", "bravo")])
+    path = str(tmp_path / "merged.epub")
+    MergeEngine(MergeOptions(output_file_type="EPUB", epub_chapter_chars=50)).write_part(merged_text, path, sections=sections)
+    book = epub.read_epub(path)
+    titles = [item.title for item in book.toc]
+    assert titles[0] == "a.txt" and titles[1].startswith("a.txt (") and titles[-1] == "b.txt"
+    words = make_engine().extract_text(path).split()
+    assert words.count("alpha") == 30 and words[-2:] == ["b.txt", "bravo"]
@@ -0,0 +1,68 @@
+import fitz
+import pytest
+
+from pdf_merger_app import (
+    EXTRACTED_TEXT_CACHE_BUDGET_SHARE,
+    ExtractedTextCache,
+    MergeEngine,
+    MergeOptions,
+    _extracted_text_cache,
+)
+
+TIMESTAMP = "[00:01:23.456 --> 00:01:25.789]"
+
+
+@pytest.fixture
+def transcript_pdf(tmp_path):
+    path = tmp_path / "transcript.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), f"{TIMESTAMP} hello world")
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def test_cached_text_does_not_depend_on_remove_timestamps(transcript_pdf):
+    with MergeEngine(MergeOptions(remove_timestamps=True)) as engine:
+        assert TIMESTAMP not in engine.process_file(transcript_pdf)
+    with MergeEngine(MergeOptions(remove_timestamps=False)) as engine:
+        text = engine.process_file(transcript_pdf)
+    assert TIMESTAMP in text
+    assert "hello world" in text
+
+
+def test_cache_hit_skips_extraction(transcript_pdf, monkeypatch):
+    engine = MergeEngine()
+    first = engine.extract_text(transcript_pdf)
+    monkeypatch.setattr(engine, "_extract_text_by_format", lambda *args: pytest.fail("extracted twice"))
+    assert engine.extract_text(transcript_pdf) == first
+
+
+def test_changed_file_is_extracted_again(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("first version")
+    engine = MergeEngine()
+    assert engine.extract_text(str(path)) == "first version"
+    path.write_text("second, longer version")
+    assert engine.extract_text(str(path)) == "second, longer version"
+
+
+def test_memory_budget_bounds_the_cache(tmp_path):
+    path = tmp_path / "big.txt"
+    limit = int(1048576 * EXTRACTED_TEXT_CACHE_BUDGET_SHARE)
+    path.write_text("x" * (limit + 1))
+    MergeEngine(MergeOptions(memory_budget_mb=1)).extract_text(str(path))
+    assert _extracted_text_cache.get(str(path)) is None
+    MergeEngine().extract_text(str(path))
+    assert _extracted_text_cache.get(str(path)) is not None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractedTextCache(max_chars=10)
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_text("a")
+    b.write_text("b")
+    cache.put(str(a), "123456")
+    cache.put(str(b), "1234567")
+    assert cache.get(str(a)) is None
+    assert cache.get(str(b)) == "1234567"
@@ -0,0 +1,73 @@
+import os
+
+from pdf_merger_app import FolderWatcher, MergeEngine, MergeOptions
+
+
+def make_watcher(input_folder, output_folder, **options):
+    engine = MergeEngine(MergeOptions(output_folder=str(output_folder), output_file_type="TXT", **options))
+    return FolderWatcher(engine, str(input_folder), settle_seconds=0)
+
+
+def drop(folder, name, text):
+    path = folder / name
+    path.write_text(text)
+    stat = path.stat()
+    return str(path), (stat.st_size, stat.st_mtime_ns)
+
+
+def read_outputs(watcher):
+    return [open(path, encoding="utf-8").read() for path in watcher.saved_files]
+
+
+def test_changed_file_replaces_its_earlier_text(tmp_path):
+    (tmp_path / "in").mkdir()
+    watcher = make_watcher(tmp_path / "in", tmp_path)
+    watcher.process([drop(tmp_path / "in", "a.txt", "alpha original"), drop(tmp_path / "in", "b.txt", "bravo")])
+    watcher.process([drop(tmp_path / "in", "a.txt", "alpha revised")])
+    [output] = read_outputs(watcher)
+    assert "alpha original" not in output
+    assert output.count("alpha revised") == 1 and output.count("bravo") == 1
+    assert output.index("alpha revised") < output.index("bravo")
+    watcher.close()
+
+
+def test_shorter_replacement_removes_stale_parts(tmp_path):
+    (tmp_path / "in").mkdir()
+    watcher = make_watcher(tmp_path / "in", tmp_path, split_by_words=True, split_word_count=3)
+    watcher.process([drop(tmp_path / "in", "a.txt", "one two three four five six seven")])
+    assert len(watcher.saved_files) == 3
+    stale = watcher.saved_files[2]
+    watcher.process([drop(tmp_path / "in", "a.txt", "one two")])
+    assert len(watcher.saved_files) == 1 and not os.path.exists(stale)
+    assert read_outputs(watcher)[0].split() == ["one", "two"]
+    watcher.close()
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    (tmp_path / "in").mkdir()
+    watcher = make_watcher(tmp_path / "in", tmp_path, split_by_words=True, split_word_count=100)
+    path, signature = drop(tmp_path / "in", "a.txt", "alpha")
+    write_part = watcher.engine.write_part
+
+    def failing_write_part(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(watcher.engine, "write_part", failing_write_part)
+    watcher.process([(path, signature)])
+    assert path not in watcher.processed
+    assert watcher.poll(now=0) == [] and watcher.poll(now=1) == [(path, signature)]
+
+    monkeypatch.setattr(watcher.engine, "write_part", write_part)
+    watcher.process([(path, signature)])
+    assert watcher.processed[path] == list(signature)
+    assert [text.split() for text in read_outputs(watcher)] == [["alpha"]]
+    watcher.close()
+
+
+def test_relative_output_folder_is_not_ingested(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    watcher = make_watcher(tmp_path, ".")
+    drop(tmp_path, "MergedPDFs.txt", "earlier output")
+    drop(tmp_path, "MergedPDFs2.txt", "earlier output")
+    drop(tmp_path, "scan.txt", "new scan")
+    assert [os.path.basename(path) for path in watcher._snapshot()] == ["scan.txt"]
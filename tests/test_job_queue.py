@@ -0,0 +1,52 @@
+import threading
+
+from pdf_merger_app import MergeJob, MergeJobQueue, MergeOptions
+
+
+def make_job():
+    return MergeJob(["a.pdf"], MergeOptions())
+
+
+def test_stopped_queued_job_is_never_started():
+    release = threading.Event()
+    started = []
+
+    def runner(job):
+        started.append(job.job_id)
+        release.wait(5)
+        return []
+
+    queue = MergeJobQueue(runner, max_concurrent=1)
+    first, second = queue.submit(make_job()), queue.submit(make_job())
+    second.stop()
+    release.set()
+    first.thread.join(5)
+    assert first.status == "done"
+    assert second.status == "stopped" and second.thread is None
+    assert started == [first.job_id]
+
+
+def test_pause_and_resume_only_change_matching_statuses():
+    job = make_job()
+    job.pause()
+    assert job.status == "queued" and not job.token.is_paused
+    job.status = "running"
+    job.pause()
+    assert job.status == "paused" and job.token.is_paused
+    job.resume()
+    assert job.status == "running" and not job.token.is_paused
+
+
+def test_progress_updates_from_job_thread_are_visible_in_describe():
+    progress_set = threading.Event()
+
+    def runner(job):
+        job.progress = 40
+        progress_set.set()
+        return ["out.txt"]
+
+    queue = MergeJobQueue(runner)
+    job = queue.submit(make_job())
+    assert progress_set.wait(5)
+    job.thread.join(5)
+    assert job.describe().startswith(f"#{job.job_id} [done] 40%")
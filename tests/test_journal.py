@@ -0,0 +1,113 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+from pdf_merger_app import MergeEngine, MergeJob, MergeJournal, MergeOptions, PDFMergerApp
+
+
+class App:
+    """The parts of PDFMergerApp that a merge job uses, without Tk."""
+
+    _merge_pdfs_threaded = PDFMergerApp._merge_pdfs_threaded
+    _write_run_report = PDFMergerApp._write_run_report
+
+    def _job_logger(self, job):
+        return lambda message, tag=None: None
+
+    def _on_job_changed(self, job):
+        pass
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    paths = []
+    for index, text in enumerate(["first file", "second file mentions Zyxwv", "third file"]):
+        path = tmp_path / f"in{index}.txt"
+        path.write_text(text)
+        paths.append(str(path))
+    return paths
+
+
+def options_for(tmp_path, **overrides):
+    out = tmp_path / "out"
+    out.mkdir(exist_ok=True)
+    return MergeOptions(output_folder=str(out), output_file_type="TXT", **overrides)
+
+
+def test_events_are_appended_without_rewriting_the_header(tmp_path, inputs):
+    journal = MergeJournal.create(inputs, options_for(tmp_path))
+    with open(journal.path) as f:
+        header = f.read()
+    journal.record_file(0, inputs[0], "first file")
+    journal.record_failed(1, inputs[1], "broken")
+    journal.record_name_offset(3)
+    journal.record_part(1, "/somewhere/MergedPDFs4.txt")
+
+    with open(journal.path) as f:
+        assert f.read() == header
+    with open(journal.events_path) as f:
+        assert len(f.readlines()) == 4
+
+    loaded = MergeJournal.load(journal.path)
+    assert loaded.load_text(0) == "first file"
+    assert loaded.is_completed(1) and loaded.load_text(1) is None
+    assert not loaded.is_completed(2)
+    assert loaded.name_offset == 3
+    assert loaded.data["parts"] == {"1": "/somewhere/MergedPDFs4.txt"}
+
+
+def test_a_line_cut_off_by_a_crash_is_ignored(tmp_path, inputs):
+    journal = MergeJournal.create(inputs, options_for(tmp_path))
+    journal.record_file(0, inputs[0], "first file")
+    with open(journal.events_path, "a") as f:
+        f.write('{"completed": 1, "fi')
+    loaded = MergeJournal.load(journal.path)
+    assert loaded.is_completed(0) and not loaded.is_completed(1)
+
+
+def test_custom_pii_strings_are_private_but_restored(tmp_path, inputs):
+    journal = MergeJournal.create(inputs, options_for(tmp_path, remove_pii=True, custom_pii_strings="Zyxwv"))
+    with open(journal.path) as f:
+        assert "Zyxwv" not in f.read()
+    private_path = os.path.join(journal.checkpoint_dir, MergeJournal.PRIVATE_OPTIONS)
+    if sys.platform != "win32":
+        assert stat.S_IMODE(os.stat(private_path).st_mode) == 0o600
+    assert MergeJournal.load(journal.path).options.custom_pii_strings == "Zyxwv"
+
+
+def test_resumed_job_skips_completed_files_and_scrubs_like_the_first_run(tmp_path, inputs, monkeypatch):
+    options = options_for(tmp_path, remove_pii=True, custom_pii_strings="Zyxwv")
+    journal = MergeJournal.create(inputs, options)
+    # The first run stopped after checkpointing the first file
+    journal.record_file(0, inputs[0], "first file (checkpointed)")
+
+    processed = []
+    process_file = MergeEngine.process_file
+    monkeypatch.setattr(MergeEngine, "process_file",
+                        lambda engine, source, name=None: processed.append(source) or process_file(engine, source, name))
+
+    resumed = MergeJournal.load(journal.path)
+    job = MergeJob(resumed.files, resumed.options, journal=resumed)
+    saved = App()._merge_pdfs_threaded(job)
+
+    assert processed == inputs[1:]
+    with open(saved[0], encoding="utf-8") as f:
+        merged = f.read()
+    assert "first file (checkpointed)" in merged
+    assert "Zyxwv" not in merged and "mentions [REDACTED]" in merged
+    out_files = os.listdir(options.output_folder)
+    assert not [name for name in out_files if name.startswith(MergeJournal.PREFIX)]
+    report = [name for name in out_files if "_run_report_" in name]
+    with open(os.path.join(options.output_folder, report[0])) as f:
+        assert "Zyxwv" not in f.read()
+
+
+def test_finish_removes_everything(tmp_path, inputs):
+    options = options_for(tmp_path, custom_pii_strings="Zyxwv")
+    journal = MergeJournal.create(inputs, options)
+    journal.record_file(0, inputs[0], "text")
+    journal.finish()
+    assert os.listdir(options.output_folder) == []
@@ -0,0 +1,58 @@
+import tracemalloc
+
+import pdf_merger_app
+from pdf_merger_app import MemoryMonitor, MergeEngine, MergeOptions, current_rss
+
+
+def collect_log():
+    messages = []
+    return messages, lambda message, tag=None: messages.append((message, tag))
+
+
+def test_current_rss_is_read():
+    assert current_rss() > 0
+
+
+def test_stages_record_rss_peaks(tmp_path):
+    (tmp_path / "a.txt").write_text("some words here")
+    engine = MergeEngine(MergeOptions(memory_sampling=True))
+    engine.process_file(str(tmp_path / "a.txt"))
+    counters = engine.telemetry.files[-1]["stages"]["extract"]
+    assert 0 < counters["rss_start_mb"] <= counters["rss_peak_mb"]
+    assert counters["rss_end_mb"] <= counters["rss_peak_mb"]
+    assert engine.telemetry.stage_summary()["extract"]["rss_peak_mb"] == counters["rss_peak_mb"]
+    engine.close()
+
+
+def test_budget_warnings(monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_merger_app, "current_rss", lambda: 900 * 1048576)
+    messages, log = collect_log()
+    monitor = MemoryMonitor(budget_mb=1000, log=log)
+    assert monitor.near_budget() and not MemoryMonitor(budget_mb=0).near_budget(10 ** 12)
+    counters = {}
+    with monitor.sample("extract", counters):
+        pass
+    warnings = [message for message, tag in messages if tag == "warning"]
+    assert len(warnings) == 1 and "1000 MB budget during 'extract'" in warnings[0]
+
+    (tmp_path / "a.txt").write_text("text")
+    messages, log = collect_log()
+    engine = MergeEngine(MergeOptions(memory_budget_mb=1000), log=log)
+    engine.process_file(str(tmp_path / "a.txt"))
+    assert any("may exceed the memory budget" in message for message, _ in messages)
+    engine.close()
+
+
+def test_allocation_tracing_is_shared_and_stopped_by_the_last_monitor():
+    assert not tracemalloc.is_tracing()
+    first, second = MemoryMonitor(trace_allocations=True), MemoryMonitor(trace_allocations=True)
+    counters = {}
+    with first.sample("generate", counters):
+        data = [bytes(1024) for _ in range(1000)]
+    assert counters["traced_peak_mb"] > 0 and counters["top_allocations"]
+    del data
+    first.close()
+    assert tracemalloc.is_tracing()
+    second.close()
+    second.close()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,76 @@
+import zipfile
+
+import pytest
+
+from pdf_merger_app import MergeEngine, OdtWriter
+
+odf = pytest.importorskip("odf")
+from odf import teletype, text  # noqa: E402
+from odf.opendocument import OpenDocumentText, load  # noqa: E402
+
+
+def odfpy_text(path):
+    """The text the removed odfpy reader produced: one line per text:p element."""
+    return '\n'.join(teletype.extractText(paragraph) for paragraph in load(path).getElementsByType(text.P))
+
+
+def make_odt(path):
+    document = OpenDocumentText()
+    for line in ["Quarterly report", "Revenue grew by 12% & costs < plan.", "Name\tValue",
+                 "  indented   with  runs of spaces", "First line\nsecond line", "", "Ünïcödé — “quoted” text"]:
+        paragraph = text.P()
+        teletype.addTextToElement(paragraph, line)
+        document.text.addElement(paragraph)
+    document.save(str(path))
+    return str(path)
+
+
+def test_paragraphs_match_odfpy(tmp_path):
+    path = make_odt(tmp_path / "report.odt")
+    assert MergeEngine().extract_text(path) == odfpy_text(path)
+
+
+def test_nested_spans_match_odfpy(tmp_path):
+    document = OpenDocumentText()
+    paragraph = text.P(text="Total: ")
+    span = text.Span(text="42")
+    paragraph.addElement(span)
+    paragraph.addText(" units")
+    document.text.addElement(paragraph)
+    path = str(tmp_path / "spans.odt")
+    document.save(path)
+    assert MergeEngine().extract_text(path) == odfpy_text(path) == "Total: 42 units"
+
+
+def test_headings_are_extracted_unlike_odfpy(tmp_path):
+    document = OpenDocumentText()
+    document.text.addElement(text.H(outlinelevel=1, text="Heading"))
+    document.text.addElement(text.P(text="Body"))
+    path = str(tmp_path / "headings.odt")
+    document.save(path)
+    # odfpy's text:p lookup skipped headings; the streaming reader keeps them in document order
+    assert MergeEngine().extract_text(path) == "Heading\nBody"
+    assert odfpy_text(path) == "Body"
+
+
+PARAGRAPHS = ["Quarterly report", "Revenue grew by 12% & costs < plan.", "Name\tValue",
+              "  indented   with  runs of spaces", "Ünïcödé — “quoted” text"]
+
+
+def test_writer_output_opens_in_odfpy(tmp_path):
+    path = str(tmp_path / "written.odt")
+    with OdtWriter(path) as writer:
+        for paragraph in PARAGRAPHS:
+            writer.add_paragraph(paragraph)
+    assert odfpy_text(path).split('\n') == PARAGRAPHS
+    assert MergeEngine().extract_text(path).split('\n') == PARAGRAPHS
+
+
+def test_mimetype_is_stored_first(tmp_path):
+    path = str(tmp_path / "written.odt")
+    with OdtWriter(path) as writer:
+        writer.add_paragraph("text")
+    with zipfile.ZipFile(path) as zf:
+        first = zf.infolist()[0]
+        assert first.filename == "mimetype" and first.compress_type == zipfile.ZIP_STORED
+        assert zf.read("mimetype") == b"application/vnd.oasis.opendocument.text"
@@ -0,0 +1,95 @@
+import os
+import threading
+
+import fitz
+
+import pdf_merger_app
+from pdf_merger_app import MergeEngine, MergeOptions, PDFMergerApp, _path_key
+
+
+def make_engine(folder, **options):
+    return MergeEngine(MergeOptions(output_folder=str(folder), output_file_type="TXT", **options))
+
+
+def touch(folder, *names):
+    for name in names:
+        (folder / name).write_text("earlier output")
+
+
+def test_first_output_uses_the_plain_name(tmp_path):
+    assert os.path.basename(make_engine(tmp_path).get_output_filepath()) == "MergedPDFs.txt"
+
+
+def test_numbering_continues_after_earlier_outputs(tmp_path):
+    touch(tmp_path, "MergedPDFs.txt", "MergedPDFs2.txt")
+    engine = make_engine(tmp_path)
+    assert [os.path.basename(engine.get_output_filepath(counter=n)) for n in (1, 2)] == ["MergedPDFs3.txt", "MergedPDFs4.txt"]
+
+
+def test_unrelated_numbered_files_do_not_move_the_offset(tmp_path):
+    touch(tmp_path, "MergedPDFs.txt", "MergedPDFs2024.txt", "MergedPDFs02.txt", "MergedPDFs1.txt")
+    assert os.path.basename(make_engine(tmp_path).get_output_filepath()) == "MergedPDFs2.txt"
+
+
+def test_taken_names_are_skipped(tmp_path):
+    touch(tmp_path, "MergedPDFs.txt", "MergedPDFs3.txt")
+    engine = make_engine(tmp_path)
+    assert [os.path.basename(engine.get_output_filepath(counter=n)) for n in (1, 2)] == ["MergedPDFs2.txt", "MergedPDFs4.txt"]
+
+
+def test_pinned_offset_is_kept(tmp_path):
+    engine = make_engine(tmp_path)
+    assert engine.reserve_output_names(offset=5) == 5
+    assert os.path.basename(engine.get_output_filepath()) == "MergedPDFs6.txt"
+
+
+def test_concurrent_engines_never_share_a_name(tmp_path):
+    options = dict(split_by_words=True, split_word_count=5)
+    engines = [make_engine(tmp_path, **options) for _ in range(4)]
+    results = [[] for _ in engines]
+    text = " ".join(["word"] * 20)
+    threads = [threading.Thread(target=lambda e=e, r=r: r.extend(e.write_outputs(text))) for e, r in zip(engines, results)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    written = [path for result in results for path in result]
+    assert len(written) == len(set(written)) == 16
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in written)
+
+
+def test_close_releases_reservations(tmp_path):
+    engine = make_engine(tmp_path)
+    path = engine.get_output_filepath()
+    assert _path_key(path) in pdf_merger_app._reserved_output_paths
+    engine.close()
+    assert _path_key(path) not in pdf_merger_app._reserved_output_paths
+    assert os.path.basename(make_engine(tmp_path).get_output_filepath()) == "MergedPDFs.txt"
+
+
+def test_legacy_merge_keeps_its_reservation_until_saved(tmp_path, monkeypatch):
+    source = tmp_path / "in.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "hello")
+    doc.save(source)
+    doc.close()
+
+    class App:
+        print_to_console = staticmethod(lambda message, tag=None: None)
+
+        def _create_engine(self):
+            return MergeEngine(MergeOptions(output_folder=str(tmp_path / "out"), output_file_type="PDF"))
+
+    os.mkdir(tmp_path / "out")
+    reserved_during_save = []
+    save = fitz.Document.save
+
+    def checked_save(doc, path, *args, **kwargs):
+        reserved_during_save.append(_path_key(path) in pdf_merger_app._reserved_output_paths)
+        return save(doc, path, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Document, "save", checked_save)
+    saved = PDFMergerApp._merge_standard(App(), [str(source)])
+    assert [os.path.basename(path) for path in saved] == ["MergedPDFs.pdf"]
+    assert reserved_during_save == [True]
+    assert not pdf_merger_app._reserved_output_paths
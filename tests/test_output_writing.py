@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from pdf_merger_app import OUTPUT_EXTENSIONS, MergeEngine, MergeOptions, make_synthetic_text
+
+
+@pytest.mark.parametrize("output_type", sorted(OUTPUT_EXTENSIONS))
+def test_write_part_streams_to_disk(tmp_path, monkeypatch, output_type):
+    engine = MergeEngine(MergeOptions(output_folder=str(tmp_path), output_file_type=output_type))
+    monkeypatch.setattr(engine, "_generate_part", lambda *args: pytest.fail("part built in memory"))
+    path = engine.get_output_filepath()
+    engine.write_part(make_synthetic_text(500), path)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    assert engine.telemetry.parts[0]["stages"]["generate"]["bytes"] == os.path.getsize(path) > 0
+
+
+def test_failed_write_leaves_no_files(tmp_path, monkeypatch):
+    engine = MergeEngine(MergeOptions(output_folder=str(tmp_path), output_file_type="TXT"))
+
+    def fail(*args):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(engine, "generate_output_file", fail)
+    with pytest.raises(RuntimeError):
+        engine.write_part("text", engine.get_output_filepath())
+    assert os.listdir(tmp_path) == []
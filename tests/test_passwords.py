@@ -0,0 +1,73 @@
+import threading
+
+import fitz
+
+import pdf_merger_app
+from pdf_merger_app import PasswordStore, PDFMergerApp, find_locked_pdfs
+
+
+def make_pdf(path, user_pw=None):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "hello")
+    if user_pw:
+        doc.save(path, encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=user_pw, owner_pw="owner")
+    else:
+        doc.save(path)
+    doc.close()
+    return str(path)
+
+
+class Master:
+    """Records the callbacks posted with after(), like the Tk event loop would queue them."""
+
+    def __init__(self):
+        self.callbacks = []
+        self.posted = threading.Event()
+
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+        self.posted.set()
+
+
+class App:
+    """The parts of PDFMergerApp that the password prompts use, without Tk."""
+
+    _ask_input_passwords = PDFMergerApp._ask_input_passwords
+    _prompt_pdf_passwords = PDFMergerApp._prompt_pdf_passwords
+
+    def __init__(self):
+        self.master = Master()
+        self.pdf_passwords = PasswordStore()
+        self.messages = []
+
+    def print_to_console(self, message, tag=None):
+        self.messages.append(message)
+
+
+def test_find_locked_pdfs_skips_open_and_unreadable_files(tmp_path):
+    (tmp_path / "broken.pdf").write_text("not a pdf")
+    (tmp_path / "notes.txt").write_text("text")
+    files = [
+        make_pdf(tmp_path / "open.pdf"),
+        make_pdf(tmp_path / "locked.pdf", user_pw="secret"),
+        make_pdf(tmp_path / "known.pdf", user_pw="known"),
+        str(tmp_path / "broken.pdf"),
+        str(tmp_path / "missing.pdf"),
+        str(tmp_path / "notes.txt"),
+    ]
+    assert find_locked_pdfs(files, PasswordStore(common=["known"])) == [files[1]]
+
+
+def test_passwords_are_probed_off_the_calling_thread_and_prompted_after(tmp_path, monkeypatch):
+    files = [make_pdf(tmp_path / "a.pdf", user_pw="shared"), make_pdf(tmp_path / "b.pdf", user_pw="shared")]
+    prompts = []
+    monkeypatch.setattr(pdf_merger_app.simpledialog, "askstring", lambda *args, **kwargs: prompts.append(args) or "shared")
+    done = []
+    app = App()
+    app._ask_input_passwords(files, lambda: done.append(True))
+    assert app.master.posted.wait(5)
+    assert not done and not prompts  # Nothing is prompted until the Tk loop runs the callback
+    app.master.callbacks.pop()()
+    # The password entered for the first file opens the second one without another prompt
+    assert len(prompts) == 1 and done == [True]
+    assert app.pdf_passwords.candidates(files[1]) == ["shared"]
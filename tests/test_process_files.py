@@ -0,0 +1,66 @@
+import json
+
+import fitz
+import pytest
+
+import pdf_merger_app
+from pdf_merger_app import MergeEngine, MergeOptions, PdfPasswordRequired
+
+
+def make_pdf(path, text, user_pw=None):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    if user_pw:
+        doc.save(path, encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=user_pw, owner_pw="owner")
+    else:
+        doc.save(path)
+    doc.close()
+    return str(path)
+
+
+class Unpicklable(Exception):
+    def __init__(self, message, handle):
+        super().__init__(message)
+        self.handle = handle
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_errors_keep_their_type(tmp_path, workers):
+    files = [make_pdf(tmp_path / "open.pdf", "visible"), make_pdf(tmp_path / "locked.pdf", "secret", user_pw="pw")]
+    engine = MergeEngine(MergeOptions(output_folder=str(tmp_path), workers=workers))
+    results = list(engine.process_files(files))
+    engine.close()
+    assert [path for path, _, _ in results] == files
+    assert "visible" in results[0][1] and results[0][2] is None
+    assert results[1][1] is None and isinstance(results[1][2], PdfPasswordRequired)
+
+
+def test_unpicklable_errors_are_reported_by_type():
+    error = pdf_merger_app._picklable_error(Unpicklable("no handle", handle=object()))
+    assert type(error) is Exception and str(error) == "Unpicklable: no handle"
+    password_error = PdfPasswordRequired("locked")
+    assert pdf_merger_app._picklable_error(password_error) is password_error
+
+
+def test_merge_text_keeps_source_order_and_skips_failures(tmp_path):
+    (tmp_path / "a.txt").write_text("alpha")
+    (tmp_path / "b.txt").write_text("bravo")
+    engine = MergeEngine(MergeOptions(output_folder=str(tmp_path)))
+    merged = engine.merge_text([str(tmp_path / "a.txt"), str(tmp_path / "missing.txt"), str(tmp_path / "b.txt")])
+    assert merged == "alpha\n\nbravo\n\n"
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_merges_in_argument_order_and_reports_failures(tmp_path, capsys, jobs):
+    for name, content in [("b.txt", "bravo"), ("a.txt", "alpha")]:
+        (tmp_path / name).write_text(content)
+    locked = make_pdf(tmp_path / "locked.pdf", "secret", user_pw="pw")
+    out = tmp_path / "out"
+    status = pdf_merger_app.cli_main([str(tmp_path / "b.txt"), locked, str(tmp_path / "a.txt"),
+                                      "-o", str(out), "-f", "txt", "-j", jobs])
+    summary = json.loads(capsys.readouterr().out)
+    assert status == 1 and summary["status"] == "partial"
+    assert summary["files_processed"] == 2
+    assert [failure["file"] for failure in summary["failed_files"]] == [locked]
+    with open(summary["outputs"][0], encoding="utf-8") as f:
+        assert f.read().split() == ["bravo", "alpha"]
@@ -0,0 +1,28 @@
+import json
+import os
+
+from pdf_merger_app import ProfileCapture, cli_main
+
+
+def test_only_one_capture_runs_at_a_time(tmp_path):
+    first = ProfileCapture(str(tmp_path), "run")
+    second = ProfileCapture(str(tmp_path), "run")
+    assert first.start()
+    try:
+        assert not second.start()
+    finally:
+        first.stop()
+    assert os.path.exists(first.profile_path) and os.path.exists(first.summary_path)
+    assert second.start()
+    second.stop()
+
+
+def test_profiled_cli_run_keeps_extraction_in_process(tmp_path, capsys):
+    source = tmp_path / "a.txt"
+    source.write_text("alpha bravo")
+    out = tmp_path / "out"
+    assert cli_main([str(source), "-o", str(out), "-f", "txt", "-j", "4", "--profile"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["options"]["workers"] == 1
+    with open(os.path.splitext(summary["profile"])[0] + ".txt", encoding="utf-8") as f:
+        assert "_extract_text_from_txt" in f.read()
@@ -0,0 +1,58 @@
+import io
+
+import pytest
+
+import pdf_merger_app
+from pdf_merger_app import MergeEngine, RtfWriter
+
+striprtf = pytest.importorskip("striprtf.striprtf")
+
+DOCUMENTS = {
+    "plain": r"{\rtf1\ansi\deff0{\fonttbl{\f0 Times New Roman;}}\pard Hello, world.\par Second paragraph.\par}",
+    "formatting": r"{\rtf1\ansi{\fonttbl{\f0 Arial;}{\f1 Courier;}}\f0\fs24 Revenue {\b grew} by {\i 12%}\tab done\line next\par}",
+    "escapes": r"{\rtf1\ansi Braces \{ and \} and a backslash \\ here.\par}",
+    "code page": r"{\rtf1\ansi\ansicpg1252 Caf\'e9 na\'efve \'93quoted\'94\par}",
+    "unicode": r"{\rtf1\ansi\uc1 Dash \u8212? and snowman \u9731? end\par}",
+    "skipped destinations": (r"{\rtf1\ansi{\*\generator Writer 1.0;}{\info{\title Secret}{\author Someone}}"
+                             r"{\colortbl;\red255\green0\blue0;}Visible{\pict\pngblip 89504e470d0a1a0a} text\par}"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+def test_text_matches_striprtf(tmp_path, name):
+    path = tmp_path / "document.rtf"
+    path.write_text(DOCUMENTS[name], encoding="ascii")
+    assert MergeEngine().extract_text(str(path)) == striprtf.rtf_to_text(DOCUMENTS[name])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_chunk_boundaries_do_not_change_the_text(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(pdf_merger_app, "RTF_CHUNK_SIZE", chunk_size)
+    document = "{" + "".join(DOCUMENTS[name][1:-1] for name in sorted(DOCUMENTS)) + "}"
+    path = tmp_path / "document.rtf"
+    path.write_text(document, encoding="ascii")
+    assert MergeEngine().extract_text(str(path)) == striprtf.rtf_to_text(document)
+
+
+PARAGRAPHS = ["Plain paragraph.", "Braces { } and a backslash \\ here.", "Name\tValue",
+              "Café naïve — “quoted”", "Beyond the BMP: 😀 done"]
+
+
+def test_writer_output_round_trips(tmp_path):
+    path = str(tmp_path / "written.rtf")
+    with RtfWriter(path) as writer:
+        for paragraph in PARAGRAPHS:
+            writer.add_paragraph(paragraph)
+    with open(path, "rb") as f:
+        assert f.read().isascii()
+    assert MergeEngine().extract_text(path).split('\n')[:len(PARAGRAPHS)] == PARAGRAPHS
+    # striprtf doesn't combine \uN surrogate pairs, so the last paragraph is left out of its comparison
+    with open(path, encoding="ascii") as f:
+        assert striprtf.rtf_to_text(f.read()).split('\n')[:4] == PARAGRAPHS[:4]
+
+
+def test_writer_leaves_caller_stream_open():
+    buffer = io.BytesIO()
+    with RtfWriter(buffer) as writer:
+        writer.add_paragraph("text")
+    assert not buffer.closed and buffer.getvalue().endswith(b"text\\par\n}")
@@ -0,0 +1,41 @@
+import json
+
+from pdf_merger_app import MergeEngine, MergeOptions, RunTelemetry
+
+
+def test_every_stage_is_timed_and_counted(tmp_path):
+    source = tmp_path / "a.txt"
+    source.write_text("[00:01.000 --> 00:02.000] call me at 555-123-4567 tomorrow")
+    engine = MergeEngine(MergeOptions(output_folder=str(tmp_path), output_file_type="TXT",
+                                      remove_timestamps=True, remove_pii=True))
+    text = engine.process_file(str(source))
+    engine.write_part(text, str(tmp_path / "out.txt"))
+    summary = engine.telemetry.stage_summary()
+    assert list(summary) == list(RunTelemetry.STAGES)
+    for entry in summary.values():
+        assert entry["calls"] == 1 and entry["wall_seconds"] >= 0 and entry["cpu_seconds"] >= 0
+    extract = summary["extract"]
+    assert extract["bytes"] == source.stat().st_size and extract["chars"] == len(source.read_text())
+    assert summary["timestamps"]["chars"] < extract["chars"]
+    assert summary["generate"]["words"] == engine.telemetry.parts[0]["stages"]["generate"]["words"]
+    engine.close()
+
+
+def test_worker_records_are_summed():
+    telemetry = RunTelemetry()
+    for words in (10, 30):
+        telemetry.add_file({"file": "x", "stages": {"extract": {
+            "wall_seconds": 0.5, "cpu_seconds": 0.25, "bytes": 1048576, "chars": 100, "words": words}}})
+    extract = telemetry.stage_summary()["extract"]
+    assert extract["calls"] == 2 and extract["words"] == 40
+    assert extract["mb_per_second"] == 2.0 and extract["words_per_second"] == 40.0
+
+
+def test_reports_get_unique_names(tmp_path):
+    telemetry = RunTelemetry()
+    first = telemetry.write_report(str(tmp_path), "Merged", files_processed=0)
+    second = telemetry.write_report(str(tmp_path), "Merged")
+    assert first != second
+    with open(first, encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["files_processed"] == 0 and report["stages"] == {} and report["files"] == []